@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { salesAPI, expensesAPI, inventoryAPI, creditAPI } from '../services/api';
+import { dashboardAPI } from '../services/api';
 
 const DashboardPage = () => {
   const navigate = useNavigate();
@@ -94,90 +94,40 @@ const DashboardPage = () => {
 
   const fetchDashboardData = async () => {
     try {
-      const today = new Date().toISOString().split('T')[0];
+      // One server-side summary instead of downloading every sale and expense
+      const { data: summary } = await dashboardAPI.getSummary();
 
-      const [salesRes, expensesRes, inventoryRes, creditRes, todaySalesRes, todayExpensesRes] = await Promise.all([
-        salesAPI.getAll().catch(() => ({ data: [] })),
-        expensesAPI.getAll().catch(() => ({ data: [] })),
-        inventoryAPI.readAll().catch(() => ({ data: [] })),
-        creditAPI.getAllActive().catch(() => ({ data: [] })),
-        salesAPI.getByDate(today).catch(() => ({ data: { sales: [], total_sales: 0 } })),
-        expensesAPI.getByDate(today).catch(() => ({ data: { expenses: [], total_expenses: 0 } })),
-      ]);
+      const recentSales = summary.recentSales.map(sale => ({
+        date: new Date(sale.date).toLocaleDateString(),
+        customerName: sale.customerName,
+        itemName: sale.itemName
+          ? (sale.modelNumber ? `${sale.itemName} - ${sale.modelNumber}` : sale.itemName)
+          : 'N/A',
+        totalAmount: sale.totalAmount,
+      }));
 
-      const allSales = Array.isArray(salesRes.data) ? salesRes.data : [];
-      const allExpenses = Array.isArray(expensesRes.data) ? expensesRes.data : [];
-      const inventoryData = Array.isArray(inventoryRes.data) ? inventoryRes.data : [];
+      const recentExpenses = summary.recentExpenses.map(exp => ({
+        date: new Date(exp.date).toLocaleDateString(),
+        category: exp.category,
+        description: exp.description,
+        amount: exp.amount,
+      }));
 
-      const totalSales = allSales.reduce((sum, sale) => sum + (sale.totalAmount || 0), 0);
-      const totalExpenses = allExpenses.reduce((sum, exp) => sum + (exp.amount || 0), 0);
-      const todaySales = todaySalesRes.data.total_sales || 0;
-      const todayExpenses = todayExpensesRes.data.total_expenses || 0;
-      
-      // Count today's items sold
-      const todaySalesList = todaySalesRes.data.sales || [];
-      const todaySalesCount = todaySalesList.reduce((sum, sale) => {
-        return sum + (sale.items || []).reduce((itemSum, item) => itemSum + (item.quantitySold || 0), 0);
-      }, 0);
-
-      const totalInventoryValue = inventoryData.reduce(
-        (sum, item) => sum + (item.quantity * item.purchasePrice || 0), 
-        0
-      );
-
-      const activeCreditCount = creditRes.data.length || 0;
-
-      // Get recent sales (last 5)
-    // Get recent sales (last 5)
-    const recentSales = allSales
-        .sort((a, b) => new Date(b.date) - new Date(a.date))
-        .slice(0, 5)
-        .map(sale => {
-            let itemDisplay = 'N/A';
-            if (sale.items && sale.items.length > 0) {
-            const firstItem = sale.items[0];
-            itemDisplay = firstItem.modelNumber 
-                ? `${firstItem.itemName} - ${firstItem.modelNumber}`
-                : firstItem.itemName;
-            }
-            return {
-            date: new Date(sale.date).toLocaleDateString(),
-            customerName: sale.customerName,
-            itemName: itemDisplay,
-            totalAmount: sale.totalAmount,
-            };
-    });
-
-      // Get recent expenses (last 5)
-      const recentExpenses = allExpenses
-        .sort((a, b) => new Date(b.date) - new Date(a.date))
-        .slice(0, 5)
-        .map(exp => ({
-          date: new Date(exp.date).toLocaleDateString(),
-          category: exp.category,
-          description: exp.description,
-          amount: exp.amount,
-        }));
-
-      // Get low stock items (quantity <= 5)
-      const lowStockItems = inventoryData
-        .filter(item => item.quantity <= 5)
-        .sort((a, b) => a.quantity - b.quantity)
-        .map(item => ({
-          name: item.itemName,
-          modelNumber: item.modelNumber,
-          quantity: item.quantity,
-          isCritical: item.quantity <= 2,
-        }));
+      const lowStockItems = summary.inventory.lowStockItems.map(item => ({
+        name: item.itemName,
+        modelNumber: item.modelNumber,
+        quantity: item.quantity,
+        isCritical: item.isCritical,
+      }));
 
       setStats({
-        totalSales,
-        totalExpenses,
-        todaySales,
-        todayExpenses,
-        totalInventoryValue,
-        activeCreditCount,
-        todaySalesCount,
+        totalSales: summary.monthToDate.totalSales,
+        totalExpenses: summary.monthToDate.totalExpenses,
+        todaySales: summary.today.totalSales,
+        todayExpenses: summary.today.totalExpenses,
+        totalInventoryValue: summary.inventory.totalValue,
+        activeCreditCount: summary.credit.activeCount,
+        todaySalesCount: summary.today.itemsSold,
         recentSales,
         recentExpenses,
         lowStockItems,
@@ -128,4 +128,9 @@ export const quotationsAPI = {
   getById: (quotationId) => api.get(`/quotations/${quotationId}`),
 };
 
+// ===== DASHBOARD ENDPOINTS =====
+export const dashboardAPI = {
+  getSummary: () => api.get('/dashboard/summary'),
+};
+
 export default api;
\ No newline at end of file
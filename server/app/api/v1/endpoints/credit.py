@@ -1,6 +1,7 @@
 # app/api/v1/endpoints/credit.py
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Response
+from typing import List, Literal, Optional
+from app.api.v1.pagination import PageParams, page_response
 from app.schemas.credit import CreditPaymentCreate, CreditPaymentInDB, CreditRecordInDB
 from app.services import credit_service
 from app.core.security import get_current_user, require_l2_permission
@@ -10,15 +11,17 @@ router = APIRouter()
 @router.post("/credit/", response_model=CreditPaymentInDB, status_code=status.HTTP_201_CREATED)
 def record_credit_payment(
     payment: CreditPaymentCreate,
-    current_user: dict = Depends(get_current_user)  # L1 and L2 can create
+    current_user: dict = Depends(get_current_user),  # L1 and L2 can create
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
     """
     Record a payment towards a credit sale.
     Customers can make multiple partial payments (e.g., 10 + 50 + 40 = 100).
+    Send an Idempotency-Key header to make retries safe: a repeated key returns the original result.
     L1 and L2 users can record credit payments.
     """
     try:
-        new_payment = credit_service.create_credit_payment(payment)
+        new_payment = credit_service.create_credit_payment(payment, idempotency_key)
         return new_payment
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -43,14 +46,27 @@ def delete_credit_payment(
 
 @router.get("/credit/all", response_model=List[CreditRecordInDB])
 def get_all_credit_records(
+    response: Response,
+    page: PageParams = Depends(),
+    sort: Literal["newest", "oldest", "largest"] = Query("newest", description="Order by date or by largest balance"),
+    overdue: bool = Query(False, description="Only records with an installment past its due date"),
     current_user: dict = Depends(get_current_user)  # L1 and L2 can read
 ):
     """
-    Get all active credit records (customers who still owe money).
+    Get active credit records (customers who still owe money), newest first by default.
+    Use `sort` to order oldest first or by largest balance, and `overdue` to list only
+    accounts with a missed installment (soonest due first).
+    Use `limit` and `start_after` (the cursor from the X-Next-Cursor header) to page,
+    and `fields` to return only selected fields.
     L1 and L2 users can read credit records.
     """
-    credits = credit_service.get_all_credit_records()
-    return credits
+    try:
+        credits, next_cursor = credit_service.get_all_credit_records(
+            page.limit, page.start_after, page.fields, sort, overdue
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return page_response(response, page, credits, next_cursor)
 
 
 @router.get("/credit/{sale_id}", response_model=List[CreditPaymentInDB])
@@ -0,0 +1,34 @@
+# app/api/v1/endpoints/customers.py
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List
+from app.schemas.customer import CustomerInDB
+from app.services import customer_service
+from app.core.security import get_current_user
+
+router = APIRouter()
+
+@router.get("/", response_model=List[CustomerInDB])
+def search_customers(
+    q: str = Query(..., min_length=1, description="Start of a phone number or customer name"),
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Find customers whose phone number or name starts with `q`.
+    L1 and L2 users can search customers.
+    """
+    return customer_service.search_customers(q)
+
+@router.get("/{phone_number}", response_model=CustomerInDB)
+def read_customer(
+    phone_number: str,
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve a customer's ledger by phone number: lifetime spend, open balance,
+    sale IDs and last visit.
+    L1 and L2 users can read customers.
+    """
+    customer = customer_service.get_customer(phone_number)
+    if not customer:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return customer
@@ -0,0 +1,19 @@
+# app/api/v1/endpoints/dashboard.py
+from fastapi import APIRouter, Depends
+from app.schemas.dashboard import DashboardSummary
+from app.services import dashboard_service
+from app.core.security import get_current_user
+
+router = APIRouter()
+
+@router.get("/summary", response_model=DashboardSummary)
+def read_dashboard_summary(
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve the dashboard in one request: today's and month-to-date totals,
+    outstanding credit, stock value and low-stock items, and recent activity.
+    The summary is shared between requests for a few seconds.
+    L1 and L2 users can read the dashboard.
+    """
+    return dashboard_service.get_summary()
@@ -1,6 +1,7 @@
 # app/api/v1/endpoints/expenses.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from typing import List
+from app.api.v1.pagination import PageParams, page_response
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate, ExpenseInDB, ExpensesByDateResponse
 from app.services import expense_service
 from app.core.security import get_current_user, require_l2_permission
@@ -21,14 +22,21 @@ def add_new_expense(
 
 @router.get("/", response_model=List[ExpenseInDB])
 def read_all_expenses(
+    response: Response,
+    page: PageParams = Depends(),
     current_user: dict = Depends(get_current_user)  # L1 and L2 can read
 ):
     """
-    Retrieve all expenses.
+    Retrieve expenses, newest first.
+    Use `limit` and `start_after` (the cursor from the X-Next-Cursor header) to page,
+    and `fields` to return only selected fields.
     L1 and L2 users can read expenses.
     """
-    expenses = expense_service.get_all_expenses()
-    return expenses
+    try:
+        expenses, next_cursor = expense_service.get_all_expenses(page.limit, page.start_after, page.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return page_response(response, page, expenses, next_cursor)
 
 @router.get("/{expense_id}", response_model=ExpenseInDB)
 def read_expense(
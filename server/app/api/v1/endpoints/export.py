@@ -0,0 +1,41 @@
+# app/api/v1/endpoints/export.py
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from app.services import export_service
+from app.core.security import require_l2_permission
+
+router = APIRouter()
+
+@router.get("/{collection}")
+def export_collection(
+    collection: str,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    from_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD), inclusive"),
+    to_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD), inclusive"),
+    current_user: dict = Depends(require_l2_permission)  # Only L2 can export
+):
+    """
+    Stream every document of a collection as newline-delimited JSON or CSV.
+    Documents are written as they are read, so memory use stays flat
+    regardless of collection size.
+    Only L2 users can export data.
+    """
+    try:
+        export_service.validate_export(collection, from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if format == "csv":
+        content = export_service.export_csv(collection, from_date, to_date)
+        media_type = "text/csv"
+    else:
+        content = export_service.export_ndjson(collection, from_date, to_date)
+        media_type = "application/x-ndjson"
+
+    filename = f"{collection}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,12 +1,25 @@
 # app/api/v1/endpoints/inventory.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 from typing import List, Union
-from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryInDB, InventoryAction
-from app.services import inventory_service
+from app.api.v1.pagination import NEXT_CURSOR_HEADER, PagePayload, PageParams, page_response
+from app.db.pagination import parse_fields
+from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryInDB, InventoryAction, InventoryBulkRequest, InventoryBulkResponse, LowStockAlert, StockShardsUpdate
+from app.core import config
+from app.services import inventory_service, stock_alert_service
 from app.core.security import get_current_user, require_l2_permission
 
 router = APIRouter()
 
+def _parse_payload(model, payload: dict):
+    """Validates an action payload, answering 422 like a regular request body."""
+    try:
+        return model(**payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
 @router.post("/manage", response_model=Union[InventoryInDB, List[InventoryInDB], None])
 def manage_inventory(
     request: InventoryAction,
@@ -15,7 +28,8 @@ def manage_inventory(
     """
     Manage inventory items with a single endpoint.
     - `action`: "create", "update", "delete", "read"
-    - `payload`: The data for the action.
+    - `payload`: The data for the action. A "read" without `item_id` accepts
+      optional `limit`, `start_after` and `fields` keys for pagination/projection.
     
     L1 users: Can CREATE and READ only
     L2 users: Can CREATE, READ, UPDATE, and DELETE (Full CRUD)
@@ -32,7 +46,7 @@ def manage_inventory(
             )
 
     if action == "create":
-        item = InventoryCreate(**payload)
+        item = _parse_payload(InventoryCreate, payload)
         new_item = inventory_service.create_item(item)
         return new_item
 
@@ -43,14 +57,22 @@ def manage_inventory(
                 raise HTTPException(status_code=404, detail="Item not found")
             return item
         else:
-            items = inventory_service.get_all_items()
+            page = _parse_payload(PagePayload, payload)
+            fields = parse_fields(page.fields)
+            try:
+                items, next_cursor = inventory_service.get_all_items(page.limit, page.start_after, fields)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+            if fields or headers:
+                return JSONResponse(content=items, headers=headers)
             return items
 
     elif action == "update":
         if "item_id" not in payload:
             raise HTTPException(status_code=400, detail="Item ID is required for update")
         item_id = payload.pop("item_id")
-        item = InventoryUpdate(**payload)
+        item = _parse_payload(InventoryUpdate, payload)
         updated_item = inventory_service.update_item(item_id, item)
         if not updated_item:
             raise HTTPException(status_code=404, detail="Item not found")
@@ -65,4 +87,93 @@ def manage_inventory(
         return None
 
     else:
-        raise HTTPException(status_code=400, detail="Invalid action")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail="Invalid action")
+
+@router.post("/bulk", response_model=InventoryBulkResponse)
+def bulk_upsert_items(
+    request: InventoryBulkRequest,
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can access
+):
+    """
+    Create and update many inventory items at once, e.g. when a shipment arrives.
+    Rows without an `id` create an item and its linked purchase expense; rows with
+    an `id` update that item. Rows are committed in atomic chunks and each row
+    reports its own outcome in `results`.
+
+    L1 users: Can CREATE only
+    L2 users: Can CREATE and UPDATE
+    """
+    if current_user["level"] != "L2" and any(item.id for item in request.items):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to perform this action. L2 access required for update operations."
+        )
+    return inventory_service.bulk_upsert_items(request.items)
+
+@router.get("/", response_model=List[InventoryInDB])
+def read_all_items(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve inventory items ordered by ID.
+    Use `limit` and `start_after` (the cursor from the X-Next-Cursor header) to page,
+    and `fields` to return only selected fields.
+    L1 and L2 users can read inventory.
+    """
+    try:
+        items, next_cursor = inventory_service.get_all_items(page.limit, page.start_after, page.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return page_response(response, page, items, next_cursor)
+
+@router.get("/low-stock", response_model=List[LowStockAlert])
+def read_low_stock(
+    days: int = Query(config.STOCK_VELOCITY_DAYS, ge=1, le=365, description="Days of sales used for the velocity"),
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve the items at or below their reorder level, with how fast they have
+    sold over the last `days` days and how many days of stock they have left.
+    Read from the low-stock index, so the cost does not grow with the catalogue.
+    L1 and L2 users can read inventory.
+    """
+    return stock_alert_service.get_low_stock(days)
+
+@router.put("/{item_id}/stock-shards", response_model=InventoryInDB)
+def update_stock_shards(
+    item_id: str,
+    request: StockShardsUpdate,
+    current_user: dict = Depends(require_l2_permission)  # Only L2 can change stock layout
+):
+    """
+    Split an item's stock across `shards` counter documents so that several
+    counters can sell it at the same time without contending on one document.
+    Use `shards: 1` to move the stock back into the item's quantity field.
+    Only L2 users can change stock sharding.
+    """
+    item = inventory_service.set_stock_shards(item_id, request.shards)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
+
+@router.get("/cache/status")
+def read_cache_status(
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Report the size, limits and hit/miss counts of the item and listing
+    caches in this process.
+    """
+    return inventory_service.get_cache_stats()
+
+@router.get("/mirror/status")
+def read_mirror_status(
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Report whether the live inventory mirror is enabled and ready, how many
+    items it holds and its sync lag.
+    """
+    return inventory_service.get_mirror_status()
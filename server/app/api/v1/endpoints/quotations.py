@@ -1,10 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
+from app.api.v1.pagination import PageParams, page_response
 from app.core.security import get_current_user
-from app.schemas.quotation import QuotationCreate, QuotationInDB
-from app.services import quotation_service
+from app.schemas.quotation import QuotationConvert, QuotationCreate, QuotationInDB
+from app.schemas.sale import SaleInDB
+from app.services import quotation_service, sale_service
 
 router = APIRouter()
 
@@ -16,6 +18,8 @@ def create_new_quotation(
 ):
     """
     Record a quotation without modifying inventory stock levels.
+    Set `holdMinutes` to hold the quoted stock so other sales cannot take it meanwhile;
+    the quotation then carries `holdMinutes` and the hold's end in `holdExpiresAt`.
     """
     try:
         new_quotation = quotation_service.create_quotation(quotation)
@@ -41,12 +45,58 @@ def read_quotation(
     return quotation
 
 
+@router.post("/{quotation_id}/convert", response_model=SaleInDB, status_code=status.HTTP_201_CREATED)
+def convert_quotation_to_sale(
+    quotation_id: str,
+    conversion: QuotationConvert,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Turn a quotation into a sale at the quoted prices, decreasing inventory stock
+    and releasing the quotation's stock hold. A quotation can be converted once.
+    """
+    try:
+        new_sale = sale_service.convert_quotation(quotation_id, conversion)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    if not new_sale:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quotation not found")
+    return new_sale
+
+
+@router.delete("/{quotation_id}/hold", response_model=QuotationInDB)
+def release_quotation_hold(
+    quotation_id: str,
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Release the stock held for a quotation before the hold expires.
+    """
+    quotation = quotation_service.release_hold(quotation_id)
+    if not quotation:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quotation not found")
+    return quotation
+
+
 @router.get("/", response_model=List[QuotationInDB])
 def read_all_quotations(
+    response: Response,
+    page: PageParams = Depends(),
     current_user: dict = Depends(get_current_user),
 ):
     """
-    Retrieve all quotations.
+    Retrieve quotations, newest first.
+    Use `limit` and `start_after` (the cursor from the X-Next-Cursor header) to page,
+    and `fields` to return only selected fields.
     """
-    quotations = quotation_service.get_all_quotations()
-    return quotations
+    try:
+        quotations, next_cursor = quotation_service.get_all_quotations(page.limit, page.start_after, page.fields)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    return page_response(response, page, quotations, next_cursor)
@@ -1,7 +1,8 @@
 # app/api/v1/endpoints/sales.py
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
-from app.schemas.sale import SaleCreate, SaleInDB, SaleUpdate, SalesByDateResponse
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Response
+from typing import List, Optional
+from app.api.v1.pagination import PageParams, page_response
+from app.schemas.sale import SaleCreate, SaleInDB, SaleUpdate, SalesByDateResponse, SaleImportRequest, SaleImportResponse
 from app.services import sale_service
 from app.core.security import get_current_user, require_l2_permission
 
@@ -10,18 +11,33 @@ router = APIRouter()
 @router.post("/", response_model=SaleInDB, status_code=status.HTTP_201_CREATED)
 def create_new_sale(
     sale: SaleCreate,
-    current_user: dict = Depends(get_current_user)  # L1 and L2 can create
+    current_user: dict = Depends(get_current_user),  # L1 and L2 can create
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
     """
     Record a new sale. This will decrease the corresponding inventory stock.
+    Send an Idempotency-Key header to make retries safe: a repeated key returns the original result.
     L1 and L2 users can create sales.
     """
     try:
-        new_sale = sale_service.create_sale(sale)
+        new_sale = sale_service.create_sale(sale, idempotency_key)
         return new_sale
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post("/import", response_model=SaleImportResponse)
+def import_sales(
+    payload: SaleImportRequest,
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can create
+):
+    """
+    Record many sales at once, e.g. sales collected on paper while offline.
+    Sales are committed in chunked transactions with one stock update per item per chunk.
+    Each record succeeds or fails on its own; see `results` for per-record outcomes.
+    L1 and L2 users can import sales.
+    """
+    return sale_service.import_sales(payload.sales)
+
 @router.get("/{sale_id}", response_model=SaleInDB)
 def read_sale(
     sale_id: str,
@@ -38,14 +54,21 @@ def read_sale(
 
 @router.get("/", response_model=List[SaleInDB])
 def read_all_sales(
+    response: Response,
+    page: PageParams = Depends(),
     current_user: dict = Depends(get_current_user)  # L1 and L2 can read
 ):
     """
-    Retrieve all sales.
+    Retrieve sales, newest first.
+    Use `limit` and `start_after` (the cursor from the X-Next-Cursor header) to page,
+    and `fields` to return only selected fields.
     L1 and L2 users can read sales.
     """
-    sales = sale_service.get_all_sales()
-    return sales
+    try:
+        sales, next_cursor = sale_service.get_all_sales(page.limit, page.start_after, page.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return page_response(response, page, sales, next_cursor)
 
 @router.get("/by_date/{date}", response_model=SalesByDateResponse)
 def read_sales_by_date(
@@ -0,0 +1,36 @@
+# app/api/v1/endpoints/search.py
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Literal
+from app.schemas.search import SearchResponse
+from app.services import search_service
+from app.core.security import get_current_user
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResponse, response_model_exclude_none=True)
+def search(
+    q: str = Query(..., min_length=1, description="Words to match, e.g. 'singer 20' or '0771'"),
+    scope: Literal["all", "inventory", "sales"] = Query("all"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum results per scope"),
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Search inventory by item name or model number, and sales from the last
+    SEARCH_SALES_DAYS days by customer name or phone number. Every word of `q` must start a word of the matched fields.
+    Served from an in-memory index, so no database reads are made.
+    L1 and L2 users can search.
+    """
+    try:
+        return search_service.search(q, scope, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+@router.get("/status")
+def read_search_status(
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Report whether the search index is ready, how many items and sales it
+    holds, the first day of the indexed sales and the date of the newest one.
+    """
+    return search_service.get_status()
@@ -0,0 +1,63 @@
+# app/api/v1/endpoints/stats.py
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import Literal
+from app.schemas.stats import DailyStats, ReportResponse
+from app.db.transactions import metrics as transaction_metrics
+from app.services import stats_service, report_service
+from app.core.security import get_current_user, require_l2_permission
+
+router = APIRouter()
+
+@router.get("/daily/{date}", response_model=DailyStats)
+def read_daily_stats(
+    date: str,
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve the sales and expense totals for a specific date (YYYY-MM-DD).
+    Totals are maintained as sales and expenses are written, so this is a single read.
+    L1 and L2 users can read stats.
+    """
+    return stats_service.get_daily_stats(date)
+
+@router.post("/daily/{date}/rebuild", response_model=DailyStats)
+def rebuild_daily_stats(
+    date: str,
+    current_user: dict = Depends(require_l2_permission)  # Only L2 can rebuild
+):
+    """
+    Recompute a day's totals from its sales and expenses.
+    Use this to backfill days recorded before totals were maintained; rebuilding
+    the day before the rollup start moves the start (and reports' scans) back a day.
+    Only L2 users can rebuild stats.
+    """
+    return stats_service.rebuild_daily_stats(date)
+
+@router.get("/report", response_model=ReportResponse)
+def read_report(
+    from_date: str = Query(..., alias="from", description="Start date (YYYY-MM-DD), inclusive"),
+    to_date: str = Query(..., alias="to", description="End date (YYYY-MM-DD), inclusive"),
+    granularity: Literal["day", "week", "month", "year"] = Query("day"),
+    source: Literal["rollup", "scan"] = Query("rollup", description="Read daily rollups or scan sales/expenses"),
+    current_user: dict = Depends(get_current_user)  # L1 and L2 can read
+):
+    """
+    Retrieve revenue, expenses, old item deductions, borrowed item profit and
+    outstanding credit for a date range, bucketed by day, week, month or year.
+    L1 and L2 users can read reports.
+    """
+    try:
+        return report_service.get_report(from_date, to_date, granularity, source)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/transactions")
+def read_transaction_metrics(
+    current_user: dict = Depends(require_l2_permission)  # Only L2 can read
+):
+    """
+    Report, per transaction operation since startup: calls, attempts and retries,
+    commit aborts by reason, and wall time spent reading, validating, writing and committing.
+    Only L2 users can read transaction metrics.
+    """
+    return transaction_metrics.snapshot()
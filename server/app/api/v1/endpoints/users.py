@@ -1,7 +1,10 @@
 # app/api/v1/endpoints/users.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from typing import List
 from datetime import timedelta
+from app.core import config
+from app.core.concurrency import PoolSaturatedError
+from app.core.rate_limit import FailureThrottle
 from app.schemas.user import UserCreate, UserUpdate, UserInDB, UserLogin, Token
 from app.services import user_service
 from app.core.security import (
@@ -13,6 +16,10 @@ from app.core.security import (
 
 router = APIRouter()
 
+# Failed-login throttles; the IP limit is looser because a shop's tablets share one address
+user_login_throttle = FailureThrottle(config.LOGIN_MAX_FAILURES_PER_USER, config.LOGIN_THROTTLE_WINDOW_SECONDS)
+ip_login_throttle = FailureThrottle(config.LOGIN_MAX_FAILURES_PER_IP, config.LOGIN_THROTTLE_WINDOW_SECONDS)
+
 @router.post("/register", response_model=UserInDB, status_code=status.HTTP_201_CREATED)
 def register_user(
     user: UserCreate,
@@ -28,22 +35,44 @@ def register_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin):
+async def login(user_credentials: UserLogin, request: Request):
     """
     Authenticate user and return access token.
+    Repeated failures for a username or client IP are throttled (429).
     """
-    user = user_service.authenticate_user(
-        user_credentials.username, 
-        user_credentials.password
-    )
+    username_key = user_service.normalize_username(user_credentials.username)
+    client_ip = request.client.host if request.client else "unknown"
+
+    retry_after = max(user_login_throttle.retry_after(username_key), ip_login_throttle.retry_after(client_ip))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts. Please try again later.",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+
+    try:
+        user = await user_service.authenticate_user(
+            user_credentials.username, 
+            user_credentials.password
+        )
+    except PoolSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     
     if not user:
+        user_login_throttle.record_failure(username_key)
+        ip_login_throttle.record_failure(client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    user_login_throttle.reset(username_key)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user["username"], "level": user["level"]},
@@ -0,0 +1,40 @@
+# app/api/v1/pagination.py
+from typing import List, Optional
+from fastapi import Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from app.db.pagination import MAX_PAGE_SIZE, parse_fields
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """Query parameters shared by every paginated list route."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of records to return"),
+        start_after: Optional[str] = Query(None, description="ID of the last record from the previous page"),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields to return (id is always included)"),
+    ):
+        self.limit = limit
+        self.start_after = start_after
+        self.fields: Optional[List[str]] = parse_fields(fields)
+
+class PagePayload(BaseModel):
+    """The same parameters, for routes that take them in a JSON payload."""
+    limit: Optional[int] = Field(None, ge=1, le=MAX_PAGE_SIZE)
+    start_after: Optional[str] = None
+    fields: Optional[str] = None
+
+def page_response(response: Response, page: PageParams, items: list, next_cursor: Optional[str]):
+    """
+    Returns a page of records, passing the next cursor in the X-Next-Cursor header.
+    Projected pages skip response-model validation since they are partial records.
+    """
+    if page.fields:
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return JSONResponse(content=items, headers=headers)
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
@@ -0,0 +1,81 @@
+# app/core/concurrency.py
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import anyio.to_thread
+
+logger = logging.getLogger(__name__)
+
+def configure_threadpool(size: int):
+    """
+    Sets how many sync route handlers can wait on Firestore at once.
+    Starlette runs every `def` route in AnyIO's default thread limiter
+    (40 tokens out of the box); this must be called from the running event loop.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = size
+
+def get_threadpool_stats() -> dict:
+    """How many sync route handlers may run at once, and how many are running. Call from the event loop."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {"size": limiter.total_tokens, "inUse": limiter.borrowed_tokens}
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a bounded pool already has its maximum number of pending tasks."""
+
+class BoundedPool:
+    """
+    A small dedicated thread pool for CPU-heavy work (bcrypt) that must not
+    compete with request handlers for the main threadpool. At most `max_pending`
+    tasks may be running or queued; further submissions fail fast.
+    """
+
+    def __init__(self, workers: int, max_pending: int, name: str):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    async def run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PoolSaturatedError("Too many requests are waiting; try again shortly.")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+class PeriodicTask:
+    """
+    Runs `function` every `interval` seconds on a daemon thread until stopped.
+    Exceptions are logged and the next run goes ahead as scheduled.
+    """
+
+    def __init__(self, function, interval: float, name: str):
+        self._function = function
+        self._interval = interval
+        self._name = name
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self._interval)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self._function()
+            except Exception:
+                logger.exception("Periodic task %s failed", self._name)
@@ -4,4 +4,77 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
\ No newline at end of file
+FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
+
+# Storage backend: "firestore" (default), "sqlite" (local file) or "memory" (tests/benchmarks)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "storage/lsp.sqlite3")
+
+# In-process inventory catalogue cache (per worker process)
+INVENTORY_CACHE_TTL_SECONDS = float(os.getenv("INVENTORY_CACHE_TTL_SECONDS", "300"))
+INVENTORY_CACHE_MAX_ITEMS = int(os.getenv("INVENTORY_CACHE_MAX_ITEMS", "2048"))
+# How long a sharded item's summed stock is reused; this process's own stock writes drop it at once
+STOCK_TOTAL_CACHE_TTL_SECONDS = float(os.getenv("STOCK_TOTAL_CACHE_TTL_SECONDS", "10"))
+
+# Keep a live in-memory mirror of the inventory collection via on_snapshot
+INVENTORY_MIRROR_ENABLED = os.getenv("INVENTORY_MIRROR_ENABLED", "false").lower() in ("1", "true", "yes")
+# How often the mirror checks that its listener is still running (and resubscribes if not)
+INVENTORY_MIRROR_CHECK_SECONDS = float(os.getenv("INVENTORY_MIRROR_CHECK_SECONDS", "5"))
+
+# Authentication caches
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+USER_STATUS_REFRESH_SECONDS = float(os.getenv("USER_STATUS_REFRESH_SECONDS", "5"))
+
+# Login: bcrypt cost, dedicated hashing pool and failed-attempt throttling
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+LOGIN_THROTTLE_WINDOW_SECONDS = float(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "300"))
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "30"))  # Shop tablets share one IP
+
+# Number of sync request handlers allowed to block on I/O concurrently
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "200"))
+
+# Quotation stock holds: longest allowed hold, and how often/how many expired holds the sweeper releases
+RESERVATION_MAX_HOLD_MINUTES = int(os.getenv("RESERVATION_MAX_HOLD_MINUTES", "10080"))  # 7 days
+RESERVATION_SWEEP_INTERVAL_SECONDS = float(os.getenv("RESERVATION_SWEEP_INTERVAL_SECONDS", "60"))
+RESERVATION_SWEEP_BATCH_SIZE = int(os.getenv("RESERVATION_SWEEP_BATCH_SIZE", "50"))
+
+# Idempotency-Key replays: how long keys are honoured, and the per-process cache of recent responses
+IDEMPOTENCY_KEY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "1024"))
+IDEMPOTENCY_CACHE_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_CACHE_TTL_SECONDS", "600"))
+
+# Documents each day's stats are spread over. Every checkout writes its day's stats, so raise this
+# when more than about one sale a second is recorded; reading a day then takes that many documents
+DAILY_STATS_SHARDS = max(1, int(os.getenv("DAILY_STATS_SHARDS", "1")))
+
+# Transaction retries: attempts per transaction and jittered backoff between them.
+# TRANSACTION_MAX_ATTEMPTS_OVERRIDES sets attempts per operation, e.g. "process_sale_transaction=8,update_item_transaction=3"
+TRANSACTION_MAX_ATTEMPTS = int(os.getenv("TRANSACTION_MAX_ATTEMPTS", "5"))
+TRANSACTION_BACKOFF_BASE_SECONDS = float(os.getenv("TRANSACTION_BACKOFF_BASE_SECONDS", "0.02"))
+TRANSACTION_BACKOFF_MAX_SECONDS = float(os.getenv("TRANSACTION_BACKOFF_MAX_SECONDS", "1.0"))
+TRANSACTION_MAX_ATTEMPTS_OVERRIDES = {
+    name.strip(): int(attempts)
+    for name, attempts in (
+        entry.split("=", 1) for entry in os.getenv("TRANSACTION_MAX_ATTEMPTS_OVERRIDES", "").split(",") if "=" in entry
+    )
+}
+
+# Dashboard summary: how long one computed summary is shared between requests, and low-stock levels
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", "5"))
+CRITICAL_STOCK_THRESHOLD = int(os.getenv("CRITICAL_STOCK_THRESHOLD", "2"))
+
+# Stock alerts: days of sales behind the velocity figures, and how often the monitor checks stock
+STOCK_VELOCITY_DAYS = int(os.getenv("STOCK_VELOCITY_DAYS", "30"))
+STOCK_ALERT_INTERVAL_SECONDS = float(os.getenv("STOCK_ALERT_INTERVAL_SECONDS", "300"))
+
+# Search index: how often each process picks up sales updated elsewhere (only those are read),
+# and how often it rebuilds from every item and searchable sale to drop deletions made elsewhere
+SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+SEARCH_INDEX_REBUILD_SECONDS = float(os.getenv("SEARCH_INDEX_REBUILD_SECONDS", str(6 * 3600)))
+# Sales searchable by customer: those from the last SEARCH_SALES_DAYS days, newest SEARCH_SALES_MAX at most
+SEARCH_SALES_DAYS = int(os.getenv("SEARCH_SALES_DAYS", "365"))
+SEARCH_SALES_MAX = int(os.getenv("SEARCH_SALES_MAX", "50000"))
@@ -0,0 +1,45 @@
+# app/core/rate_limit.py
+import threading
+import time
+from collections import deque
+from app.core.cache import TTLCache
+
+class FailureThrottle:
+    """
+    Sliding-window limit on failures per key (e.g. a username or client IP).
+    Once a key has `max_failures` failures within `window` seconds it is
+    blocked until the oldest of them leaves the window.
+    """
+
+    def __init__(self, max_failures: int, window: float, max_keys: int = 10000):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = TTLCache(maxsize=max_keys, ttl=window)
+        self._lock = threading.Lock()
+
+    def _recent(self, key: str, now: float) -> deque:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        return failures
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until `key` may try again; 0 if it is not blocked."""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            if len(failures) < self.max_failures:
+                return 0.0
+            return max(0.0, failures[0] + self.window - now)
+
+    def record_failure(self, key: str):
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            failures.append(now)
+            self._failures.set(key, failures)
+
+    def reset(self, key: str):
+        self._failures.delete(key)
@@ -0,0 +1,133 @@
+# app/core/search_index.py
+import bisect
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+def tokenize(*texts: Optional[str]) -> Set[str]:
+    """
+    Lowercase alphanumeric tokens of the given texts. Each text is also indexed
+    with its separators removed, so "BM-0042" matches "bm00" as well as "0042".
+    """
+    tokens = set()
+    for text in texts:
+        parts = _TOKEN_PATTERN.findall((text or "").lower())
+        tokens.update(parts)
+        if len(parts) > 1:
+            tokens.add("".join(parts))
+    return tokens
+
+class PrefixIndex:
+    """
+    A thread-safe in-memory inverted index answering token-prefix queries.
+
+    Tokens are kept in a sorted list, so the tokens starting with a prefix are a
+    contiguous slice found by binary search. Each document also carries a small
+    summary that search results return, so no database read is needed to show them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sorted_tokens: List[str] = []
+        self._postings: Dict[str, Set[str]] = {}
+        self._tokens_by_id: Dict[str, Set[str]] = {}
+        self._summaries: Dict[str, dict] = {}
+        # Changes made since begin_rebuild(): {doc_id: (tokens, summary), or None if removed}
+        self._pending: Optional[Dict[str, Optional[tuple]]] = None
+
+    def _remove(self, doc_id: str):
+        for token in self._tokens_by_id.pop(doc_id, ()):
+            ids = self._postings[token]
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[token]
+                del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+        self._summaries.pop(doc_id, None)
+
+    def _add(self, doc_id: str, tokens: Set[str], summary: dict):
+        self._remove(doc_id)
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                bisect.insort(self._sorted_tokens, token)
+            self._postings[token].add(doc_id)
+        self._tokens_by_id[doc_id] = tokens
+        self._summaries[doc_id] = summary
+
+    def add(self, doc_id: str, tokens: Set[str], summary: dict):
+        """Indexes (or re-indexes) a document under `tokens`."""
+        with self._lock:
+            self._add(doc_id, tokens, summary)
+            if self._pending is not None:
+                self._pending[doc_id] = (tokens, summary)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+            if self._pending is not None:
+                self._pending[doc_id] = None
+
+    def begin_rebuild(self):
+        """
+        Starts recording add() and remove() calls, so the next replace_all()
+        re-applies those made while its documents were being read.
+        """
+        with self._lock:
+            self._pending = {}
+
+    def replace_all(self, documents: Iterable[tuple]):
+        """
+        Rebuilds the index from (doc_id, tokens, summary) tuples, then re-applies
+        any changes made since begin_rebuild().
+        """
+        postings: Dict[str, Set[str]] = {}
+        tokens_by_id, summaries = {}, {}
+        for doc_id, tokens, summary in documents:
+            for token in tokens:
+                postings.setdefault(token, set()).add(doc_id)
+            tokens_by_id[doc_id] = tokens
+            summaries[doc_id] = summary
+        with self._lock:
+            self._postings = postings
+            self._sorted_tokens = sorted(postings)
+            self._tokens_by_id = tokens_by_id
+            self._summaries = summaries
+            for doc_id, entry in (self._pending or {}).items():
+                if entry is None:
+                    self._remove(doc_id)
+                else:
+                    self._add(doc_id, *entry)
+            self._pending = None
+
+    def get(self, doc_id: str) -> Optional[dict]:
+        with self._lock:
+            summary = self._summaries.get(doc_id)
+            return dict(summary) if summary is not None else None
+
+    def _matching(self, prefix: str) -> Set[str]:
+        ids = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            ids |= self._postings[token]
+        return ids
+
+    def search(self, query: str) -> List[dict]:
+        """Summaries of the documents matching every term of `query` as a token prefix."""
+        terms = _TOKEN_PATTERN.findall(query.lower())
+        if not terms:
+            return []
+        with self._lock:
+            ids = None
+            for term in sorted(terms, key=len, reverse=True):  # Longest (most selective) first
+                ids = self._matching(term) if ids is None else ids & self._matching(term)
+                if not ids:
+                    return []
+            return [dict(self._summaries[doc_id]) for doc_id in ids]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._summaries)
@@ -1,23 +1,56 @@
 # app/core/security.py
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.core.cache import TTLCache
+from app.core.concurrency import BoundedPool
+from app.db.firebase_config import users_collection
 
 # Security configurations
 SECRET_KEY = "your-secret-key-change-this-in-production"  # Change this!
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 480  # 8 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Raising BCRYPT_ROUNDS also raises min_rounds, so older hashes are upgraded on next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=config.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=config.BCRYPT_ROUNDS,
+)
 security = HTTPBearer()
 
+# bcrypt runs here rather than in the request threadpool, so login bursts cannot stall sales
+password_pool = BoundedPool(config.PASSWORD_HASH_WORKERS, config.PASSWORD_HASH_MAX_PENDING, "password-hash")
+
+# Verified token payloads keyed by token hash; entries never outlive the token's exp
+_token_cache = TTLCache(maxsize=config.TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Usernames of deactivated users, refreshed from Firestore every USER_STATUS_REFRESH_SECONDS
+_inactive_usernames = set()
+_inactive_refreshed_at = 0.0
+_inactive_lock = threading.Lock()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password."""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash uses outdated settings, return a new hash.
+    Returns (is_valid, new_hash_or_None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
@@ -46,10 +79,54 @@ def decode_access_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+def decode_access_token_cached(token: str) -> dict:
+    """Decode a JWT access token, reusing the result of an earlier verification while it is unexpired."""
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    payload = _token_cache.get(token_key)
+
+    if payload is None:
+        payload = decode_access_token(token)
+        remaining = payload.get("exp", 0) - time.time()
+        if remaining > 0:
+            _token_cache.set(token_key, payload, ttl=remaining)
+    elif payload.get("exp", 0) <= time.time():
+        _token_cache.delete(token_key)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return payload
+
+def mark_user_inactive(username: Optional[str]):
+    """Reject a deactivated user's tokens in this process immediately."""
+    if username:
+        with _inactive_lock:
+            _inactive_usernames.add(username)
+
+def refresh_inactive_users(force: bool = False):
+    """Reloads the deactivated-user set if it is older than USER_STATUS_REFRESH_SECONDS."""
+    global _inactive_usernames, _inactive_refreshed_at
+    if not force and time.monotonic() - _inactive_refreshed_at < config.USER_STATUS_REFRESH_SECONDS:
+        return
+    # Only one request refreshes; the rest keep using the current set
+    if not _inactive_lock.acquire(blocking=False):
+        return
+    try:
+        docs = users_collection.where(filter=FieldFilter("is_active", "==", False)).select(["username"]).stream()
+        _inactive_usernames = {doc.to_dict().get("username") for doc in docs}
+        _inactive_refreshed_at = time.monotonic()
+    finally:
+        _inactive_lock.release()
+
+def _inactive_users_stale() -> bool:
+    return time.monotonic() - _inactive_refreshed_at >= config.USER_STATUS_REFRESH_SECONDS
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get the current authenticated user."""
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     
     username: str = payload.get("sub")
     level: str = payload.get("level")
@@ -59,6 +136,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+
+    if _inactive_users_stale():
+        await run_in_threadpool(refresh_inactive_users)
+
+    if username in _inactive_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User account is inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
     return {"username": username, "level": level}
 
@@ -0,0 +1,25 @@
+# app/db/batching.py
+from typing import Callable, Iterable, List, Optional
+
+# Firestore rejects a commit (batch or transaction) with more than 500 writes.
+# Chunks stay a little under it since per-row write counts are estimates.
+MAX_WRITES_PER_COMMIT = 500
+MAX_WRITES_PER_CHUNK = 450
+
+def chunk_by_writes(rows: Iterable, writes_for: Callable, max_writes: int = MAX_WRITES_PER_CHUNK, max_rows: Optional[int] = None) -> List[list]:
+    """
+    Splits `rows` into consecutive chunks whose estimated writes (`writes_for(row)`)
+    fit in one commit, optionally capping the rows per chunk. Order is preserved.
+    """
+    chunks = []
+    chunk, chunk_writes = [], 0
+    for row in rows:
+        writes = writes_for(row)
+        if chunk and (chunk_writes + writes > max_writes or (max_rows and len(chunk) >= max_rows)):
+            chunks.append(chunk)
+            chunk, chunk_writes = [], 0
+        chunk.append(row)
+        chunk_writes += writes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
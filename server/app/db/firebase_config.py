@@ -2,6 +2,8 @@
 import firebase_admin
 from firebase_admin import credentials, firestore
 from app.core import config
+from app.db.local_client import create_client
+from app.db.transactions import mark_phase, transactional  # noqa: F401 (re-exported for services)
 import os
 import logging
 
@@ -12,12 +14,16 @@ os.environ['GRPC_POLL_STRATEGY'] = 'poll'
 # Suppress ALTS credentials warning
 logging.getLogger('google.auth.transport.grpc').setLevel(logging.ERROR)
 
-# This check prevents re-initializing the app in --reload mode
-if not firebase_admin._apps:
-    cred = credentials.Certificate(config.FIREBASE_CREDENTIALS_PATH)
-    firebase_admin.initialize_app(cred)
+if config.STORAGE_BACKEND == "firestore":
+    # This check prevents re-initializing the app in --reload mode
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(config.FIREBASE_CREDENTIALS_PATH)
+        firebase_admin.initialize_app(cred)
 
-db = firestore.client()
+    db = firestore.client()
+else:
+    # "memory" or "sqlite": a local client with the same API, no credentials needed
+    db = create_client(config.STORAGE_BACKEND, config.SQLITE_PATH)
 
 # Collections
 inventory_collection = db.collection('inventory')
@@ -26,3 +32,11 @@ expenses_collection = db.collection('expenses')
 credit_payments_collection = db.collection('credit_payments')
 credit_collection = db.collection('credit')
 quotations_collection = db.collection('quotations')
+daily_stats_collection = db.collection('daily_stats')
+users_collection = db.collection('users')
+usernames_collection = db.collection('usernames')  # usernames/{normalized username} -> {"userId": ...}
+stock_reservations_collection = db.collection('stock_reservations')  # stock_reservations/{itemId} -> {"holds": {quotationId: {...}}}
+idempotency_collection = db.collection('idempotency')  # idempotency/{sha256(scope:key)} -> stored response of a POST
+customers_collection = db.collection('customers')  # customers/{normalized phone} -> per-customer ledger totals
+low_stock_collection = db.collection('low_stock')  # low_stock/{itemId} -> stock of an item at or below its reorder level
+meta_collection = db.collection('meta')  # meta/{name} -> bookkeeping shared by every worker, e.g. meta/daily_stats
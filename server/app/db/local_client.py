@@ -0,0 +1,757 @@
+# app/db/local_client.py
+"""
+Local storage backends that speak the subset of the Firestore client API the
+services use (documents, queries, multi-get, transactions, batches and
+on_snapshot), so the app can run without Firebase credentials.
+
+- "memory": everything lives in a dict; lost on restart. For tests and benchmarks.
+- "sqlite": documents are stored as JSON rows in a SQLite file. For offline,
+  single-shop deployments.
+
+Transactions take a client-wide lock (plus SQLite's write lock) for their whole
+duration, so they are serializable and never need retries. Every other read
+and write in the process waits on that lock while a transaction function runs,
+so throughput is one transaction at a time: fine for one shop, not for load
+that needs Firestore's per-document concurrency. Queries are evaluated in
+Python over the collection's documents.
+"""
+import contextlib
+import copy
+import enum
+import json
+import os
+import secrets
+import sqlite3
+import string
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1 import transforms
+
+_MISSING = object()
+_ID_ALPHABET = string.ascii_letters + string.digits
+DOCUMENT_ID = "__name__"
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+_READ_AFTER_WRITE_ERROR = "Attempted read after write in a transaction."
+
+
+def _new_document_id() -> str:
+    return "".join(secrets.choice(_ID_ALPHABET) for _ in range(20))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# --- Field paths and values ---
+
+def _split_path(field_path: str) -> List[str]:
+    return field_path.split(".")
+
+
+def _get_field(data: dict, field_path: str):
+    value = data
+    for part in _split_path(field_path):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_field(data: dict, field_path: str, value):
+    parts = _split_path(field_path)
+    target = data
+    for part in parts[:-1]:
+        if not isinstance(target.get(part), dict):
+            target[part] = {}
+        target = target[part]
+    _apply_value(target, parts[-1], value)
+
+
+def _apply_value(target: dict, key: str, value):
+    """Writes `value` into target[key], resolving Firestore transforms and sentinels."""
+    if value is transforms.DELETE_FIELD:
+        target.pop(key, None)
+    elif value is transforms.SERVER_TIMESTAMP:
+        target[key] = _now()
+    elif isinstance(value, transforms.Increment):
+        current = target.get(key)
+        if isinstance(current, bool) or not isinstance(current, (int, float)):
+            current = 0
+        target[key] = current + value.value
+    elif isinstance(value, transforms.ArrayUnion):
+        current = target.get(key)
+        current = list(current) if isinstance(current, list) else []
+        for element in value.values:
+            if element not in current:
+                current.append(copy.deepcopy(element))
+        target[key] = current
+    elif isinstance(value, transforms.ArrayRemove):
+        current = target.get(key)
+        current = list(current) if isinstance(current, list) else []
+        target[key] = [element for element in current if element not in value.values]
+    elif isinstance(value, dict):
+        resolved = {}
+        _merge_into(resolved, value)
+        target[key] = resolved
+    else:
+        target[key] = copy.deepcopy(value)
+
+
+def _merge_into(target: dict, updates: dict):
+    """Deep-merges `updates` into `target` the way set(..., merge=True) does."""
+    for key, value in updates.items():
+        if isinstance(value, dict):
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            _merge_into(target[key], value)
+        else:
+            _apply_value(target, key, value)
+
+
+def _order_key(value):
+    """Sort key following Firestore's cross-type ordering."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value.timestamp())
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, LocalDocumentReference):
+        return (6, value.path)
+    if isinstance(value, list):
+        return (8, [_order_key(element) for element in value])
+    if isinstance(value, dict):
+        return (9, sorted((key, _order_key(element)) for key, element in value.items()))
+    return (10, str(value))
+
+
+def _matches(value, op: str, expected) -> bool:
+    if value is _MISSING:
+        return False
+    if op == "==":
+        return _order_key(value) == _order_key(expected)
+    if op == "!=":
+        return _order_key(value) != _order_key(expected)
+    if op in ("<", "<=", ">", ">="):
+        left, right = _order_key(value), _order_key(expected)
+        if left[0] != right[0]:
+            return False
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        return left >= right
+    if op == "in":
+        return any(_order_key(value) == _order_key(option) for option in expected)
+    if op == "not-in":
+        return all(_order_key(value) != _order_key(option) for option in expected)
+    if op == "array_contains":
+        return isinstance(value, list) and any(_order_key(element) == _order_key(expected) for element in value)
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(
+            _order_key(element) == _order_key(option) for element in value for option in expected
+        )
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+# --- Snapshots and change events ---
+
+class LocalDocumentSnapshot:
+    def __init__(self, reference, data: Optional[dict], read_time: datetime):
+        self.reference = reference
+        self._data = data
+        self.read_time = read_time
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[dict]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str):
+        if field_path == DOCUMENT_ID:
+            return self.reference
+        value = _get_field(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class ChangeType(enum.Enum):
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+
+class LocalDocumentChange:
+    def __init__(self, type: ChangeType, document: LocalDocumentSnapshot):
+        self.type = type
+        self.document = document
+
+
+class LocalWatch:
+    def __init__(self, client, collection_path: str, callback):
+        self._client = client
+        self._collection_path = collection_path
+        self._callback = callback
+
+    def unsubscribe(self):
+        self._client._remove_listener(self._collection_path, self)
+
+
+# --- Queries and references ---
+
+class LocalQuery:
+    def __init__(self, parent, filters=(), orders=(), limit=None, offset=None, projection=None, cursors=None):
+        self._parent = parent
+        self._filters = list(filters)
+        self._orders = list(orders)
+        self._limit = limit
+        self._offset = offset
+        self._projection = projection
+        self._cursors = dict(cursors or {})
+
+    @property
+    def _client(self):
+        return self._parent._client
+
+    def _copy(self, **overrides):
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit": self._limit,
+            "offset": self._offset,
+            "projection": self._projection,
+            "cursors": self._cursors,
+        }
+        state.update(overrides)
+        return LocalQuery(self._parent, **state)
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None, value=None, *, filter=None):
+        if filter is not None:
+            if not hasattr(filter, "op_string"):
+                raise NotImplementedError("Composite filters are not supported by the local backend.")
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + [(field_path, op_string, value)])
+
+    def order_by(self, field_path: str, direction: str = ASCENDING):
+        return self._copy(orders=self._orders + [(field_path, direction)])
+
+    def limit(self, count: int):
+        return self._copy(limit=count)
+
+    def offset(self, num_to_skip: int):
+        return self._copy(offset=num_to_skip)
+
+    def select(self, field_paths: Iterable[str]):
+        return self._copy(projection=list(field_paths))
+
+    def start_at(self, document_fields_or_snapshot):
+        return self._copy(cursors={**self._cursors, "start": (document_fields_or_snapshot, True)})
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(cursors={**self._cursors, "start": (document_fields_or_snapshot, False)})
+
+    def end_before(self, document_fields_or_snapshot):
+        return self._copy(cursors={**self._cursors, "end": (document_fields_or_snapshot, False)})
+
+    def end_at(self, document_fields_or_snapshot):
+        return self._copy(cursors={**self._cursors, "end": (document_fields_or_snapshot, True)})
+
+    def stream(self, transaction=None):
+        if transaction is not None:
+            transaction._check_read()
+        return iter(self._execute())
+
+    def get(self, transaction=None) -> List[LocalDocumentSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+    # --- Execution ---
+    def _effective_orders(self) -> List[Tuple[str, str]]:
+        orders = list(self._orders)
+        ordered_fields = {field for field, _ in orders}
+        for field, op, _ in self._filters:
+            if op in ("<", "<=", ">", ">=", "!=", "not-in") and field not in ordered_fields:
+                orders.insert(0, (field, ASCENDING))
+                ordered_fields.add(field)
+        if DOCUMENT_ID not in ordered_fields:
+            orders.append((DOCUMENT_ID, orders[-1][1] if orders else ASCENDING))
+        return orders
+
+    @staticmethod
+    def _value(doc_id: str, data: dict, field_path: str):
+        if field_path == DOCUMENT_ID:
+            return doc_id
+        return _get_field(data, field_path)
+
+    def _cursor_values(self, cursor, orders) -> list:
+        if isinstance(cursor, LocalDocumentSnapshot):
+            data = cursor._data or {}
+            return [self._value(cursor.id, data, field) for field, _ in orders]
+        if isinstance(cursor, dict):
+            return [cursor.get(field, _MISSING) for field, _ in orders]
+        return list(cursor)
+
+    @staticmethod
+    def _compare(values, cursor_values, orders) -> int:
+        for value, cursor_value, (field, direction) in zip(values, cursor_values, orders):
+            if cursor_value is _MISSING:
+                continue
+            if field == DOCUMENT_ID and isinstance(cursor_value, LocalDocumentReference):
+                cursor_value = cursor_value.id
+            left, right = _order_key(value), _order_key(cursor_value)
+            if left != right:
+                result = -1 if left < right else 1
+                return -result if direction == DESCENDING else result
+        return 0
+
+    def _execute(self) -> List[LocalDocumentSnapshot]:
+        client = self._client
+        with client._lock:
+            documents = client._store.list(self._parent._path)
+        read_time = _now()
+
+        rows = []
+        for doc_id, data in documents:
+            if all(_matches(self._value(doc_id, data, field), op, value) for field, op, value in self._filters):
+                rows.append((doc_id, data))
+
+        orders = self._effective_orders()
+        keyed = []
+        for doc_id, data in rows:
+            values = [self._value(doc_id, data, field) for field, _ in orders]
+            if any(value is _MISSING for value in values):
+                continue
+            keyed.append((values, doc_id, data))
+
+        for index in reversed(range(len(orders))):
+            keyed.sort(key=lambda row: _order_key(row[0][index]), reverse=orders[index][1] == DESCENDING)
+
+        if "start" in self._cursors:
+            cursor, inclusive = self._cursors["start"]
+            cursor_values = self._cursor_values(cursor, orders)
+            keyed = [
+                row for row in keyed
+                if (self._compare(row[0], cursor_values, orders) >= 0 if inclusive else self._compare(row[0], cursor_values, orders) > 0)
+            ]
+        if "end" in self._cursors:
+            cursor, inclusive = self._cursors["end"]
+            cursor_values = self._cursor_values(cursor, orders)
+            keyed = [
+                row for row in keyed
+                if (self._compare(row[0], cursor_values, orders) <= 0 if inclusive else self._compare(row[0], cursor_values, orders) < 0)
+            ]
+
+        if self._offset:
+            keyed = keyed[self._offset:]
+        if self._limit is not None:
+            keyed = keyed[:self._limit]
+
+        snapshots = []
+        for _, doc_id, data in keyed:
+            if self._projection is not None:
+                projected = {}
+                for field_path in self._projection:
+                    value = _get_field(data, field_path)
+                    if value is not _MISSING:
+                        _set_field(projected, field_path, value)
+                data = projected
+            snapshots.append(LocalDocumentSnapshot(self._parent.document(doc_id), copy.deepcopy(data), read_time))
+        return snapshots
+
+
+class LocalCollectionReference(LocalQuery):
+    def __init__(self, client, path: str):
+        self._client_ref = client
+        self._path = path
+        super().__init__(self)
+
+    @property
+    def _client(self):
+        return self._client_ref
+
+    @property
+    def id(self) -> str:
+        return self._path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self):
+        if "/" not in self._path:
+            return None
+        return LocalDocumentReference(self._client, self._path.rsplit("/", 1)[0])
+
+    def document(self, document_id: Optional[str] = None):
+        return LocalDocumentReference(self._client, f"{self._path}/{document_id or _new_document_id()}")
+
+    def add(self, document_data: dict, document_id: Optional[str] = None):
+        doc_ref = self.document(document_id)
+        doc_ref.create(document_data)
+        return _now(), doc_ref
+
+    def list_documents(self):
+        with self._client._lock:
+            return [self.document(doc_id) for doc_id, _ in self._client._store.list(self._path)]
+
+    def on_snapshot(self, callback):
+        return self._client._add_listener(self._path, callback)
+
+
+class LocalDocumentReference:
+    def __init__(self, client, path: str):
+        self._client = client
+        self.path = path
+
+    @property
+    def id(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def _collection_path(self) -> str:
+        return self.path.rsplit("/", 1)[0]
+
+    @property
+    def parent(self):
+        return LocalCollectionReference(self._client, self._collection_path)
+
+    def collection(self, collection_id: str):
+        return LocalCollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    def __eq__(self, other):
+        return isinstance(other, LocalDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def get(self, field_paths=None, transaction=None) -> LocalDocumentSnapshot:
+        if transaction is not None:
+            transaction._check_read()
+        with self._client._lock:
+            data = self._client._store.get(self._collection_path, self.id)
+        return LocalDocumentSnapshot(self, data, _now())
+
+    def create(self, document_data: dict):
+        self._client._commit([("create", self, document_data, None)])
+
+    def set(self, document_data: dict, merge: bool = False):
+        self._client._commit([("set", self, document_data, merge)])
+
+    def update(self, field_updates: dict):
+        self._client._commit([("update", self, field_updates, None)])
+
+    def delete(self):
+        self._client._commit([("delete", self, None, None)])
+
+
+# --- Writes ---
+
+class LocalWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes: list = []
+
+    def create(self, reference, document_data: dict):
+        self._writes.append(("create", reference, copy.deepcopy(document_data), None))
+
+    def set(self, reference, document_data: dict, merge: bool = False):
+        self._writes.append(("set", reference, copy.deepcopy(document_data), merge))
+
+    def update(self, reference, field_updates: dict):
+        self._writes.append(("update", reference, copy.deepcopy(field_updates), None))
+
+    def delete(self, reference):
+        self._writes.append(("delete", reference, None, None))
+
+    def __len__(self):
+        return len(self._writes)
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        self._client._commit(writes)
+        return []
+
+
+class LocalTransaction(LocalWriteBatch):
+    """
+    A write batch whose reads and writes run under the client lock. The lock is
+    held from the first read to the commit, blocking other threads' reads too.
+    """
+
+    def _check_read(self):
+        if self._writes:
+            raise ValueError(_READ_AFTER_WRITE_ERROR)
+
+    def get(self, ref_or_query):
+        if isinstance(ref_or_query, LocalDocumentReference):
+            return iter([ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+    def get_all(self, references):
+        return self._client.get_all(references, transaction=self)
+
+    def run(self, function, *args, **kwargs):
+        with self._client._write_scope():
+            try:
+                result = function(self, *args, **kwargs)
+                changes = self._client._apply(self._writes)
+            finally:
+                self._writes = []
+        self._client._notify(changes)
+        return result
+
+
+# --- Stores ---
+
+class MemoryStore:
+    def __init__(self):
+        self._collections: Dict[str, Dict[str, dict]] = {}
+
+    def get(self, collection_path: str, document_id: str) -> Optional[dict]:
+        data = self._collections.get(collection_path, {}).get(document_id)
+        return copy.deepcopy(data) if data is not None else None
+
+    def list(self, collection_path: str) -> List[Tuple[str, dict]]:
+        return [(doc_id, copy.deepcopy(data)) for doc_id, data in self._collections.get(collection_path, {}).items()]
+
+    def write(self, collection_path: str, document_id: str, data: Optional[dict]):
+        if data is None:
+            self._collections.get(collection_path, {}).pop(document_id, None)
+        else:
+            self._collections.setdefault(collection_path, {})[document_id] = copy.deepcopy(data)
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+
+def _json_object_hook(value: dict):
+    if "__datetime__" in value and len(value) == 1:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+class SQLiteStore:
+    """Stores each document as a JSON row keyed by (collection path, document ID)."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "collection TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (collection, id))"
+        )
+
+    @staticmethod
+    def _decode(raw: str) -> dict:
+        return json.loads(raw, object_hook=_json_object_hook)
+
+    def get(self, collection_path: str, document_id: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT data FROM documents WHERE collection = ? AND id = ?", (collection_path, document_id)
+        ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def list(self, collection_path: str) -> List[Tuple[str, dict]]:
+        rows = self._conn.execute("SELECT id, data FROM documents WHERE collection = ?", (collection_path,))
+        return [(doc_id, self._decode(raw)) for doc_id, raw in rows]
+
+    def write(self, collection_path: str, document_id: str, data: Optional[dict]):
+        if data is None:
+            self._conn.execute("DELETE FROM documents WHERE collection = ? AND id = ?", (collection_path, document_id))
+        else:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (collection, id, data) VALUES (?, ?, ?)",
+                (collection_path, document_id, json.dumps(data, default=_json_default)),
+            )
+
+    def begin(self):
+        # Take SQLite's write lock up front so transactions are serializable across processes too
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._conn.execute("COMMIT")
+
+    def rollback(self):
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+
+# --- Client ---
+
+class LocalClient:
+    def __init__(self, store):
+        self._store = store
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._listeners: Dict[str, list] = {}
+
+    def collection(self, collection_path: str) -> LocalCollectionReference:
+        return LocalCollectionReference(self, collection_path)
+
+    def document(self, document_path: str) -> LocalDocumentReference:
+        return LocalDocumentReference(self, document_path)
+
+    def transaction(self, **kwargs) -> LocalTransaction:
+        return LocalTransaction(self)
+
+    def batch(self) -> LocalWriteBatch:
+        return LocalWriteBatch(self)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        if transaction is not None:
+            transaction._check_read()
+        with self._lock:
+            snapshots = [reference.get() for reference in references]
+        return iter(snapshots)
+
+    # --- Commit ---
+    def _apply(self, writes) -> list:
+        """Validates and applies writes atomically. Caller holds the lock inside store.begin()."""
+        pending: Dict[str, Optional[dict]] = {}
+        originals: Dict[str, Optional[dict]] = {}
+        references: Dict[str, LocalDocumentReference] = {}
+
+        for kind, reference, data, merge in writes:
+            path = reference.path
+            if path not in pending:
+                original = self._store.get(reference._collection_path, reference.id)
+                originals[path] = original
+                pending[path] = copy.deepcopy(original)
+                references[path] = reference
+            current = pending[path]
+
+            if kind == "create":
+                if current is not None:
+                    raise AlreadyExists(f"Document already exists: {path}")
+                new_data = {}
+                _merge_into(new_data, data)
+            elif kind == "set":
+                new_data = copy.deepcopy(current) if merge and current is not None else {}
+                _merge_into(new_data, data)
+            elif kind == "update":
+                if current is None:
+                    raise NotFound(f"No document to update: {path}")
+                new_data = copy.deepcopy(current)
+                for field_path, value in data.items():
+                    _set_field(new_data, field_path, value)
+            else:
+                new_data = None
+            pending[path] = new_data
+
+        changes = []
+        for path, data in pending.items():
+            reference = references[path]
+            self._store.write(reference._collection_path, reference.id, data)
+            changes.append((reference, originals[path], data))
+        return changes
+
+    @contextlib.contextmanager
+    def _write_scope(self):
+        """
+        Holds the lock and a store transaction. Writes made while a transaction
+        function is running on this thread join the outer store transaction.
+        """
+        with self._lock:
+            outermost = self._depth == 0
+            if outermost:
+                self._store.begin()
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self._store.rollback()
+                raise
+            self._depth -= 1
+            if outermost:
+                self._store.commit()
+
+    def _commit(self, writes):
+        with self._write_scope():
+            changes = self._apply(writes)
+        self._notify(changes)
+
+    # --- Listeners ---
+    def _add_listener(self, collection_path: str, callback) -> LocalWatch:
+        watch = LocalWatch(self, collection_path, callback)
+        with self._lock:
+            self._listeners.setdefault(collection_path, []).append(watch)
+            snapshots = self.collection(collection_path)._execute()
+        read_time = _now()
+        changes = [LocalDocumentChange(ChangeType.ADDED, snapshot) for snapshot in snapshots]
+        callback(snapshots, changes, read_time)
+        return watch
+
+    def _remove_listener(self, collection_path: str, watch: LocalWatch):
+        with self._lock:
+            watches = self._listeners.get(collection_path, [])
+            if watch in watches:
+                watches.remove(watch)
+
+    def _notify(self, changes):
+        if not self._listeners:
+            return
+        read_time = _now()
+        by_collection: Dict[str, list] = {}
+        for reference, before, after in changes:
+            if reference._collection_path not in self._listeners:
+                continue
+            if before is None and after is None:
+                continue
+            if after is None:
+                change_type = ChangeType.REMOVED
+            elif before is None:
+                change_type = ChangeType.ADDED
+            else:
+                change_type = ChangeType.MODIFIED
+            snapshot = LocalDocumentSnapshot(reference, after if after is not None else before, read_time)
+            by_collection.setdefault(reference._collection_path, []).append(LocalDocumentChange(change_type, snapshot))
+
+        for collection_path, document_changes in by_collection.items():
+            watches = list(self._listeners.get(collection_path, []))
+            if not watches:
+                continue
+            snapshots = self.collection(collection_path)._execute()
+            for watch in watches:
+                watch._callback(snapshots, document_changes, read_time)
+
+
+def create_client(backend: str, sqlite_path: Optional[str] = None) -> LocalClient:
+    """Builds a local client for the "memory" or "sqlite" backend."""
+    if backend == "memory":
+        return LocalClient(MemoryStore())
+    if backend == "sqlite":
+        return LocalClient(SQLiteStore(sqlite_path))
+    raise ValueError(f"Unknown local storage backend: {backend}")
@@ -0,0 +1,58 @@
+# app/db/pagination.py
+from typing import List, Optional, Tuple
+from firebase_admin import firestore
+
+MAX_PAGE_SIZE = 500
+DOCUMENT_ID = "__name__"
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Turns a comma-separated `fields=` value into a list of field paths."""
+    if not fields:
+        return None
+    parsed = [field.strip() for field in fields.split(",") if field.strip() and field.strip() != "id"]
+    return parsed or None
+
+def paginate_query(
+    collection,
+    query=None,
+    order_by: str = "date",
+    direction: str = firestore.Query.DESCENDING,
+    limit: Optional[int] = None,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Runs a cursor-paginated query over `collection`.
+
+    `start_after` is the ID of the last document of the previous page.
+    Firestore leaves documents without the `order_by` field out of ordered
+    queries. Sales, expenses, quotations and credit records are all written
+    with a `date`; a document added without one (e.g. by hand in the console)
+    must have it backfilled to be listed.
+    Returns the page's snapshots and the cursor for the next page
+    (None when there are no more documents).
+    """
+    if query is None:
+        query = collection
+
+    query = query.order_by(order_by, direction=direction)
+
+    if start_after:
+        cursor_snapshot = collection.document(start_after).get()
+        if not cursor_snapshot.exists:
+            raise ValueError(f"Invalid cursor: {start_after}")
+        query = query.start_after(cursor_snapshot)
+
+    if fields:
+        query = query.select(fields)
+
+    if limit:
+        query = query.limit(limit)
+
+    docs = list(query.stream())
+
+    next_cursor = None
+    if limit and len(docs) == limit:
+        next_cursor = docs[-1].id
+
+    return docs, next_cursor
@@ -0,0 +1,107 @@
+# app/db/sharded_counter.py
+import random
+from typing import List, Optional, Tuple
+from firebase_admin import firestore
+
+COUNT_FIELD = "count"
+
+class ShardedCounter:
+    """
+    A counter split across `num_shards` documents in a subcollection of `doc_ref`,
+    so concurrent writers touch different documents instead of contending on one.
+    The counter's value is the sum of the shards' `count` fields.
+    """
+
+    def __init__(self, doc_ref, num_shards: int, subcollection: str = "shards"):
+        self.doc_ref = doc_ref
+        self.num_shards = num_shards
+        self.subcollection = subcollection
+
+    def shard_refs(self) -> list:
+        shards = self.doc_ref.collection(self.subcollection)
+        return [shards.document(str(shard_id)) for shard_id in range(self.num_shards)]
+
+    def read_all(self, client, transaction=None) -> "ShardReading":
+        """Reads every shard in one batched read."""
+        snapshots = client.get_all(self.shard_refs(), transaction=transaction)
+        return ShardReading([(snapshot.reference, _count(snapshot)) for snapshot in snapshots])
+
+    def total(self, client, transaction=None) -> int:
+        return self.read_all(client, transaction=transaction).available
+
+    def read_for_decrement(self, client, transaction, amount: int) -> "ShardReading":
+        """
+        Reads shards in random order until together they hold at least `amount`.
+
+        Usually one random shard is enough, so concurrent decrements land on
+        different documents and don't conflict. Otherwise the remaining shards
+        are read in one batch; the reading's `available` is then the full total.
+        """
+        refs = self.shard_refs()
+        random.shuffle(refs)
+        first = refs[0].get(transaction=transaction)
+        counts = [(first.reference, _count(first))]
+        if counts[0][1] < amount and len(refs) > 1:
+            counts += [(snapshot.reference, _count(snapshot)) for snapshot in client.get_all(refs[1:], transaction=transaction)]
+        return ShardReading(counts)
+
+    def increment(self, writer, amount: int):
+        """Adds `amount` to a random shard without reading it."""
+        shard_ref = random.choice(self.shard_refs())
+        writer.set(shard_ref, {COUNT_FIELD: firestore.Increment(amount)}, merge=True)
+
+    def reset(self, writer, total: int, old_num_shards: int = 0):
+        """
+        Spreads `total` evenly over the shards, deleting any shards beyond
+        `num_shards` left from an earlier `old_num_shards` layout.
+        """
+        base, extra = divmod(total, self.num_shards)
+        for shard_id, shard_ref in enumerate(self.shard_refs()):
+            writer.set(shard_ref, {COUNT_FIELD: base + (1 if shard_id < extra else 0)})
+        delete_shards(writer, self.doc_ref, self.subcollection, self.num_shards, old_num_shards)
+
+class ShardReading:
+    """The shard counts read inside a transaction, and the writes to take from them."""
+
+    def __init__(self, counts: List[Tuple[object, int]]):
+        self.counts = counts
+
+    @property
+    def available(self) -> int:
+        return sum(count for _, count in self.counts)
+
+    def decrement(self, writer, amount: int):
+        """Takes `amount` from the shards that were read, emptiest writes last."""
+        remaining = amount
+        for shard_ref, count in sorted(self.counts, key=lambda shard: -shard[1]):
+            if remaining <= 0:
+                break
+            taken = min(count, remaining)
+            writer.update(shard_ref, {COUNT_FIELD: count - taken})
+            remaining -= taken
+        if remaining > 0:
+            raise ValueError("Not enough stock in the shards read to take the requested amount.")
+
+def read_totals(client, counters: dict) -> dict:
+    """Sums several counters in one batched read. `counters` maps keys to counters; returns {key: total}."""
+    key_by_path, refs = {}, []
+    for key, counter in counters.items():
+        for shard_ref in counter.shard_refs():
+            key_by_path[shard_ref.path] = key
+            refs.append(shard_ref)
+    totals = {key: 0 for key in counters}
+    if refs:
+        for snapshot in client.get_all(refs):
+            totals[key_by_path[snapshot.reference.path]] += _count(snapshot)
+    return totals
+
+def delete_shards(writer, doc_ref, subcollection: str, start: int, stop: Optional[int]):
+    """Deletes shard documents `start` .. `stop - 1`."""
+    shards = doc_ref.collection(subcollection)
+    for shard_id in range(start, stop or 0):
+        writer.delete(shards.document(str(shard_id)))
+
+def _count(snapshot) -> int:
+    if not snapshot.exists:
+        return 0
+    return snapshot.to_dict().get(COUNT_FIELD, 0)
@@ -0,0 +1,148 @@
+# app/db/snapshot_mirror.py
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from app.core.concurrency import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+class CollectionMirror:
+    """
+    Keeps an in-memory copy of a collection, fed by a Firestore on_snapshot listener.
+
+    Reads return point-in-time copies taken under a lock, so a caller never sees
+    a half-applied batch of changes. Anything that exposes `on_snapshot(callback)`
+    (the Firestore emulator, or an in-memory stand-in that calls `apply_changes`
+    directly) can drive the mirror.
+
+    Firestore's listener reports no errors to the callback; its stream just
+    stops. A watchdog checks the listener every `check_interval` seconds and,
+    once it has stopped, marks the mirror not ready (so reads go back to
+    Firestore) and subscribes again from scratch.
+    """
+
+    def __init__(self, collection, check_interval: float = 5.0):
+        self._collection = collection
+        self._documents: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch = None
+        self._generation = 0
+        self._watchdog = PeriodicTask(self._check_listener, check_interval, "collection-mirror-watchdog")
+        self.resubscriptions = 0
+        self._last_read_time: Optional[datetime] = None
+        self._last_applied_at: Optional[float] = None
+        self._last_lag_seconds: Optional[float] = None
+        self.snapshots_applied = 0
+
+    # --- Lifecycle ---
+    def start(self):
+        """Starts listening. The mirror becomes ready after the first snapshot arrives."""
+        if self._watch is None:
+            self._subscribe()
+            self._watchdog.start()
+
+    def stop(self):
+        self._watchdog.stop()
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        self._ready.clear()
+
+    def _subscribe(self):
+        """Starts a fresh listener; its first snapshot repopulates the mirror."""
+        with self._lock:
+            self._ready.clear()
+            self._documents = {}
+            self._generation += 1
+            generation = self._generation
+        self._watch = self._collection.on_snapshot(
+            lambda collection_snapshot, changes, read_time: self._on_snapshot(generation, changes, read_time)
+        )
+
+    def _check_listener(self):
+        watch = self._watch
+        if watch is None or getattr(watch, "is_active", True):
+            return
+        logger.warning("Mirror listener on %s stopped; resubscribing", self._collection.id)
+        watch.unsubscribe()
+        self.resubscriptions += 1
+        self._subscribe()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    # --- Listener ---
+    def _on_snapshot(self, generation: int, changes, read_time):
+        if generation == self._generation:  # Ignore a replaced listener's last callbacks
+            self.apply_changes(changes, read_time)
+
+    def apply_changes(self, changes, read_time: Optional[datetime] = None):
+        """
+        Applies a batch of document changes. Each change has `.type.name`
+        ("ADDED", "MODIFIED" or "REMOVED") and `.document` (a snapshot).
+        """
+        with self._lock:
+            for change in changes:
+                document = change.document
+                if change.type.name == "REMOVED":
+                    self._documents.pop(document.id, None)
+                else:
+                    self._documents[document.id] = {"id": document.id, **document.to_dict()}
+            now = datetime.now(timezone.utc)
+            self._last_read_time = read_time or now
+            # Delay between the server producing the snapshot and it being applied here
+            self._last_lag_seconds = max(0.0, (now - self._last_read_time).total_seconds())
+            self._last_applied_at = time.monotonic()
+            self.snapshots_applied += 1
+        self._ready.set()
+
+    # --- Reads ---
+    def get(self, document_id: str) -> Optional[dict]:
+        with self._lock:
+            document = self._documents.get(document_id)
+            return dict(document) if document is not None else None
+
+    def get_many(self, document_ids) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                document_id: dict(self._documents[document_id])
+                for document_id in document_ids
+                if document_id in self._documents
+            }
+
+    def list_documents(self) -> List[dict]:
+        """Returns every mirrored document, ordered by ID."""
+        with self._lock:
+            return [dict(self._documents[document_id]) for document_id in sorted(self._documents)]
+
+    # --- Monitoring ---
+    def status(self) -> dict:
+        """
+        Reports readiness, size and sync lag. `lagSeconds` is the delay between the
+        server's read time and the last snapshot being applied; Firestore only sends
+        snapshots on change, so a quiet collection shows a growing
+        `secondsSinceLastSnapshot` without being out of date.
+        """
+        with self._lock:
+            read_time = self._last_read_time
+            applied_at = self._last_applied_at
+            lag_seconds = self._last_lag_seconds
+            count = len(self._documents)
+
+        return {
+            "listening": self._watch is not None,
+            "ready": self.is_ready,
+            "documents": count,
+            "snapshotsApplied": self.snapshots_applied,
+            "resubscriptions": self.resubscriptions,
+            "lastReadTime": read_time.isoformat() if read_time else None,
+            "secondsSinceLastSnapshot": time.monotonic() - applied_at if applied_at is not None else None,
+            "lagSeconds": lag_seconds,
+        }
@@ -0,0 +1,192 @@
+# app/db/transactions.py
+"""
+Backend-agnostic @transactional with a tunable retry policy and metrics.
+
+Every transaction function records its calls, attempts, commit aborts (by
+reason) and the wall time spent in each phase: "read", then whatever the
+function marks with mark_phase ("validate", "write"), then "commit".
+Firestore transactions are retried on contention up to the operation's max
+attempts with jittered exponential backoff; local transactions run once under
+the local client's lock.
+"""
+import functools
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from firebase_admin import firestore
+from google.api_core import exceptions
+
+from app.core import config
+from app.db.local_client import LocalTransaction
+
+PHASES = ("read", "validate", "write", "commit")
+
+class RetryPolicy:
+    """Max attempts and capped exponential backoff with full jitter between attempts."""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, retry_number: int) -> float:
+        """Seconds to wait before retry `retry_number` (1 for the first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry_number - 1)))
+
+def retry_policy(name: str) -> RetryPolicy:
+    return RetryPolicy(
+        config.TRANSACTION_MAX_ATTEMPTS_OVERRIDES.get(name, config.TRANSACTION_MAX_ATTEMPTS),
+        config.TRANSACTION_BACKOFF_BASE_SECONDS,
+        config.TRANSACTION_BACKOFF_MAX_SECONDS,
+    )
+
+# --- METRICS ---
+class TransactionMetrics:
+    """Thread-safe per-operation counters and phase timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, dict] = {}
+
+    def _operation(self, name: str) -> dict:
+        return self._operations.setdefault(name, {
+            "calls": 0, "attempts": 0, "committed": 0, "failed": 0, "exhausted": 0,
+            "aborts": {},
+            "phaseSeconds": {phase: 0.0 for phase in PHASES},
+            "maxAttemptSeconds": 0.0,
+        })
+
+    def count(self, name: str, key: str):
+        with self._lock:
+            self._operation(name)[key] += 1
+
+    def record_abort(self, name: str, reason: str):
+        with self._lock:
+            aborts = self._operation(name)["aborts"]
+            aborts[reason] = aborts.get(reason, 0) + 1
+
+    def record_attempt(self, name: str, phase_seconds: dict):
+        with self._lock:
+            operation = self._operation(name)
+            for phase, seconds in phase_seconds.items():
+                operation["phaseSeconds"][phase] = operation["phaseSeconds"].get(phase, 0.0) + seconds
+            operation["maxAttemptSeconds"] = max(operation["maxAttemptSeconds"], sum(phase_seconds.values()))
+
+    def snapshot(self) -> dict:
+        """Returns a copy of every operation's metrics, with retries and mean phase times per attempt."""
+        with self._lock:
+            result = {}
+            for name, operation in self._operations.items():
+                attempts = operation["attempts"] or 1
+                result[name] = {
+                    **operation,
+                    "retries": operation["attempts"] - operation["calls"],
+                    "aborts": dict(operation["aborts"]),
+                    "phaseSeconds": dict(operation["phaseSeconds"]),
+                    "meanPhaseSeconds": {phase: seconds / attempts for phase, seconds in operation["phaseSeconds"].items()},
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+metrics = TransactionMetrics()
+
+# --- PHASE TIMING ---
+_current = threading.local()
+
+class _AttemptTimer:
+    def __init__(self):
+        self.phase = "read"
+        self.started = time.perf_counter()
+        self.seconds: Dict[str, float] = {}
+
+    def mark(self, phase: Optional[str]):
+        now = time.perf_counter()
+        self.seconds[self.phase] = self.seconds.get(self.phase, 0.0) + now - self.started
+        self.phase, self.started = phase, now
+
+def mark_phase(phase: str):
+    """Marks the start of a phase ("validate", "write") in the running transaction function."""
+    timer = getattr(_current, "timer", None)
+    if timer is not None:
+        timer.mark(phase)
+
+def _abort_reason(exc: Exception) -> str:
+    return (getattr(exc, "message", None) or type(exc).__name__)[:120]
+
+# --- DECORATOR ---
+def transactional(to_wrap):
+    """
+    Backend-agnostic replacement for @firestore.transactional.
+    Retries follow retry_policy(function name); see the module docstring for metrics.
+    """
+    name = to_wrap.__name__
+
+    @functools.wraps(to_wrap)
+    def attempt(transaction, *args, **kwargs):
+        metrics.count(name, "attempts")
+        _current.timer = _AttemptTimer()
+        result = to_wrap(transaction, *args, **kwargs)
+        _current.timer.mark("commit")
+        return result
+
+    def finish_attempt():
+        timer = getattr(_current, "timer", None)
+        if timer is not None:
+            timer.mark(None)
+            metrics.record_attempt(name, timer.seconds)
+            _current.timer = None
+
+    @functools.wraps(to_wrap)
+    def wrapper(transaction, *args, **kwargs):
+        metrics.count(name, "calls")
+        try:
+            if isinstance(transaction, LocalTransaction):
+                try:
+                    result = transaction.run(attempt, *args, **kwargs)
+                finally:
+                    finish_attempt()
+            else:
+                result = _run_firestore(name, attempt, finish_attempt, retry_policy(name), transaction, args, kwargs)
+        except Exception:
+            metrics.count(name, "failed")
+            raise
+        metrics.count(name, "committed")
+        return result
+
+    return wrapper
+
+def _run_firestore(name, attempt, finish_attempt, policy: RetryPolicy, transaction, args, kwargs):
+    """
+    Runs `attempt` in a Firestore transaction, retrying aborted commits.
+
+    Mirrors firestore.transactional's loop (begin with the first attempt's ID so
+    retries keep their place in line, commit, roll back on error) but with our
+    own attempt limit, backoff and metrics. A fresh runner is used per call since
+    it holds the retry ID.
+    """
+    runner = firestore.transactional(attempt)
+    runner._reset()
+    last_exc = None
+    try:
+        for attempt_number in range(1, policy.max_attempts + 1):
+            if attempt_number > 1:
+                time.sleep(policy.backoff(attempt_number - 1))
+            try:
+                result = runner._pre_commit(transaction, *args, **kwargs)
+                transaction._commit()
+                return result
+            except exceptions.Aborted as exc:
+                metrics.record_abort(name, _abort_reason(exc))
+                last_exc = exc
+            finally:
+                finish_attempt()
+        metrics.count(name, "exhausted")
+        raise ValueError(f"Failed to commit {name} within {policy.max_attempts} attempts.") from last_exc
+    except BaseException:
+        transaction._rollback()
+        raise
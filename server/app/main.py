@@ -3,7 +3,11 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import inventory, sales, expenses, credit, users, quotations
+from app.api.v1.endpoints import inventory, sales, expenses, credit, users, quotations, export, stats, dashboard, customers, search
+from app.core import config
+from app.core.concurrency import configure_threadpool, get_threadpool_stats
+from app.core.security import password_pool
+from app.services import inventory_service, reservation_service, search_service, stats_service, stock_alert_service
 import os
 from datetime import datetime
 
@@ -16,8 +20,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Pagination cursor for list routes
 )
 
+@app.on_event("startup")
+async def size_threadpool():
+    # Route handlers block on the sync Firestore client; let more of them wait at once
+    configure_threadpool(config.THREADPOOL_SIZE)
+
+@app.on_event("startup")
+def start_inventory_mirror():
+    if config.INVENTORY_MIRROR_ENABLED:
+        inventory_service.mirror.start()
+
+@app.on_event("shutdown")
+def stop_inventory_mirror():
+    inventory_service.mirror.stop()
+
+@app.on_event("startup")
+def record_rollup_start():
+    # Reports trust daily_stats only from the recorded start; the first deploy records it
+    stats_service.mark_rollups_started()
+
+@app.on_event("startup")
+def start_reservation_sweeper():
+    reservation_service.sweeper.start()
+
+@app.on_event("shutdown")
+def stop_reservation_sweeper():
+    reservation_service.sweeper.stop()
+
+@app.on_event("startup")
+def start_stock_alert_monitor():
+    stock_alert_service.monitor.start()
+
+@app.on_event("shutdown")
+def stop_stock_alert_monitor():
+    stock_alert_service.monitor.stop()
+
+@app.on_event("startup")
+def start_search_index():
+    search_service.start(inventory_mirror=inventory_service.mirror)
+
+@app.on_event("shutdown")
+def stop_search_index():
+    search_service.stop()
+
+@app.on_event("shutdown")
+def stop_password_pool():
+    password_pool.shutdown()
+
 # Health check endpoint
 @app.get("/")
 async def health_check():
@@ -28,7 +80,8 @@ async def health_check():
         "status": "healthy",
         "message": "LSP Sewing Machines POS API is running",
         "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "threadpool": get_threadpool_stats(),
     }
 
 # --- Define project directories ---
@@ -44,3 +97,8 @@ app.include_router(sales.router, prefix="/api/v1/sales", tags=["Sales"])
 app.include_router(quotations.router, prefix="/api/v1/quotations", tags=["Quotations"])
 app.include_router(expenses.router, prefix="/api/v1/expenses", tags=["Expenses"])
 app.include_router(credit.router, prefix="/api/v1", tags=["Credit"])
+app.include_router(customers.router, prefix="/api/v1/customers", tags=["Customers"])
+app.include_router(stats.router, prefix="/api/v1/stats", tags=["Stats"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["Search"])
+app.include_router(export.router, prefix="/api/v1/export", tags=["Export"])
@@ -24,4 +24,6 @@ class CreditRecordCreate(BaseModel):
 
 class CreditRecordInDB(CreditRecordCreate):
     id: str
-    date: str
\ No newline at end of file
+    date: str
+    status: Optional[str] = None  # "Active" while a balance is owed, then "Completed"
+    nextDueDate: Optional[str] = None  # First installment due date not yet covered by payments
\ No newline at end of file
@@ -0,0 +1,14 @@
+# app/schemas/customer.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class CustomerInDB(BaseModel):
+    id: str  # Normalized phone number
+    phone: str
+    phoneNumber: Optional[str] = None  # As entered on the latest sale
+    customerName: Optional[str] = None
+    saleCount: int = 0
+    saleIds: List[str] = []
+    lifetimeSpend: float = 0.0
+    openBalance: float = 0.0
+    lastVisit: Optional[str] = None
@@ -0,0 +1,47 @@
+# app/schemas/dashboard.py
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.stats import DailyStats, ReportBucket
+
+class CreditSummary(BaseModel):
+    activeCount: int
+    outstandingBalance: float
+
+class LowStockItem(BaseModel):
+    id: str
+    itemName: str
+    modelNumber: str
+    quantity: int
+    isCritical: bool
+
+class InventorySummary(BaseModel):
+    itemCount: int
+    totalValue: float  # Stock on hand at purchase price
+    lowStockCount: int
+    criticalStockCount: int
+    lowStockItems: List[LowStockItem]  # Lowest stock first, capped
+
+class RecentSale(BaseModel):
+    id: str
+    date: str
+    customerName: str
+    itemName: Optional[str] = None  # First item of the sale
+    modelNumber: Optional[str] = None
+    totalAmount: float
+
+class RecentExpense(BaseModel):
+    id: str
+    date: str
+    category: Optional[str] = None
+    description: str
+    amount: float
+
+class DashboardSummary(BaseModel):
+    date: str
+    generatedAt: str
+    today: DailyStats
+    monthToDate: ReportBucket
+    credit: CreditSummary
+    inventory: InventorySummary
+    recentSales: List[RecentSale]
+    recentExpenses: List[RecentExpense]
@@ -1,6 +1,8 @@
 # app/schemas/inventory.py
 from pydantic import BaseModel, Field
-from typing import Optional, Literal, Dict, Any
+from typing import Optional, Literal, Dict, Any, List
+
+MAX_STOCK_SHARDS = 50
 
 class InventoryBase(BaseModel):
     itemName: str
@@ -8,6 +10,7 @@ class InventoryBase(BaseModel):
     quantity: int
     purchasePrice: float
     sellingPrice: float
+    reorderLevel: Optional[int] = Field(None, ge=0)  # Low stock at or below this; defaults to LOW_STOCK_THRESHOLD
 
 class InventoryCreate(InventoryBase):
     pass
@@ -18,6 +21,7 @@ class InventoryUpdate(BaseModel):
     quantity: Optional[int] = None
     purchasePrice: Optional[float] = None
     sellingPrice: Optional[float] = None
+    reorderLevel: Optional[int] = Field(None, ge=0)
 
 class InventoryInDB(InventoryBase):
     id: str
@@ -25,4 +29,37 @@ class InventoryInDB(InventoryBase):
 
 class InventoryAction(BaseModel):
     action: Literal["create", "update", "delete", "read"]
-    payload: Dict[str, Any]
\ No newline at end of file
+    payload: Dict[str, Any]
+
+class StockShardsUpdate(BaseModel):
+    shards: int = Field(..., ge=1, le=MAX_STOCK_SHARDS)  # 1 keeps stock in the item's quantity field
+
+class InventoryUpsert(InventoryUpdate):
+    id: Optional[str] = None  # Existing item to update; omit to create a new item
+
+class InventoryBulkRequest(BaseModel):
+    items: List[InventoryUpsert] = Field(..., min_length=1, max_length=2000)
+
+class InventoryBulkResult(BaseModel):
+    index: int
+    status: str  # "created", "updated" or "failed"
+    item: Optional[InventoryInDB] = None
+    error: Optional[str] = None
+
+class LowStockAlert(BaseModel):
+    id: str
+    itemName: str
+    modelNumber: str
+    quantity: int
+    reorderLevel: int
+    updatedAt: str
+    unitsSold: int  # Over the velocity window
+    dailyVelocity: float
+    daysOfStockLeft: Optional[float] = None  # None when the item has not sold in the window
+    isCritical: bool
+
+class InventoryBulkResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[InventoryBulkResult]
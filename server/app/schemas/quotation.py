@@ -23,6 +23,7 @@ class QuotationCreate(BaseModel):
     installment_info: Optional[InstallmentInfo] = None
     old_item_exchange: Optional[OldItemExchange] = None
     borrowed_items: Optional[List[BorrowedItem]] = None
+    holdMinutes: Optional[int] = Field(None, gt=0)  # Hold the quoted stock for this long
 
 
 class QuotationItemInDB(BaseModel):
@@ -42,3 +43,13 @@ class QuotationInDB(QuotationCreate):
     items: List[QuotationItemInDB]
     old_item_deduction: Optional[float] = None
     borrowed_items_profit: Optional[float] = None
+    holdExpiresAt: Optional[str] = None  # When the stock hold lapses; None once released or converted
+    status: Optional[str] = None  # "converted" once turned into a sale
+    saleId: Optional[str] = None
+    convertedAt: Optional[str] = None
+
+
+class QuotationConvert(BaseModel):
+    paymentMethod: str
+    amountPaid: Optional[float] = None
+    phoneNumber: Optional[str] = None  # Required if the quotation has none
@@ -1,5 +1,6 @@
 # app/schemas/sale.py
-from pydantic import BaseModel, Field
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 
 class SaleItem(BaseModel):
@@ -64,4 +65,29 @@ class SaleInDB(SaleBase):
 
 class SalesByDateResponse(BaseModel):
     sales: List[SaleInDB]
-    total_sales: float
\ No newline at end of file
+    total_sales: float
+
+class SaleImport(SaleCreate):
+    date: Optional[datetime] = None  # ISO 8601 datetime the sale was made; defaults to import time
+
+    @field_validator("date")
+    @classmethod
+    def to_local_time(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Stored dates are naive local times, so they sort and bucket by day alongside live sales
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone().replace(tzinfo=None)
+        return value
+
+class SaleImportRequest(BaseModel):
+    sales: List[SaleImport] = Field(..., min_length=1, max_length=2000)
+
+class SaleImportResult(BaseModel):
+    index: int
+    status: str  # "created" or "failed"
+    sale: Optional[SaleInDB] = None
+    error: Optional[str] = None
+
+class SaleImportResponse(BaseModel):
+    imported: int
+    failed: int
+    results: List[SaleImportResult]
@@ -0,0 +1,20 @@
+# app/schemas/search.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+class InventorySearchHit(BaseModel):
+    id: str
+    itemName: Optional[str] = None
+    modelNumber: Optional[str] = None
+    sellingPrice: Optional[float] = None
+
+class SaleSearchHit(BaseModel):
+    id: str
+    customerName: Optional[str] = None
+    phoneNumber: Optional[str] = None
+    date: Optional[str] = None
+    totalAmount: Optional[float] = None
+
+class SearchResponse(BaseModel):
+    inventory: Optional[List[InventorySearchHit]] = None  # Omitted when scope is "sales"
+    sales: Optional[List[SaleSearchHit]] = None  # Omitted when scope is "inventory"
@@ -0,0 +1,40 @@
+# app/schemas/stats.py
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class DailyStats(BaseModel):
+    date: str
+    salesCount: int = 0
+    itemsSold: int = 0
+    itemsSoldById: Dict[str, int] = {}  # Units sold per inventory item
+    totalSales: float = 0.0
+    grossSales: float = 0.0  # Before old item exchange deductions
+    amountCollected: float = 0.0
+    salesByPaymentMethod: Dict[str, float] = {}
+    oldItemDeductions: float = 0.0
+    borrowedItemsProfit: float = 0.0
+    outstandingCredit: float = 0.0
+    expenseCount: int = 0
+    totalExpenses: float = 0.0
+    expensesByCategory: Dict[str, float] = {}
+    net: float = 0.0  # totalSales - totalExpenses
+
+class ReportBucket(BaseModel):
+    period: str  # YYYY-MM-DD (day, or Monday of the week), YYYY-MM or YYYY
+    salesCount: int = 0
+    totalSales: float = 0.0
+    grossSales: float = 0.0
+    totalExpenses: float = 0.0
+    oldItemDeductions: float = 0.0
+    borrowedItemsProfit: float = 0.0
+    outstandingCredit: float = 0.0
+    net: float = 0.0
+
+class ReportResponse(BaseModel):
+    from_date: str
+    to_date: str
+    granularity: str
+    source: str
+    scanned_to: Optional[str] = None  # Last day a rollup report read from sales/expenses (no rollups yet)
+    buckets: List[ReportBucket]
+    totals: ReportBucket
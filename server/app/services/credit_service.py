@@ -1,12 +1,43 @@
 # app/services/credit_service.py
 from datetime import datetime
+from typing import List, Optional
 from firebase_admin import firestore
-from app.db.firebase_config import db, sales_collection, credit_payments_collection, credit_collection
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.db.pagination import paginate_query
+from app.db.firebase_config import db, sales_collection, credit_payments_collection, credit_collection, mark_phase, transactional
 from app.schemas.credit import CreditPaymentCreate
+from app.services import customer_service, idempotency_service, stats_service
+
+# Orderings for active credit listings: sort name -> (field, direction)
+CREDIT_SORTS = {
+    "newest": ("date", firestore.Query.DESCENDING),
+    "oldest": ("date", firestore.Query.ASCENDING),
+    "largest": ("balance", firestore.Query.DESCENDING),
+}
+
+def next_due_date(installment_info: Optional[dict], total_amount: float, amount_paid: float) -> Optional[str]:
+    """
+    Returns the first installment due date not yet covered by `amount_paid`,
+    treating the installments as equal parts of `total_amount`. None when the
+    sale has no due dates or is fully paid.
+    """
+    due_dates = sorted((installment_info or {}).get("due_dates") or [])
+    if not due_dates or amount_paid >= total_amount:
+        return None
+    covered = int(amount_paid // (total_amount / len(due_dates)))
+    return due_dates[min(covered, len(due_dates) - 1)]
+
+@transactional
+def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCreate, idempotency_key: Optional[str] = None):
+    """
+    Records a credit payment and updates the corresponding sale and credit records.
+    With an idempotency key, a payment already recorded under that key is returned instead.
+    """
+    if idempotency_key:
+        previous_payment = idempotency_service.read(transaction, "credit_payments", idempotency_key, payment_data)
+        if previous_payment is not None:
+            return previous_payment
 
-@firestore.transactional
-def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCreate):
-    """Records a credit payment and updates the corresponding sale and credit records."""
     sale_ref = sales_collection.document(payment_data.saleId)
     sale_snapshot = sale_ref.get(transaction=transaction)
 
@@ -28,6 +59,7 @@ def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCr
     credit_snapshot = credit_ref.get(transaction=transaction)
 
     # --- 3. CALCULATE NEW VALUES ---
+    mark_phase("validate")
     new_balance = sale_data['balance'] - payment_data.amount
     new_amount_paid = sale_data['amountPaid'] + payment_data.amount
     
@@ -36,6 +68,7 @@ def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCr
         new_credit_status = "Paid"
 
     # --- 4. UPDATE SALE ---
+    mark_phase("write")
     transaction.update(sale_ref, {
         "balance": new_balance,
         "amountPaid": new_amount_paid,
@@ -48,14 +81,17 @@ def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCr
         transaction.update(credit_ref, {
             "balance": 0,
             "amountPaid": new_amount_paid,
-            "status": "Completed"
+            "status": "Completed",
+            "nextDueDate": None
         })
     else:
         # Update or create credit record
         if credit_snapshot.exists:
             transaction.update(credit_ref, {
                 "balance": new_balance,
-                "amountPaid": new_amount_paid
+                "amountPaid": new_amount_paid,
+                "status": "Active",
+                "nextDueDate": next_due_date(sale_data.get("installment_info"), sale_data['totalAmount'], new_amount_paid)
             })
         else:
             # Create credit record if it doesn't exist
@@ -67,7 +103,8 @@ def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCr
                 "amountPaid": new_amount_paid,
                 "balance": new_balance,
                 "date": datetime.now().isoformat(),
-                "status": "Active"
+                "status": "Active",
+                "nextDueDate": next_due_date(sale_data.get("installment_info"), sale_data['totalAmount'], new_amount_paid)
             }
             transaction.set(credit_ref, credit_data)
 
@@ -75,18 +112,36 @@ def create_credit_payment_transaction(transaction, payment_data: CreditPaymentCr
     payment_ref = credit_payments_collection.document()
     payment_record = payment_data.model_dump()
     payment_record["date"] = datetime.now().isoformat()
+    if idempotency_key:
+        payment_record["idempotencyId"] = idempotency_service.key_id("credit_payments", idempotency_key)
     
     transaction.set(payment_ref, payment_record)
+    stats_service.record_credit_payment(transaction, sale_data, payment_data.amount)
+    customer_service.record_credit_payment(transaction, sale_data, payment_data.amount)
+
+    new_payment = {"id": payment_ref.id, **payment_record}
+    if idempotency_key:
+        idempotency_service.record(transaction, "credit_payments", idempotency_key, payment_data, new_payment)
+    return new_payment
 
-    return {"id": payment_ref.id, **payment_record}
+def create_credit_payment(payment_data: CreditPaymentCreate, idempotency_key: Optional[str] = None):
+    """
+    Public function to initiate the credit payment transaction.
+    Retries that reuse an idempotency key get the original payment back without paying again.
+    """
+    if idempotency_key:
+        cached_payment = idempotency_service.get_cached("credit_payments", idempotency_key, payment_data)
+        if cached_payment is not None:
+            return cached_payment
 
-def create_credit_payment(payment_data: CreditPaymentCreate):
-    """Public function to initiate the credit payment transaction."""
     transaction = db.transaction()
-    return create_credit_payment_transaction(transaction, payment_data)
+    new_payment = create_credit_payment_transaction(transaction, payment_data, idempotency_key)
+    if idempotency_key:
+        idempotency_service.remember("credit_payments", idempotency_key, payment_data, new_payment)
+    return new_payment
 
 
-@firestore.transactional
+@transactional
 def delete_credit_payment_transaction(transaction, payment_id: str):
     """Deletes a credit payment and reverses the sale/credit record updates."""
     
@@ -115,6 +170,7 @@ def delete_credit_payment_transaction(transaction, payment_id: str):
     credit_snapshot = credit_ref.get(transaction=transaction)
     
     # 4. CALCULATE NEW VALUES
+    mark_phase("validate")
     new_balance = sale_data['balance'] + payment_amount
     new_amount_paid = sale_data['amountPaid'] - payment_amount
     
@@ -125,6 +181,7 @@ def delete_credit_payment_transaction(transaction, payment_id: str):
         new_credit_status = "Paid"
     
     # 5. UPDATE SALE
+    mark_phase("write")
     transaction.update(sale_ref, {
         "balance": new_balance,
         "amountPaid": new_amount_paid,
@@ -136,7 +193,8 @@ def delete_credit_payment_transaction(transaction, payment_id: str):
         transaction.update(credit_ref, {
             "balance": new_balance,
             "amountPaid": new_amount_paid,
-            "status": "Active" if new_balance > 0 else "Completed"
+            "status": "Active" if new_balance > 0 else "Completed",
+            "nextDueDate": next_due_date(sale_data.get("installment_info"), sale_data['totalAmount'], new_amount_paid)
         })
     else:
         # Recreate credit record if it was deleted
@@ -148,20 +206,30 @@ def delete_credit_payment_transaction(transaction, payment_id: str):
             "amountPaid": new_amount_paid,
             "balance": new_balance,
             "date": datetime.now().isoformat(),
-            "status": "Active"
+            "status": "Active",
+            "nextDueDate": next_due_date(sale_data.get("installment_info"), sale_data['totalAmount'], new_amount_paid)
         }
         transaction.set(credit_ref, credit_data)
     
     # 7. DELETE PAYMENT RECORD
     transaction.delete(payment_ref)
+    stats_service.record_credit_payment(transaction, sale_data, -payment_amount)
+    customer_service.record_credit_payment(transaction, sale_data, -payment_amount)
+
+    # 8. REVOKE THE IDEMPOTENCY KEY, so a retry doesn't replay the deleted payment
+    if payment_data.get("idempotencyId"):
+        idempotency_service.revoke(transaction, payment_data["idempotencyId"], "credit_payments")
     
-    return {"status": "success", "message": f"Payment {payment_id} deleted and balance restored."}
+    return {"status": "success", "message": f"Payment {payment_id} deleted and balance restored."}, payment_data.get("idempotencyId")
 
 
 def delete_credit_payment(payment_id: str):
     """Public function to initiate the credit payment deletion transaction."""
     transaction = db.transaction()
-    return delete_credit_payment_transaction(transaction, payment_id)
+    result, idempotency_id = delete_credit_payment_transaction(transaction, payment_id)
+    if idempotency_id:
+        idempotency_service.forget(idempotency_id)
+    return result
 
 
 def get_credit_payments_for_sale(sale_id: str):
@@ -173,16 +241,37 @@ def get_credit_payments_for_sale(sale_id: str):
     return payments
 
 
-def get_all_credit_records():
-    """Retrieves all active credit records."""
-    credits = []
-    docs = credit_collection.stream()
-    for doc in docs:
-        credit_data = doc.to_dict()
-        # Only return active credits (balance > 0)
-        if credit_data.get('balance', 0) > 0:
-            credits.append({"id": doc.id, **credit_data})
-    return credits
+def get_all_credit_records(
+    limit: Optional[int] = None,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    sort: str = "newest",
+    overdue: bool = False,
+):
+    """
+    Retrieves a page of active credit records (status "Active"). Returns (credits, next_cursor).
+
+    `sort` is "newest", "oldest" or "largest" (balance). With `overdue`, only
+    records whose next installment due date has passed are returned, soonest due first.
+    Filtering happens in Firestore, so the cost follows open accounts, not all credit sales.
+    """
+    if sort not in CREDIT_SORTS:
+        raise ValueError(f"Invalid sort '{sort}'. Choose one of: {', '.join(CREDIT_SORTS)}.")
+
+    query = credit_collection.where(filter=FieldFilter("status", "==", "Active"))
+    if overdue:
+        # Firestore orders by the inequality field first
+        query = query.where(filter=FieldFilter("nextDueDate", "<=", datetime.now().strftime("%Y-%m-%d")))
+        order_by, direction = "nextDueDate", firestore.Query.ASCENDING
+    else:
+        order_by, direction = CREDIT_SORTS[sort]
+
+    docs, next_cursor = paginate_query(
+        credit_collection, query=query, order_by=order_by, direction=direction,
+        limit=limit, start_after=start_after, fields=fields,
+    )
+    credits = [{"id": doc.id, **doc.to_dict()} for doc in docs]
+    return credits, next_cursor
 
 
 def get_credit_record(sale_id: str):
@@ -0,0 +1,78 @@
+# app/services/customer_service.py
+import re
+from typing import List, Optional
+from firebase_admin import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.db.firebase_config import customers_collection
+
+# customers/{normalized phone} is maintained alongside every sale and credit payment write:
+#   phone (normalized), phoneNumber and customerName (as on the latest sale), nameLower,
+#   saleCount, saleIds, lifetimeSpend (sum of sale totalAmount),
+#   openBalance (unpaid balance across the customer's sales), lastVisit (date of the latest sale written)
+# Updates are blind merges, so they add no reads or contention to the transactions.
+
+MAX_SEARCH_RESULTS = 20
+
+def normalize_phone(phone_number: Optional[str]) -> str:
+    """Digits only, with a leading 94 country code turned into the local 0 prefix."""
+    digits = re.sub(r"\D", "", phone_number or "")
+    if digits.startswith("94") and len(digits) == 11:
+        digits = "0" + digits[2:]
+    return digits
+
+def record_sale(writer, sale_record: dict, sale_id: str, sign: int = 1):
+    """
+    Adds (sign=1) or removes (sign=-1) a sale from its customer's ledger.
+    `writer` is the transaction or batch performing the sale write.
+    """
+    phone = normalize_phone(sale_record.get("phoneNumber"))
+    if not phone:
+        return
+    updates = {
+        "phone": phone,
+        "saleCount": firestore.Increment(sign),
+        "saleIds": firestore.ArrayUnion([sale_id]) if sign > 0 else firestore.ArrayRemove([sale_id]),
+        "lifetimeSpend": firestore.Increment(sign * sale_record.get("totalAmount", 0.0)),
+        "openBalance": firestore.Increment(sign * sale_record.get("balance", 0.0)),
+    }
+    if sign > 0:
+        updates.update({
+            "phoneNumber": sale_record.get("phoneNumber"),
+            "customerName": sale_record.get("customerName", ""),
+            "nameLower": (sale_record.get("customerName") or "").strip().lower(),
+            "lastVisit": sale_record["date"],
+        })
+    writer.set(customers_collection.document(phone), updates, merge=True)
+
+def record_credit_payment(writer, sale_record: dict, amount: float):
+    """Takes a payment off the customer's open balance. Pass a negative amount when a payment is reversed."""
+    phone = normalize_phone(sale_record.get("phoneNumber"))
+    if phone:
+        writer.set(customers_collection.document(phone), {"openBalance": firestore.Increment(-amount)}, merge=True)
+
+def get_customer(phone_number: str) -> Optional[dict]:
+    """Returns a customer's ledger with a single document read."""
+    phone = normalize_phone(phone_number)
+    if not phone:
+        return None
+    doc = customers_collection.document(phone).get()
+    if doc.exists:
+        return {"id": doc.id, **doc.to_dict()}
+    return None
+
+def search_customers(prefix: str, limit: int = MAX_SEARCH_RESULTS) -> List[dict]:
+    """Customers whose phone number (for digit input) or name starts with `prefix`."""
+    prefix = prefix.strip()
+    if any(char.isdigit() for char in prefix):
+        field, value = "phone", normalize_phone(prefix)
+    else:
+        field, value = "nameLower", prefix.lower()
+    if not value:
+        return []
+
+    docs = customers_collection.where(
+        filter=FieldFilter(field, ">=", value)
+    ).where(
+        filter=FieldFilter(field, "<", value + "\uf8ff")
+    ).order_by(field).limit(limit).stream()
+    return [{"id": doc.id, **doc.to_dict()} for doc in docs]
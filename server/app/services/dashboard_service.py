@@ -0,0 +1,93 @@
+# app/services/dashboard_service.py
+from datetime import datetime
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.core.cache import TTLCache
+from app.db.firebase_config import credit_collection, expenses_collection, sales_collection
+from app.db.pagination import paginate_query
+from app.services import inventory_service, report_service, stats_service
+
+RECENT_LIMIT = 5
+LOW_STOCK_LIST_LIMIT = 20
+
+# One summary per day, shared by every dashboard request for DASHBOARD_CACHE_TTL_SECONDS
+_summary_cache = TTLCache(maxsize=2, ttl=config.DASHBOARD_CACHE_TTL_SECONDS)
+
+def _credit_summary() -> dict:
+    """
+    Reads only the balances of active credits (status "Active", as the credit
+    listing defines them), not the whole credit history.
+    """
+    docs = credit_collection.where(filter=FieldFilter("status", "==", "Active")).select(["balance"]).stream()
+    balances = [doc.to_dict().get("balance", 0.0) for doc in docs]
+    return {"activeCount": len(balances), "outstandingBalance": sum(balances)}
+
+def _inventory_summary() -> dict:
+    items, _ = inventory_service.get_all_items(fields=["quantity", "purchasePrice"])
+    # Each item's own reorder level, from the low-stock index
+    low_stock = sorted(inventory_service.get_low_stock_entries(), key=lambda item: item.get("quantity", 0))
+    return {
+        "itemCount": len(items),
+        "totalValue": sum(item.get("quantity", 0) * (item.get("purchasePrice") or 0.0) for item in items),
+        "lowStockCount": len(low_stock),
+        "criticalStockCount": sum(1 for item in low_stock if item.get("quantity", 0) <= config.CRITICAL_STOCK_THRESHOLD),
+        "lowStockItems": [
+            {
+                "id": item["id"],
+                "itemName": item.get("itemName", ""),
+                "modelNumber": item.get("modelNumber", ""),
+                "quantity": item.get("quantity", 0),
+                "isCritical": item.get("quantity", 0) <= config.CRITICAL_STOCK_THRESHOLD,
+            }
+            for item in low_stock[:LOW_STOCK_LIST_LIMIT]
+        ],
+    }
+
+def _recent_sales() -> list:
+    docs, _ = paginate_query(
+        sales_collection, limit=RECENT_LIMIT, fields=["date", "customerName", "items", "totalAmount"]
+    )
+    recent = []
+    for doc in docs:
+        sale = doc.to_dict()
+        first_item = (sale.get("items") or [{}])[0]
+        recent.append({
+            "id": doc.id,
+            "date": sale["date"],
+            "customerName": sale.get("customerName", ""),
+            "itemName": first_item.get("itemName"),
+            "modelNumber": first_item.get("modelNumber"),
+            "totalAmount": sale.get("totalAmount", 0.0),
+        })
+    return recent
+
+def _recent_expenses() -> list:
+    docs, _ = paginate_query(expenses_collection, limit=RECENT_LIMIT)
+    return [{"id": doc.id, **doc.to_dict()} for doc in docs]
+
+def get_summary() -> dict:
+    """
+    Returns everything the dashboard shows in one response: today's and
+    month-to-date totals from the daily rollups, outstanding credit, stock
+    value and low-stock items, and the latest sales and expenses. Each part
+    is a bounded read, so the cost does not grow with history.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    cached = _summary_cache.get(today)
+    if cached is not None:
+        return cached
+
+    month_to_date = report_service.get_report(today[:8] + "01", today, "month")["totals"]
+    month_to_date["period"] = today[:7]
+    summary = {
+        "date": today,
+        "generatedAt": datetime.now().isoformat(),
+        "today": stats_service.get_daily_stats(today),
+        "monthToDate": month_to_date,
+        "credit": _credit_summary(),
+        "inventory": _inventory_summary(),
+        "recentSales": _recent_sales(),
+        "recentExpenses": _recent_expenses(),
+    }
+    _summary_cache.set(today, summary)
+    return summary
@@ -1,16 +1,18 @@
 # app/services/expense_service.py
 from datetime import datetime
-from app.db.firebase_config import expenses_collection
+from typing import List, Optional
+from app.db.firebase_config import db, expenses_collection, transactional
+from app.db.pagination import paginate_query
 from google.cloud.firestore_v1.base_query import FieldFilter
 from app.schemas.expense import ExpenseCreate, ExpenseUpdate
+from app.services import stats_service
 
 def create_expense(expense: ExpenseCreate):
-    """Logs a new expense in Firestore."""
-    doc_ref = expenses_collection.document()
-    expense_data = expense.model_dump()
-    expense_data["date"] = datetime.now().isoformat()
-    doc_ref.set(expense_data)
-    return {"id": doc_ref.id, **expense_data}
+    """Logs a new expense in Firestore and adds it to the day's totals."""
+    batch = db.batch()
+    new_expense = create_expense_in_batch(batch, expense)
+    batch.commit()
+    return new_expense
 
 def get_expense(expense_id: str):
     """Retrieves a single expense by its ID."""
@@ -19,13 +21,13 @@ def get_expense(expense_id: str):
         return {"id": doc.id, **doc.to_dict()}
     return None
 
-def get_all_expenses():
-    """Retrieves all expenses."""
-    expenses = []
-    docs = expenses_collection.stream()
-    for doc in docs:
-        expenses.append({"id": doc.id, **doc.to_dict()})
-    return expenses
+def get_all_expenses(limit: Optional[int] = None, start_after: Optional[str] = None, fields: Optional[List[str]] = None):
+    """Retrieves a page of expenses, newest first. Returns (expenses, next_cursor)."""
+    docs, next_cursor = paginate_query(
+        expenses_collection, limit=limit, start_after=start_after, fields=fields
+    )
+    expenses = [{"id": doc.id, **doc.to_dict()} for doc in docs]
+    return expenses, next_cursor
 
 def get_expenses_by_date(date: str):
     """Retrieves all expenses for a specific date and calculates the total."""
@@ -48,38 +50,110 @@ def get_expenses_by_date(date: str):
         
     return {"expenses": expenses, "total_expenses": total}
 
+@transactional
+def update_expense_transaction(transaction, expense_id: str, update_data: dict):
+    """Updates an expense document and moves its amount in the day's totals."""
+    expense_ref = expenses_collection.document(expense_id)
+    expense_snapshot = expense_ref.get(transaction=transaction)
+
+    if not expense_snapshot.exists:
+        raise ValueError("Expense not found")
+
+    old_data = expense_snapshot.to_dict()
+    transaction.update(expense_ref, update_data)
+
+    if "amount" in update_data or "category" in update_data:
+        stats_service.record_expense(transaction, old_data, sign=-1)
+        stats_service.record_expense(transaction, {**old_data, **update_data})
+
 def update_expense(expense_id: str, expense_update: ExpenseUpdate):
     """Updates an expense document."""
-    expense_ref = expenses_collection.document(expense_id)
     update_data = {k: v for k, v in expense_update.model_dump().items() if v is not None}
     
     if not update_data:
         return None # Or raise an error if you prefer
 
-    expense_ref.update(update_data)
+    transaction = db.transaction()
+    try:
+        update_expense_transaction(transaction, expense_id, update_data)
+    except ValueError:
+        return None
     return {"id": expense_id, **update_data}
 
 
+@transactional
+def delete_expense_transaction(transaction, expense_id: str):
+    """Deletes an expense document and removes it from the day's totals."""
+    expense_ref = expenses_collection.document(expense_id)
+    expense_snapshot = expense_ref.get(transaction=transaction)
+
+    if not expense_snapshot.exists:
+        raise ValueError("Expense not found")
+
+    transaction.delete(expense_ref)
+    stats_service.record_expense(transaction, expense_snapshot.to_dict(), sign=-1)
+
 def delete_expense(expense_id: str):
     """Deletes an expense document."""
-    expense_ref = expenses_collection.document(expense_id)
-    if expense_ref.get().exists:
-        expense_ref.delete()
+    transaction = db.transaction()
+    try:
+        delete_expense_transaction(transaction, expense_id)
         return {"status": "success", "message": f"Expense {expense_id} deleted."}
-    return None
+    except ValueError:
+        return None
 
 
 # --- FUNCTIONS FOR TRANSACTIONS ---
 
-def update_expense_in_transaction(transaction, expense_id: str, amount: float, description: str):
-    """Updates an expense document within a transaction."""
+def create_expense_in_batch(writer, expense: ExpenseCreate):
+    """Adds a new expense and its share of the day's totals to a batch or transaction."""
+    doc_ref = expenses_collection.document()
+    expense_data = expense.model_dump()
+    expense_data["date"] = datetime.now().isoformat()
+
+    writer.set(doc_ref, expense_data)
+    stats_service.record_expense(writer, expense_data)
+    return {"id": doc_ref.id, **expense_data}
+
+def get_expense_in_transaction(transaction, expense_id: str):
+    """Reads an expense document within a transaction. Must run before any transaction writes."""
+    expense_snapshot = expenses_collection.document(expense_id).get(transaction=transaction)
+    if expense_snapshot.exists:
+        return expense_snapshot.to_dict()
+    return None
+
+def get_expenses_in_transaction(transaction, expense_ids) -> dict:
+    """Reads several expenses in one batched transactional read. Returns {expenseId: data} for those that exist."""
+    unique_ids = list(dict.fromkeys(expense_ids))
+    if not unique_ids:
+        return {}
+    refs = [expenses_collection.document(expense_id) for expense_id in unique_ids]
+    return {
+        snapshot.id: snapshot.to_dict()
+        for snapshot in db.get_all(refs, transaction=transaction)
+        if snapshot.exists
+    }
+
+def update_expense_in_transaction(transaction, expense_id: str, amount: float, description: str, old_data: dict = None):
+    """
+    Updates an expense document within a transaction.
+    Pass the expense's current data (see get_expense_in_transaction) to keep the day's totals in step.
+    """
     expense_ref = expenses_collection.document(expense_id)
     transaction.update(expense_ref, {
         "amount": amount,
         "description": description
     })
+    if old_data:
+        stats_service.record_expense(transaction, old_data, sign=-1)
+        stats_service.record_expense(transaction, {**old_data, "amount": amount})
 
-def delete_expense_in_transaction(transaction, expense_id: str):
-    """Deletes an expense document within a transaction."""
+def delete_expense_in_transaction(transaction, expense_id: str, old_data: dict = None):
+    """
+    Deletes an expense document within a transaction.
+    Pass the expense's current data (see get_expense_in_transaction) to keep the day's totals in step.
+    """
     expense_ref = expenses_collection.document(expense_id)
-    transaction.delete(expense_ref)
\ No newline at end of file
+    transaction.delete(expense_ref)
+    if old_data:
+        stats_service.record_expense(transaction, old_data, sign=-1)
\ No newline at end of file
@@ -0,0 +1,82 @@
+# app/services/export_service.py
+import csv
+import io
+import json
+from typing import Iterator, Optional
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.db.firebase_config import (
+    inventory_collection,
+    sales_collection,
+    expenses_collection,
+    credit_payments_collection,
+    credit_collection,
+    quotations_collection,
+)
+
+# Collection name -> (collection reference, has a `date` field, CSV columns)
+EXPORT_COLLECTIONS = {
+    "sales": (sales_collection, True, [
+        "id", "date", "customerName", "phoneNumber", "paymentMethod", "items", "totalAmount",
+        "amountPaid", "balance", "creditStatus", "old_item_deduction", "borrowed_items_profit",
+    ]),
+    "expenses": (expenses_collection, True, ["id", "date", "description", "amount", "category"]),
+    "credit": (credit_collection, True, [
+        "id", "date", "saleId", "customerName", "phoneNumber", "totalAmount", "amountPaid", "balance", "status",
+    ]),
+    "credit_payments": (credit_payments_collection, True, [
+        "id", "date", "saleId", "amount", "paymentMethod", "description", "chequeNumber", "chequeDate",
+    ]),
+    "quotations": (quotations_collection, True, [
+        "id", "date", "customerName", "phoneNumber", "items", "totalAmount", "notes",
+    ]),
+    "inventory": (inventory_collection, False, [
+        "id", "itemName", "modelNumber", "quantity", "purchasePrice", "sellingPrice", "expenseId",
+    ]),
+}
+
+def _stream_documents(collection_name: str, from_date: Optional[str], to_date: Optional[str]):
+    """Yields documents one at a time straight from the Firestore stream."""
+    collection, has_date, _ = EXPORT_COLLECTIONS[collection_name]
+
+    query = collection
+    if has_date:
+        if from_date:
+            query = query.where(filter=FieldFilter("date", ">=", from_date + "T00:00:00"))
+        if to_date:
+            query = query.where(filter=FieldFilter("date", "<=", to_date + "T23:59:59.999999"))
+        query = query.order_by("date")
+    elif from_date or to_date:
+        raise ValueError(f"Collection '{collection_name}' does not support date filters.")
+
+    for doc in query.stream():
+        yield {"id": doc.id, **doc.to_dict()}
+
+def export_ndjson(collection_name: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Iterator[str]:
+    """Streams a collection as newline-delimited JSON."""
+    for record in _stream_documents(collection_name, from_date, to_date):
+        yield json.dumps(record, default=str) + "\n"
+
+def export_csv(collection_name: str, from_date: Optional[str] = None, to_date: Optional[str] = None) -> Iterator[str]:
+    """Streams a collection as CSV. Nested values (e.g. sale items) are JSON-encoded."""
+    columns = EXPORT_COLLECTIONS[collection_name][2]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for record in _stream_documents(collection_name, from_date, to_date):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow({
+            key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+            for key, value in record.items()
+        })
+        yield buffer.getvalue()
+
+def validate_export(collection_name: str, from_date: Optional[str], to_date: Optional[str]):
+    """Checks export arguments up front so errors are reported before streaming starts."""
+    if collection_name not in EXPORT_COLLECTIONS:
+        raise ValueError(f"Unknown collection '{collection_name}'. Choose one of: {', '.join(EXPORT_COLLECTIONS)}.")
+    if (from_date or to_date) and not EXPORT_COLLECTIONS[collection_name][1]:
+        raise ValueError(f"Collection '{collection_name}' does not support date filters.")
@@ -0,0 +1,80 @@
+# app/services/idempotency_service.py
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from pydantic import BaseModel
+from app.core import config
+from app.core.cache import TTLCache
+from app.db.firebase_config import idempotency_collection
+
+# idempotency/{sha256(scope:key)} is written in the same transaction as the POST it
+# protects: scope, requestHash (of the request body), response, expiresAt.
+# expiresAt is a timestamp so a Firestore TTL policy on it can delete old keys.
+# A key whose result was undone later (its sale deleted) is marked revoked, and retries
+# with it are refused. Other processes may replay it from their cache for up to
+# IDEMPOTENCY_CACHE_TTL_SECONDS.
+
+# Recent responses, so most client retries are answered without a transaction
+_recent = TTLCache(maxsize=config.IDEMPOTENCY_CACHE_SIZE, ttl=config.IDEMPOTENCY_CACHE_TTL_SECONDS)
+
+def key_id(scope: str, key: str) -> str:
+    """The idempotency document id of a key; stored on records so they can revoke it."""
+    return hashlib.sha256(f"{scope}:{key}".encode()).hexdigest()
+
+def _request_hash(request: BaseModel) -> str:
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+def _replay(scope: str, stored: dict, request: BaseModel) -> dict:
+    if stored.get("revoked"):
+        raise ValueError(f"The {scope} request made with this Idempotency-Key was undone; use a new key to repeat it.")
+    if stored["requestHash"] != _request_hash(request):
+        raise ValueError(f"Idempotency-Key was already used for a different {scope} request.")
+    return stored["response"]
+
+def get_cached(scope: str, key: str, request: BaseModel) -> Optional[dict]:
+    """Returns the response recently stored for this key in this process, if any."""
+    stored = _recent.get(key_id(scope, key))
+    return _replay(scope, stored, request) if stored else None
+
+def read(transaction, scope: str, key: str, request: BaseModel) -> Optional[dict]:
+    """
+    Reads a key inside the transaction it protects, before any writes.
+    Returns the stored response if the request already ran, else None.
+    Raises ValueError if the key was used with a different request body.
+    """
+    snapshot = idempotency_collection.document(key_id(scope, key)).get(transaction=transaction)
+    if not snapshot.exists:
+        return None
+    stored = snapshot.to_dict()
+    if stored["expiresAt"] <= datetime.now(timezone.utc):
+        return None
+    return _replay(scope, stored, request)
+
+def record(writer, scope: str, key: str, request: BaseModel, response: dict):
+    """Stores a request's response under its key, in the transaction that produced it."""
+    stored = {
+        "scope": scope,
+        "requestHash": _request_hash(request),
+        "response": response,
+        "expiresAt": datetime.now(timezone.utc) + timedelta(hours=config.IDEMPOTENCY_KEY_TTL_HOURS),
+    }
+    writer.set(idempotency_collection.document(key_id(scope, key)), stored)
+
+def remember(scope: str, key: str, request: BaseModel, response: dict):
+    """Caches a committed response so retries to this process skip the transaction."""
+    _recent.set(key_id(scope, key), {"requestHash": _request_hash(request), "response": response})
+
+def revoke(writer, key_id: str, scope: str):
+    """
+    Marks a key's request as undone, in the transaction that undoes it, so retries are
+    refused rather than replayed. A blind merge: works whether or not the key has expired.
+    """
+    writer.set(idempotency_collection.document(key_id), {
+        "scope": scope,
+        "revoked": True,
+        "expiresAt": datetime.now(timezone.utc) + timedelta(hours=config.IDEMPOTENCY_KEY_TTL_HOURS),
+    }, merge=True)
+
+def forget(key_id: str):
+    """Drops a key from this process's cache of recent responses."""
+    _recent.delete(key_id)
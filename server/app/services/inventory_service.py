@@ -1,50 +1,179 @@
 # app/services/inventory_service.py
+from datetime import datetime
+from typing import List, Optional, Tuple
 from firebase_admin import firestore
-from app.db.firebase_config import db, inventory_collection
-from app.schemas.inventory import InventoryCreate, InventoryUpdate
+from app.db.firebase_config import db, inventory_collection, low_stock_collection, mark_phase, transactional
+from app.db.batching import chunk_by_writes
+from app.db.pagination import DOCUMENT_ID, paginate_query
+from app.db.sharded_counter import ShardedCounter, ShardReading, delete_shards, read_totals
+from app.schemas.inventory import InventoryCreate, InventoryUpdate, InventoryUpsert
 from app.schemas.expense import ExpenseCreate # <--- IMPORT THIS
-from app.services import expense_service
+from app.services import expense_service, reservation_service, search_service
+from app.core import config
+from app.core.cache import TTLCache
+from app.db.snapshot_mirror import CollectionMirror
 
-# --- CREATE (Modified to link expense) ---
-def create_item(item: InventoryCreate):
-    """Creates a new inventory item and logs the purchase as a linked expense."""
-    # 1. Create the expense first
-    total_purchase_cost = item.purchasePrice * item.quantity
-    description = f"Inventory Purchase: {item.quantity} x {item.itemName} ({item.modelNumber})"
-    
-    # Create an ExpenseCreate object
+# Catalogue cache. Transactions always read stock straight from Firestore;
+# every write path below (and sale_service) invalidates the affected entries.
+_item_cache = TTLCache(maxsize=config.INVENTORY_CACHE_MAX_ITEMS, ttl=config.INVENTORY_CACHE_TTL_SECONDS)
+_list_cache = TTLCache(maxsize=64, ttl=config.INVENTORY_CACHE_TTL_SECONDS)
+# Summed stock of sharded items, so listings (mirror ones included) don't re-read shards on every request
+_stock_total_cache = TTLCache(maxsize=config.INVENTORY_CACHE_MAX_ITEMS, ttl=config.STOCK_TOTAL_CACHE_TTL_SECONDS)
+
+# Live mirror of the whole collection, started at app startup when
+# INVENTORY_MIRROR_ENABLED is set. While ready it takes precedence over the cache.
+mirror = CollectionMirror(inventory_collection, config.INVENTORY_MIRROR_CHECK_SECONDS)
+
+def _page_from_mirror(limit: Optional[int], start_after: Optional[str], fields: Optional[List[str]]):
+    """Applies the same ordering, cursor and projection as paginate_query to the mirror."""
+    items = mirror.list_documents()
+    if start_after:
+        ids = [item["id"] for item in items]
+        if start_after not in ids:
+            raise ValueError(f"Invalid cursor: {start_after}")
+        items = items[ids.index(start_after) + 1:]
+    next_cursor = None
+    if limit:
+        if len(items) > limit:
+            next_cursor = items[limit - 1]["id"]
+        items = items[:limit]
+    items = _with_live_stock(items)
+    if fields:
+        items = [{k: v for k, v in item.items() if k == "id" or k in fields} for item in items]
+    return items, next_cursor
+
+def invalidate_cache(item_ids=()):
+    """Drops cached entries for the given items and every cached listing."""
+    for item_id in item_ids:
+        _item_cache.delete(item_id)
+        _stock_total_cache.delete(item_id)
+    _list_cache.clear()
+
+def _purchase_description(quantity: int, item_name: str, model_number: str) -> str:
+    return f"Inventory Purchase: {quantity} x {item_name} ({model_number})"
+
+def _create_item_in_batch(writer, item: InventoryCreate):
+    """Adds a new item and its linked purchase expense to a batch or transaction."""
+    # 1. Create the expense
     expense_to_create = ExpenseCreate(
-        description=description,
-        amount=total_purchase_cost,
+        description=_purchase_description(item.quantity, item.itemName, item.modelNumber),
+        amount=item.purchasePrice * item.quantity,
         category="Inventory"  # Assign a default category
     )
-    new_expense = expense_service.create_expense(expense_to_create) # Pass the object
-    
+    new_expense = expense_service.create_expense_in_batch(writer, expense_to_create)
+
     # 2. Create the inventory item, storing the expense ID
     inventory_data = item.model_dump()
     inventory_data['expenseId'] = new_expense['id'] # Link the expense
 
     doc_ref = inventory_collection.document()
-    doc_ref.set(inventory_data)
-    
+    writer.set(doc_ref, inventory_data)
+    record_stock_level(writer, doc_ref.id, inventory_data, item.quantity, item.quantity)  # No entry to delete yet
     return {"id": doc_ref.id, **inventory_data}
 
-# --- READ (Unchanged) ---
+# --- CREATE (Modified to link expense) ---
+def create_item(item: InventoryCreate):
+    """Creates a new inventory item and logs the purchase as a linked expense, in one batch."""
+    batch = db.batch()
+    new_item = _create_item_in_batch(batch, item)
+    batch.commit()
+    invalidate_cache()
+    search_service.index_item(new_item)
+    
+    return new_item
+
+# --- READ (Served from the catalogue cache when fresh) ---
 def get_item(item_id: str):
+    if mirror.is_ready:
+        item = mirror.get(item_id)
+        return _with_live_stock([item])[0] if item else None
+
+    cached = _item_cache.get(item_id)
+    if cached is not None:
+        return dict(cached)
+
     doc = inventory_collection.document(item_id).get()
     if doc.exists:
-        return {"id": doc.id, **doc.to_dict()}
+        item = _with_live_stock([{"id": doc.id, **doc.to_dict()}])[0]
+        _item_cache.set(item_id, item)
+        return dict(item)
     return None
 
-def get_all_items():
-    items = []
-    docs = inventory_collection.stream()
-    for doc in docs:
-        items.append({"id": doc.id, **doc.to_dict()})
+def get_items(item_ids) -> dict:
+    """
+    Returns a dict of item ID -> item for the given IDs, serving cached items
+    from memory and fetching the rest in one batched read. Missing items are omitted.
+    Not for use inside transactions; use get_item_snapshots there.
+    """
+    if mirror.is_ready:
+        items = mirror.get_many(item_ids)
+        _with_live_stock(list(items.values()))
+        return items
+
+    items = {}
+    missing_ids = []
+    for item_id in dict.fromkeys(item_ids):
+        cached = _item_cache.get(item_id)
+        if cached is not None:
+            items[item_id] = dict(cached)
+        else:
+            missing_ids.append(item_id)
+
+    fetched = [
+        {"id": snapshot.id, **snapshot.to_dict()}
+        for snapshot in get_item_snapshots(missing_ids).values()
+        if snapshot.exists
+    ]
+    for item in _with_live_stock(fetched):
+        _item_cache.set(item["id"], item)
+        items[item["id"]] = dict(item)
     return items
 
+def get_item_snapshots(item_ids, transaction=None, field_paths: Optional[List[str]] = None):
+    """
+    Fetches several inventory documents (or only `field_paths` of them) in a
+    single batched read. Duplicate IDs are collapsed; returns a dict of item ID -> snapshot.
+    """
+    unique_ids = list(dict.fromkeys(item_ids))
+    if not unique_ids:
+        return {}
+    refs = [inventory_collection.document(item_id) for item_id in unique_ids]
+    snapshots = db.get_all(refs, field_paths=field_paths, transaction=transaction)
+    return {snapshot.id: snapshot for snapshot in snapshots}
+
+def get_all_items(limit: Optional[int] = None, start_after: Optional[str] = None, fields: Optional[List[str]] = None):
+    """Retrieves a page of inventory items ordered by ID. Returns (items, next_cursor)."""
+    if mirror.is_ready:
+        return _page_from_mirror(limit, start_after, fields)
+
+    cache_key = (limit, start_after, tuple(fields) if fields else None)
+    cached = _list_cache.get(cache_key)
+    if cached is not None:
+        items, next_cursor = cached
+        return [dict(item) for item in items], next_cursor
+
+    query_fields = fields
+    if fields and "quantity" in fields and "stockShards" not in fields:
+        # Sharded items keep their quantity in shards; stockShards says where to find it
+        query_fields = fields + ["stockShards"]
+
+    docs, next_cursor = paginate_query(
+        inventory_collection,
+        order_by=DOCUMENT_ID,
+        direction=firestore.Query.ASCENDING,
+        limit=limit,
+        start_after=start_after,
+        fields=query_fields,
+    )
+    items = _with_live_stock([{"id": doc.id, **doc.to_dict()} for doc in docs])
+    _list_cache.set(cache_key, (items, next_cursor))
+    if not fields:
+        for item in items:
+            _item_cache.set(item["id"], item)
+    return [dict(item) for item in items], next_cursor
+
 # --- UPDATE (Rewritten to use a transaction) ---
-@firestore.transactional
+@transactional
 def update_item_transaction(transaction, item_id: str, item_update: InventoryUpdate):
     item_ref = inventory_collection.document(item_id)
     item_snapshot = item_ref.get(transaction=transaction)
@@ -55,36 +184,185 @@ def update_item_transaction(transaction, item_id: str, item_update: InventoryUpd
     item_data = item_snapshot.to_dict()
     update_data = {k: v for k, v in item_update.model_dump().items() if v is not None}
 
+    counter = stock_counter(item_id, item_data)
+    if counter:
+        item_data['quantity'] = counter.total(db, transaction=transaction)
+
     # Check if we need to update the linked expense
-    if 'quantity' in update_data or 'purchasePrice' in update_data:
-        expense_id = item_data.get('expenseId')
-        if expense_id:
-            # Use new value if provided, otherwise fall back to existing value
-            new_quantity = update_data.get('quantity', item_data['quantity'])
-            new_price = update_data.get('purchasePrice', item_data['purchasePrice'])
-            item_name = update_data.get('itemName', item_data['itemName'])
-            model_num = update_data.get('modelNumber', item_data['modelNumber'])
-
-            # Recalculate and update the expense
-            new_total_cost = new_quantity * new_price
-            new_description = f"Inventory Purchase: {new_quantity} x {item_name} ({model_num})"
-            expense_service.update_expense_in_transaction(transaction, expense_id, new_total_cost, new_description)
-
-    transaction.update(item_ref, update_data)
+    expense_data = None
+    if _affects_expense(update_data) and item_data.get('expenseId'):
+        expense_data = expense_service.get_expense_in_transaction(transaction, item_data['expenseId'])
+
+    _update_item_in_transaction(transaction, item_id, item_data, update_data, expense_data)
     return {**item_data, **update_data}
 
+def _affects_expense(update_data: dict) -> bool:
+    return 'quantity' in update_data or 'purchasePrice' in update_data
+
+def _update_item_in_transaction(transaction, item_id: str, item_data: dict, update_data: dict, expense_data: Optional[dict]):
+    """
+    Writes an item update, recalculating its linked expense when quantity or price change.
+    `item_data` must carry the live quantity (summed from shards for sharded items) and
+    `expense_data` the linked expense's current data, both read before any writes.
+    Returns the expense's new data, or None if it was not touched.
+    """
+    new_expense_data = None
+    if _affects_expense(update_data) and expense_data:
+        # Use new value if provided, otherwise fall back to existing value
+        new_quantity = update_data.get('quantity', item_data['quantity'])
+        new_price = update_data.get('purchasePrice', item_data['purchasePrice'])
+        item_name = update_data.get('itemName', item_data['itemName'])
+        model_num = update_data.get('modelNumber', item_data['modelNumber'])
+
+        # Recalculate and update the expense
+        new_total_cost = new_quantity * new_price
+        new_description = _purchase_description(new_quantity, item_name, model_num)
+        expense_service.update_expense_in_transaction(transaction, item_data['expenseId'], new_total_cost, new_description, expense_data)
+        new_expense_data = {**expense_data, "amount": new_total_cost, "description": new_description}
+
+    item_fields = dict(update_data)
+    counter = stock_counter(item_id, item_data)
+    if counter and 'quantity' in item_fields:
+        counter.reset(transaction, item_fields.pop('quantity'))
+    if item_fields:
+        transaction.update(inventory_collection.document(item_id), item_fields)
+    if LOW_STOCK_FIELDS.intersection(update_data):
+        new_item_data = {**item_data, **update_data}
+        record_stock_level(transaction, item_id, new_item_data, new_item_data['quantity'])
+    return new_expense_data
+
 def update_item(item_id: str, item_update: InventoryUpdate):
     """Public function to initiate the item update transaction."""
     transaction = db.transaction()
     try:
         updated_data = update_item_transaction(transaction, item_id, item_update)
+        invalidate_cache([item_id])
+        search_service.index_item({"id": item_id, **updated_data})
         return {"id": item_id, **updated_data}
     except ValueError:
         return None
 
 
+# --- BULK CREATE / UPDATE ---
+def _upsert_writes(row, shards_by_id: dict) -> int:
+    """Upper bound on a row's writes: item, expense, one or two daily stats updates and its low-stock entry."""
+    _, item = row
+    if item.id:
+        # Quantity changes on a sharded item rewrite its shards too
+        return 5 + (shards_by_id.get(item.id, 0) if item.quantity is not None else 0)
+    return 4
+
+def shard_counts(item_ids: List[str]) -> dict:
+    """Reads the stockShards of items in one batched read. Returns {itemId: shards}, 0 for unsharded items."""
+    return {
+        item_id: (snapshot.to_dict() or {}).get('stockShards') or 0
+        for item_id, snapshot in get_item_snapshots(item_ids, field_paths=['stockShards']).items()
+    }
+
+def stock_decrement_writes(num_shards: int) -> int:
+    """Upper bound on write_stock_decrements' writes for one item: each shard, or the item and its low-stock entry."""
+    return num_shards or 2
+
+def _missing_create_fields(item: InventoryUpsert) -> List[str]:
+    return [
+        field for field, field_info in InventoryCreate.model_fields.items()
+        if field_info.is_required() and getattr(item, field) is None
+    ]
+
+@transactional
+def bulk_upsert_transaction(transaction, rows: list):
+    """
+    Creates and updates a chunk of items, with their linked expenses, in one commit.
+
+    `rows` is a list of (index, InventoryUpsert) pairs; rows with an `id` update
+    that item, the rest create new items. Existing items and their expenses are
+    fetched in two batched reads. A row that fails validation is skipped without
+    affecting the rest of the chunk. Returns (index, status, item, error) tuples.
+    """
+    update_ids = [item.id for _, item in rows if item.id]
+
+    # --- 1. READ PHASE ---
+    item_data_by_id = {
+        item_id: snapshot.to_dict()
+        for item_id, snapshot in get_item_snapshots(update_ids, transaction=transaction).items()
+        if snapshot.exists
+    }
+    for item_id, item_data in item_data_by_id.items():
+        counter = stock_counter(item_id, item_data)
+        if counter:
+            item_data['quantity'] = counter.total(db, transaction=transaction)
+    expense_data_by_id = expense_service.get_expenses_in_transaction(
+        transaction, [item_data['expenseId'] for item_data in item_data_by_id.values() if item_data.get('expenseId')]
+    )
+
+    # --- 2. WRITE PHASE (rows applied in order, so repeated IDs build on each other) ---
+    mark_phase("write")
+    results = []
+    for index, item in rows:
+        fields = item.model_dump(exclude={"id"}, exclude_none=True)
+
+        if not item.id:
+            missing = _missing_create_fields(item)
+            if missing:
+                results.append((index, "failed", None, f"Missing fields for a new item: {', '.join(missing)}"))
+                continue
+            results.append((index, "created", _create_item_in_batch(transaction, InventoryCreate(**fields)), None))
+            continue
+
+        item_data = item_data_by_id.get(item.id)
+        if item_data is None:
+            results.append((index, "failed", None, f"Item {item.id} not found"))
+            continue
+        if not fields:
+            results.append((index, "failed", None, "No data to update"))
+            continue
+
+        expense_id = item_data.get('expenseId')
+        new_expense_data = _update_item_in_transaction(
+            transaction, item.id, item_data, fields, expense_data_by_id.get(expense_id)
+        )
+        if new_expense_data:
+            expense_data_by_id[expense_id] = new_expense_data
+        item_data_by_id[item.id] = {**item_data, **fields}
+        results.append((index, "updated", {"id": item.id, **item_data_by_id[item.id]}, None))
+
+    return results
+
+def bulk_upsert_items(items: List[InventoryUpsert]):
+    """
+    Creates and updates many items (e.g. a container's worth of stock), committing
+    them in chunks that fit Firestore's 500-write limit. Each chunk is atomic.
+    Returns a result per row, in submission order.
+    """
+    # An item resharded between this read and its chunk's commit is covered by the chunk headroom
+    shards_by_id = shard_counts([item.id for item in items if item.id and item.quantity is not None])
+    results = []
+    for chunk in chunk_by_writes(list(enumerate(items)), lambda row: _upsert_writes(row, shards_by_id)):
+        transaction = db.transaction()
+        try:
+            chunk_results = bulk_upsert_transaction(transaction, chunk)
+        except Exception as e:
+            # The whole chunk was rolled back (e.g. retries exhausted under contention)
+            chunk_results = [(index, "failed", None, f"Chunk failed: {e}") for index, _ in chunk]
+
+        for index, row_status, item, error in chunk_results:
+            if row_status == "failed":
+                results.append({"index": index, "status": row_status, "error": error})
+            else:
+                results.append({"index": index, "status": row_status, "item": item})
+                search_service.index_item(item)
+        invalidate_cache([item.id for _, item in chunk if item.id])
+
+    return {
+        "created": sum(1 for result in results if result["status"] == "created"),
+        "updated": sum(1 for result in results if result["status"] == "updated"),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "results": results,
+    }
+
+
 # --- DELETE (Rewritten to use a transaction) ---
-@firestore.transactional
+@transactional
 def delete_item_transaction(transaction, item_id: str):
     item_ref = inventory_collection.document(item_id)
     item_snapshot = item_ref.get(transaction=transaction)
@@ -93,17 +371,198 @@ def delete_item_transaction(transaction, item_id: str):
         raise ValueError("Item not found")
 
     # If a linked expense exists, delete it too
-    expense_id = item_snapshot.to_dict().get('expenseId')
-    if expense_id:
-        expense_service.delete_expense_in_transaction(transaction, expense_id)
+    item_data = item_snapshot.to_dict()
+    expense_id = item_data.get('expenseId')
+    expense_data = expense_service.get_expense_in_transaction(transaction, expense_id) if expense_id else None
+    if expense_data:
+        expense_service.delete_expense_in_transaction(transaction, expense_id, expense_data)
 
+    delete_shards(transaction, item_ref, STOCK_SHARDS_SUBCOLLECTION, 0, item_data.get('stockShards'))
     transaction.delete(item_ref)
+    transaction.delete(low_stock_collection.document(item_id))
+    reservation_service.drop_item_holds(transaction, item_id)
 
 def delete_item(item_id: str):
     """Public function to initiate the item delete transaction."""
     transaction = db.transaction()
     try:
         delete_item_transaction(transaction, item_id)
+        invalidate_cache([item_id])
+        search_service.remove_item(item_id)
         return {"status": "success", "message": f"Item {item_id} and linked expense deleted."}
     except ValueError:
-        return None
\ No newline at end of file
+        return None
+
+# --- STOCK (a plain `quantity` field, or a sharded counter for hot items) ---
+STOCK_SHARDS_SUBCOLLECTION = "stock_shards"
+
+def stock_counter(item_id: str, item_data: dict) -> Optional[ShardedCounter]:
+    """
+    Returns the sharded stock counter of an item with `stockShards` set, else None.
+    A sharded item has no `quantity` field; its stock is the sum of
+    inventory/{id}/stock_shards/{0..stockShards-1}.
+    """
+    num_shards = item_data.get('stockShards')
+    if not num_shards:
+        return None
+    return ShardedCounter(inventory_collection.document(item_id), num_shards, STOCK_SHARDS_SUBCOLLECTION)
+
+def _with_live_stock(items: list) -> list:
+    """
+    Fills in `quantity` on sharded items from their summed shards, and drops the
+    internal `stockShards` field. Recent totals are reused; the rest are read
+    together in one batched read.
+    """
+    missing = {}
+    for item in items:
+        counter = stock_counter(item["id"], item)
+        if counter is None:
+            continue
+        cached = _stock_total_cache.get(item["id"])  # (num_shards, total)
+        if cached is not None and cached[0] == counter.num_shards:
+            item["quantity"] = cached[1]
+        else:
+            missing[item["id"]] = counter
+    if missing:
+        totals = read_totals(db, missing)
+        for item_id, total in totals.items():
+            _stock_total_cache.set(item_id, (missing[item_id].num_shards, total))
+        for item in items:
+            if item["id"] in totals:
+                item["quantity"] = totals[item["id"]]
+    for item in items:
+        item.pop("stockShards", None)
+    return items
+
+def read_stock(transaction, item_data_by_id: dict, needed_by_id: dict, reserved_by_id: Optional[dict] = None) -> Tuple[dict, dict]:
+    """
+    Reads the stock of items within a transaction, before any writes.
+
+    Available stock is the item's quantity less the stock held for quotations,
+    read here unless the caller passes `reserved_by_id` ({itemId: held quantity}).
+    For sharded items only enough random shards to cover `needed_by_id` (plus
+    the held stock) are read, so concurrent sales of the same item usually
+    touch different documents. Returns ({itemId: available}, {itemId: stock read});
+    pass the second to write_stock_decrements.
+    """
+    if reserved_by_id is None:
+        reserved_by_id = reservation_service.held_quantities(
+            reservation_service.read_holds(list(item_data_by_id), transaction=transaction)
+        )
+    available_by_id, stock_reads = {}, {}
+    for item_id, item_data in item_data_by_id.items():
+        reserved = reserved_by_id.get(item_id, 0)
+        counter = stock_counter(item_id, item_data)
+        if counter is None:
+            stock_reads[item_id] = item_data.get('quantity', 0)
+            available_by_id[item_id] = stock_reads[item_id] - reserved
+            continue
+        stock_reads[item_id] = counter.read_for_decrement(db, transaction, needed_by_id.get(item_id, 0) + reserved)
+        available_by_id[item_id] = stock_reads[item_id].available - reserved
+    return available_by_id, stock_reads
+
+def write_stock_decrements(transaction, taken_by_id: dict, stock_reads: dict, item_data_by_id: dict):
+    """
+    Takes the given quantities out of stock read with read_stock, keeping the
+    low-stock index in step for items whose whole quantity was read.
+    """
+    for item_id, taken in taken_by_id.items():
+        if not taken:
+            continue
+        stock_read = stock_reads[item_id]
+        if isinstance(stock_read, ShardReading):
+            # Only some shards were read, so the total is unknown; see stock_alert_service
+            stock_read.decrement(transaction, taken)
+        else:
+            transaction.update(inventory_collection.document(item_id), {'quantity': stock_read - taken})
+            record_stock_level(transaction, item_id, item_data_by_id[item_id], stock_read - taken, stock_read)
+
+def restore_stock(transaction, item_id: str, item_data: dict, quantity: int):
+    """Puts stock back, e.g. when a sale is deleted. Sharded items get a blind increment."""
+    counter = stock_counter(item_id, item_data)
+    if counter:
+        counter.increment(transaction, quantity)
+    else:
+        previous_quantity = item_data.get('quantity', 0)
+        transaction.update(inventory_collection.document(item_id), {'quantity': previous_quantity + quantity})
+        record_stock_level(transaction, item_id, item_data, previous_quantity + quantity, previous_quantity)
+
+@transactional
+def set_stock_shards_transaction(transaction, item_id: str, num_shards: int):
+    item_ref = inventory_collection.document(item_id)
+    item_snapshot = item_ref.get(transaction=transaction)
+
+    if not item_snapshot.exists:
+        raise ValueError("Item not found")
+
+    item_data = item_snapshot.to_dict()
+    old_shards = item_data.get('stockShards') or 0
+    counter = stock_counter(item_id, item_data)
+    total = counter.total(db, transaction=transaction) if counter else item_data.get('quantity', 0)
+
+    item_data['quantity'] = total
+    if num_shards > 1:
+        ShardedCounter(item_ref, num_shards, STOCK_SHARDS_SUBCOLLECTION).reset(transaction, total, old_shards)
+        transaction.update(item_ref, {'stockShards': num_shards, 'quantity': firestore.DELETE_FIELD})
+        item_data['stockShards'] = num_shards
+    else:
+        delete_shards(transaction, item_ref, STOCK_SHARDS_SUBCOLLECTION, 0, old_shards)
+        transaction.update(item_ref, {'quantity': total, 'stockShards': firestore.DELETE_FIELD})
+        item_data.pop('stockShards', None)
+    record_stock_level(transaction, item_id, item_data, total)
+    return item_data
+
+def set_stock_shards(item_id: str, num_shards: int):
+    """
+    Moves an item's stock into `num_shards` counter shards (or back into its
+    `quantity` field when 1), keeping the total. Use for items sold by several
+    counters at once, whose single quantity field would otherwise serialize checkouts.
+    """
+    transaction = db.transaction()
+    try:
+        item_data = set_stock_shards_transaction(transaction, item_id, num_shards)
+        invalidate_cache([item_id])
+        return {"id": item_id, **item_data}
+    except ValueError:
+        return None
+
+# --- LOW-STOCK INDEX ---
+# low_stock/{itemId} exists while an item's quantity is at or below its reorder level:
+#   itemName, modelNumber, quantity, reorderLevel, updatedAt
+# It is written in the same transaction as every plain quantity change. Sales of
+# sharded items only read some shards, so stock_alert_service refreshes their entries.
+LOW_STOCK_FIELDS = {'quantity', 'reorderLevel', 'itemName', 'modelNumber'}
+
+def reorder_level(item_data: dict) -> int:
+    """The item's reorderLevel, or LOW_STOCK_THRESHOLD when it has none."""
+    level = item_data.get('reorderLevel')
+    return config.LOW_STOCK_THRESHOLD if level is None else level
+
+def record_stock_level(writer, item_id: str, item_data: dict, quantity: int, previous_quantity: Optional[int] = None):
+    """
+    Sets the item's low-stock entry while `quantity` is at or below its reorder
+    level and deletes it otherwise. Both are blind writes; passing the quantity
+    before the change skips the delete for items that were already above the level.
+    """
+    level = reorder_level(item_data)
+    ref = low_stock_collection.document(item_id)
+    if quantity <= level:
+        writer.set(ref, {
+            "itemName": item_data.get('itemName', ''),
+            "modelNumber": item_data.get('modelNumber', ''),
+            "quantity": quantity,
+            "reorderLevel": level,
+            "updatedAt": datetime.now().isoformat(),
+        })
+    elif previous_quantity is None or previous_quantity <= level:
+        writer.delete(ref)
+
+def get_low_stock_entries() -> List[dict]:
+    """Reads the low-stock index: every item at or below its reorder level."""
+    return [{"id": doc.id, **doc.to_dict()} for doc in low_stock_collection.stream()]
+
+def get_cache_stats() -> dict:
+    return {"items": _item_cache.stats(), "listings": _list_cache.stats()}
+
+def get_mirror_status() -> dict:
+    return {"enabled": config.INVENTORY_MIRROR_ENABLED, **mirror.status()}
@@ -1,26 +1,39 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.db.firebase_config import inventory_collection, quotations_collection
+from app.core import config
+from app.db.firebase_config import db, quotations_collection, mark_phase, transactional
+from app.db.pagination import paginate_query
 from app.schemas.quotation import QuotationCreate
+from app.services import inventory_service, reservation_service
 
 
-def _get_inventory_item(item_id: str):
-    doc = inventory_collection.document(item_id).get()
-    if not doc.exists:
-        raise ValueError(f"Inventory item with ID {item_id} not found.")
-    return doc.to_dict()
+def _get_inventory_items(item_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    items = inventory_service.get_items(item_ids)
+    for item_id in item_ids:
+        if item_id not in items:
+            raise ValueError(f"Inventory item with ID {item_id} not found.")
+    return items
 
 
-def create_quotation(quotation_data: QuotationCreate) -> Dict[str, Any]:
-    """
-    Prepare a quotation for a potential sale without mutating inventory.
-    """
+def _requested_quantities(quotation_data: QuotationCreate) -> Dict[str, int]:
+    quantities_by_id: Dict[str, int] = {}
+    for item in quotation_data.items:
+        quantities_by_id[item.itemId] = quantities_by_id.get(item.itemId, 0) + item.quantityRequested
+    return quantities_by_id
+
+
+def _build_quotation(
+    quotation_data: QuotationCreate,
+    inventory_items: Dict[str, Dict[str, Any]],
+    available_by_id: Dict[str, int],
+) -> Dict[str, Any]:
+    """Prices a quotation against the given items; `available_by_id` is stock not held for other quotations."""
     processed_items: List[Dict[str, Any]] = []
     total_amount = 0.0
 
     for requested_item in quotation_data.items:
-        item_data = _get_inventory_item(requested_item.itemId)
+        item_data = inventory_items[requested_item.itemId]
         price_per_item = (
             requested_item.sellingPrice
             if requested_item.sellingPrice is not None
@@ -42,7 +55,7 @@ def create_quotation(quotation_data: QuotationCreate) -> Dict[str, Any]:
                 "quantityRequested": quantity_requested,
                 "pricePerItem": price_per_item,
                 "totalAmount": item_total,
-                "availableQuantity": item_data.get("quantity", 0),
+                "availableQuantity": available_by_id[requested_item.itemId],
             }
         )
 
@@ -58,7 +71,6 @@ def create_quotation(quotation_data: QuotationCreate) -> Dict[str, Any]:
             total_amount += borrowed.selling_price * borrowed.quantity
             borrowed_items_profit += (borrowed.selling_price - borrowed.borrowed_cost) * borrowed.quantity
 
-    quotation_ref = quotations_collection.document()
     quotation_record: Dict[str, Any] = {
         "customerName": quotation_data.customerName,
         "phoneNumber": quotation_data.phoneNumber,
@@ -79,11 +91,101 @@ def create_quotation(quotation_data: QuotationCreate) -> Dict[str, Any]:
         quotation_record["borrowed_items"] = [item.model_dump() for item in quotation_data.borrowed_items]
         quotation_record["borrowed_items_profit"] = borrowed_items_profit
 
+    return quotation_record
+
+
+@transactional
+def create_quotation_with_hold_transaction(transaction, quotation_ref, quotation_data: QuotationCreate, expires_at: str):
+    """
+    Records a quotation and holds its items' stock until `expires_at`, so a sale
+    made elsewhere in the meantime cannot take it.
+    """
+    quantities_by_id = _requested_quantities(quotation_data)
+
+    # --- 1. READ PHASE (items, their holds, then any stock shards) ---
+    snapshots = inventory_service.get_item_snapshots(list(quantities_by_id), transaction=transaction)
+    inventory_items = {item_id: snapshot.to_dict() for item_id, snapshot in snapshots.items() if snapshot.exists}
+    for item_id in quantities_by_id:
+        if item_id not in inventory_items:
+            raise ValueError(f"Inventory item with ID {item_id} not found.")
+    holds_by_id = reservation_service.read_holds(list(quantities_by_id), transaction=transaction)
+    available_by_id, _ = inventory_service.read_stock(
+        transaction, inventory_items, quantities_by_id, reservation_service.held_quantities(holds_by_id)
+    )
+
+    # --- 2. VALIDATION PHASE ---
+    mark_phase("validate")
+    for item_id, quantity_requested in quantities_by_id.items():
+        if available_by_id[item_id] < quantity_requested:
+            raise ValueError(
+                f"Insufficient stock to hold {inventory_items[item_id]['itemName']}. "
+                f"Available: {available_by_id[item_id]}, Requested: {quantity_requested}."
+            )
+    quotation_record = _build_quotation(quotation_data, inventory_items, available_by_id)
+    quotation_record["holdMinutes"] = quotation_data.holdMinutes
+    quotation_record["holdExpiresAt"] = expires_at
+
+    # --- 3. WRITE PHASE ---
+    mark_phase("write")
+    reservation_service.place_holds(transaction, quotation_ref.id, quantities_by_id, expires_at, holds_by_id)
+    transaction.set(quotation_ref, quotation_record)
+    return quotation_record
+
+
+def create_quotation(quotation_data: QuotationCreate) -> Dict[str, Any]:
+    """
+    Prepare a quotation for a potential sale without mutating inventory.
+    With `holdMinutes` the quoted stock is also held for that long.
+    """
+    quotation_ref = quotations_collection.document()
+
+    if quotation_data.holdMinutes:
+        if quotation_data.holdMinutes > config.RESERVATION_MAX_HOLD_MINUTES:
+            raise ValueError(f"Stock can be held for at most {config.RESERVATION_MAX_HOLD_MINUTES} minutes.")
+        expires_at = (datetime.now() + timedelta(minutes=quotation_data.holdMinutes)).isoformat()
+        quotation_record = create_quotation_with_hold_transaction(db.transaction(), quotation_ref, quotation_data, expires_at)
+        return {"id": quotation_ref.id, **quotation_record}
+
+    item_ids = [item.itemId for item in quotation_data.items]
+    inventory_items = _get_inventory_items(item_ids)
+    held_by_id = reservation_service.held_quantities(reservation_service.read_holds(item_ids))
+    available_by_id = {
+        item_id: item_data.get("quantity", 0) - held_by_id.get(item_id, 0)
+        for item_id, item_data in inventory_items.items()
+    }
+    quotation_record = _build_quotation(quotation_data, inventory_items, available_by_id)
     quotation_ref.set(quotation_record)
 
     return {"id": quotation_ref.id, **quotation_record}
 
 
+@transactional
+def release_hold_transaction(transaction, quotation_id: str):
+    quotation_ref = quotations_collection.document(quotation_id)
+    snapshot = quotation_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        raise ValueError("Quotation not found")
+
+    quotation_record = snapshot.to_dict()
+    if quotation_record.get("holdExpiresAt"):
+        holds_by_id = reservation_service.read_holds(
+            [item["itemId"] for item in quotation_record.get("items", [])], transaction=transaction
+        )
+        reservation_service.release_holds(transaction, quotation_id, holds_by_id)
+        transaction.update(quotation_ref, {"holdExpiresAt": None})
+        quotation_record["holdExpiresAt"] = None
+    return quotation_record
+
+
+def release_hold(quotation_id: str) -> Optional[Dict[str, Any]]:
+    """Releases a quotation's stock hold early, e.g. when the customer declines."""
+    try:
+        quotation_record = release_hold_transaction(db.transaction(), quotation_id)
+    except ValueError:
+        return None
+    return {"id": quotation_id, **quotation_record}
+
+
 def get_quotation(quotation_id: str) -> Optional[Dict[str, Any]]:
     doc = quotations_collection.document(quotation_id).get()
     if doc.exists:
@@ -91,9 +193,13 @@ def get_quotation(quotation_id: str) -> Optional[Dict[str, Any]]:
     return None
 
 
-def get_all_quotations() -> List[Dict[str, Any]]:
-    quotations: List[Dict[str, Any]] = []
-    docs = quotations_collection.stream()
-    for doc in docs:
-        quotations.append({"id": doc.id, **doc.to_dict()})
-    return quotations
+def get_all_quotations(
+    limit: Optional[int] = None,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    docs, next_cursor = paginate_query(
+        quotations_collection, limit=limit, start_after=start_after, fields=fields
+    )
+    quotations: List[Dict[str, Any]] = [{"id": doc.id, **doc.to_dict()} for doc in docs]
+    return quotations, next_cursor
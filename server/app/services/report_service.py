@@ -0,0 +1,151 @@
+# app/services/report_service.py
+from datetime import date as date_type, datetime, timedelta
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.db.firebase_config import daily_stats_collection, sales_collection, expenses_collection
+from app.services import stats_service
+
+MAX_REPORT_DAYS = 366 * 5
+GRANULARITIES = ("day", "week", "month", "year")
+METRICS = (
+    "salesCount",
+    "totalSales",
+    "grossSales",
+    "totalExpenses",
+    "oldItemDeductions",
+    "borrowedItemsProfit",
+    "outstandingCredit",
+)
+
+def _parse_date(value: str) -> date_type:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD.")
+
+def bucket_key(day: str, granularity: str) -> str:
+    """Maps a YYYY-MM-DD day to its bucket: the day, the week's Monday, YYYY-MM or YYYY."""
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        parsed = _parse_date(day)
+        return (parsed - timedelta(days=parsed.weekday())).isoformat()
+    if granularity == "month":
+        return day[:7]
+    return day[:4]
+
+def _empty_bucket(period: str) -> dict:
+    bucket = {"period": period}
+    for metric in METRICS:
+        bucket[metric] = 0 if metric == "salesCount" else 0.0
+    return bucket
+
+def _range_query(collection, from_date: str, to_date: str):
+    return collection.where(
+        filter=FieldFilter("date", ">=", from_date + "T00:00:00")
+    ).where(
+        filter=FieldFilter("date", "<=", to_date + "T23:59:59.999999")
+    ).stream()
+
+def _buckets_from_rollups(from_date: str, to_date: str, granularity: str) -> dict:
+    """One range query over the daily_stats documents (one per day and stats shard)."""
+    buckets = {}
+    docs = daily_stats_collection.where(
+        filter=FieldFilter("date", ">=", from_date)
+    ).where(
+        filter=FieldFilter("date", "<=", to_date)
+    ).stream()
+
+    for doc in docs:
+        stats = doc.to_dict()
+        key = bucket_key(stats.get("date", doc.id), granularity)
+        bucket = buckets.setdefault(key, _empty_bucket(key))
+        for metric in METRICS:
+            bucket[metric] += stats.get(metric, 0) or 0
+    return buckets
+
+def _buckets_from_scan(from_date: str, to_date: str, granularity: str) -> dict:
+    """One pass over the sales and expenses recorded in the range."""
+    buckets = {}
+
+    for doc in _range_query(sales_collection, from_date, to_date):
+        sale = doc.to_dict()
+        key = bucket_key(sale["date"][:10], granularity)
+        bucket = buckets.setdefault(key, _empty_bucket(key))
+        total = sale.get("totalAmount", 0.0)
+        old_item_deduction = sale.get("old_item_deduction") or 0.0
+        bucket["salesCount"] += 1
+        bucket["totalSales"] += total
+        bucket["grossSales"] += total + old_item_deduction
+        bucket["oldItemDeductions"] += old_item_deduction
+        bucket["borrowedItemsProfit"] += sale.get("borrowed_items_profit") or 0.0
+        bucket["outstandingCredit"] += sale.get("balance", 0.0)
+
+    for doc in _range_query(expenses_collection, from_date, to_date):
+        expense = doc.to_dict()
+        key = bucket_key(expense["date"][:10], granularity)
+        bucket = buckets.setdefault(key, _empty_bucket(key))
+        bucket["totalExpenses"] += expense.get("amount", 0.0)
+
+    return buckets
+
+def _merge_buckets(buckets: dict, extra: dict):
+    for key, extra_bucket in extra.items():
+        bucket = buckets.setdefault(key, _empty_bucket(key))
+        for metric in METRICS:
+            bucket[metric] += extra_bucket[metric]
+
+def get_report(from_date: str, to_date: str, granularity: str = "day", source: str = "rollup") -> dict:
+    """
+    Returns revenue, expenses, old item deductions, borrowed item profit and
+    outstanding credit for [from_date, to_date], bucketed by day/week/month/year.
+
+    `source="rollup"` reads the daily_stats documents; `source="scan"` reads
+    the underlying sales and expenses. Rollups are complete from the recorded
+    rollup start (stats_service.rollups_since) on, so a later day without one
+    had no activity. The rollup source scans the days before the start, and
+    reports the last scanned day in `scanned_to`; rebuild them newest first
+    (migrate_daily_stats.py) to move the start back.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Invalid granularity '{granularity}'. Choose one of: {', '.join(GRANULARITIES)}.")
+
+    start = _parse_date(from_date)
+    end = _parse_date(to_date)
+    if end < start:
+        raise ValueError("'to' date must not be before 'from' date.")
+    if (end - start).days + 1 > MAX_REPORT_DAYS:
+        raise ValueError(f"Date range cannot exceed {MAX_REPORT_DAYS} days.")
+
+    scanned_to = None
+    if source == "scan":
+        buckets = _buckets_from_scan(from_date, to_date, granularity)
+    else:
+        since = stats_service.rollups_since()
+        if since is not None and since <= from_date:
+            buckets = _buckets_from_rollups(from_date, to_date, granularity)
+        else:
+            scan_end = end if since is None else min(end, _parse_date(since) - timedelta(days=1))
+            scanned_to = scan_end.isoformat()
+            buckets = _buckets_from_scan(from_date, scanned_to, granularity)
+            if since is not None and since <= to_date:
+                _merge_buckets(buckets, _buckets_from_rollups(since, to_date, granularity))
+
+    totals = _empty_bucket("total")
+    ordered_buckets = []
+    for key in sorted(buckets):
+        bucket = buckets[key]
+        bucket["net"] = bucket["totalSales"] - bucket["totalExpenses"]
+        ordered_buckets.append(bucket)
+        for metric in METRICS:
+            totals[metric] += bucket[metric]
+    totals["net"] = totals["totalSales"] - totals["totalExpenses"]
+
+    return {
+        "from_date": from_date,
+        "to_date": to_date,
+        "granularity": granularity,
+        "source": source,
+        "scanned_to": scanned_to,
+        "buckets": ordered_buckets,
+        "totals": totals,
+    }
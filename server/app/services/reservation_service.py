@@ -0,0 +1,103 @@
+# app/services/reservation_service.py
+from datetime import datetime
+from typing import Dict, Optional
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.core.concurrency import PeriodicTask
+from app.db.firebase_config import db, stock_reservations_collection, transactional
+
+# stock_reservations/{itemId} holds the stock set aside for open quotations:
+#   holds {quotationId: {"quantity": int, "expiresAt": ISO timestamp}},
+#   nextExpiry (earliest expiresAt among the holds, so the sweeper can find due documents)
+# A hold stops counting the moment it expires; the sweeper only tidies the documents up.
+
+def _active(holds: dict, now: str) -> dict:
+    return {quotation_id: hold for quotation_id, hold in holds.items() if hold.get("expiresAt", "") > now}
+
+def read_holds(item_ids, transaction=None) -> Dict[str, dict]:
+    """
+    Reads the unexpired holds on the given items in one batched read.
+    Returns {itemId: {quotationId: hold}}, with an empty dict for items without holds.
+    """
+    unique_ids = list(dict.fromkeys(item_ids))
+    if not unique_ids:
+        return {}
+    now = datetime.now().isoformat()
+    refs = [stock_reservations_collection.document(item_id) for item_id in unique_ids]
+    holds_by_id = {item_id: {} for item_id in unique_ids}
+    for snapshot in db.get_all(refs, transaction=transaction):
+        if snapshot.exists:
+            holds_by_id[snapshot.id] = _active(snapshot.to_dict().get("holds", {}), now)
+    return holds_by_id
+
+def held_quantities(holds_by_id: dict, exclude_quotation: Optional[str] = None) -> Dict[str, int]:
+    """Returns {itemId: quantity held}, optionally ignoring one quotation's holds."""
+    return {
+        item_id: sum(hold["quantity"] for quotation_id, hold in holds.items() if quotation_id != exclude_quotation)
+        for item_id, holds in holds_by_id.items()
+    }
+
+def _write_holds(writer, item_id: str, holds: dict):
+    ref = stock_reservations_collection.document(item_id)
+    if holds:
+        writer.set(ref, {"holds": holds, "nextExpiry": min(hold["expiresAt"] for hold in holds.values())})
+    else:
+        writer.delete(ref)
+
+def place_holds(writer, quotation_id: str, quantities_by_id: dict, expires_at: str, holds_by_id: dict):
+    """
+    Holds stock for a quotation until `expires_at`. `holds_by_id` must come from
+    read_holds in the same transaction; expired holds are dropped on the way.
+    """
+    for item_id, quantity in quantities_by_id.items():
+        holds = dict(holds_by_id.get(item_id, {}))
+        holds[quotation_id] = {"quantity": quantity, "expiresAt": expires_at}
+        _write_holds(writer, item_id, holds)
+
+def release_holds(writer, quotation_id: str, holds_by_id: dict):
+    """Releases a quotation's holds on the items in `holds_by_id` (read with read_holds)."""
+    for item_id, holds in holds_by_id.items():
+        if quotation_id in holds:
+            _write_holds(writer, item_id, {qid: hold for qid, hold in holds.items() if qid != quotation_id})
+
+def drop_item_holds(writer, item_id: str):
+    """Deletes every hold on an item, e.g. when the item itself is deleted."""
+    writer.delete(stock_reservations_collection.document(item_id))
+
+# --- EXPIRY SWEEPER ---
+@transactional
+def sweep_batch_transaction(transaction, item_ids: list):
+    """Drops expired holds from the given reservation documents. Returns how many were dropped."""
+    refs = [stock_reservations_collection.document(item_id) for item_id in item_ids]
+    now = datetime.now().isoformat()
+    released = 0
+    for snapshot in db.get_all(refs, transaction=transaction):
+        if not snapshot.exists:
+            continue
+        holds = snapshot.to_dict().get("holds", {})
+        active = _active(holds, now)
+        released += len(holds) - len(active)
+        _write_holds(transaction, snapshot.id, active)
+    return released
+
+def sweep_expired(batch_size: int = config.RESERVATION_SWEEP_BATCH_SIZE) -> int:
+    """
+    Releases expired holds, `batch_size` reservation documents per transaction,
+    until none are due. Returns the number of holds released.
+    """
+    released = 0
+    while True:
+        due = (
+            stock_reservations_collection
+            .where(filter=FieldFilter("nextExpiry", "<=", datetime.now().isoformat()))
+            .limit(batch_size)
+            .get()
+        )
+        item_ids = [snapshot.id for snapshot in due]
+        if item_ids:
+            released += sweep_batch_transaction(db.transaction(), item_ids)
+        if len(item_ids) < batch_size:
+            return released
+
+# Started at app startup; runs sweep_expired every RESERVATION_SWEEP_INTERVAL_SECONDS
+sweeper = PeriodicTask(sweep_expired, config.RESERVATION_SWEEP_INTERVAL_SECONDS, "reservation-sweeper")
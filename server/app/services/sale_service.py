@@ -1,42 +1,71 @@
 # app/services/sale_service.py
 from datetime import datetime
-from firebase_admin import firestore
-from app.db.firebase_config import db, inventory_collection, sales_collection, credit_collection, expenses_collection
-from app.schemas.sale import SaleCreate, SaleUpdate
+from typing import List, Optional
+from app.db.batching import MAX_WRITES_PER_CHUNK
+from app.db.pagination import paginate_query
+from app.db.firebase_config import db, sales_collection, credit_collection, expenses_collection, quotations_collection, mark_phase, transactional
+from app.schemas.sale import SaleCreate, SaleItem, SaleUpdate
 from app.schemas.credit import CreditRecordCreate
+from app.schemas.quotation import QuotationConvert
+from app.services import credit_service, customer_service, idempotency_service, inventory_service, reservation_service, search_service, stats_service
 from google.cloud.firestore_v1.base_query import FieldFilter
 
-@firestore.transactional
-def process_sale_transaction(transaction, sale_data: SaleCreate):
-    """
-    Processes a sale of multiple items within a transaction to ensure atomicity.
-    """
-    item_refs_and_data = []
-    
-    # --- 1. READ PHASE ---
+DEFAULT_IMPORT_CHUNK_SIZE = 100
+
+def _read_items(transaction, item_ids: List[str]) -> dict:
+    """Batched transactional read of inventory items. Returns {itemId: data} for items that exist."""
+    snapshots = inventory_service.get_item_snapshots(item_ids, transaction=transaction)
+    return {
+        item_id: snapshot.to_dict()
+        for item_id, snapshot in snapshots.items()
+        if snapshot is not None and snapshot.exists
+    }
+
+def _merge_quantities(sale_data: SaleCreate) -> dict:
+    """Merges duplicate lines so stock is checked and decremented once per item."""
+    quantities_by_id = {}
     for item_sold in sale_data.items:
-        item_ref = inventory_collection.document(item_sold.itemId)
-        item_snapshot = item_ref.get(transaction=transaction)
-        
-        if not item_snapshot.exists:
+        quantities_by_id[item_sold.itemId] = quantities_by_id.get(item_sold.itemId, 0) + item_sold.quantitySold
+    return quantities_by_id
+
+def _check_items(sale_data: SaleCreate, item_data_by_id: dict):
+    for item_sold in sale_data.items:
+        if item_sold.itemId not in item_data_by_id:
             raise ValueError(f"Inventory item with ID {item_sold.itemId} not found.")
-        
-        item_data = item_snapshot.to_dict()
-        item_refs_and_data.append((item_ref, item_data, item_sold))
 
-    # --- 2. VALIDATION PHASE ---
-    for _, item_data, item_sold in item_refs_and_data:
-        if item_data['quantity'] < item_sold.quantitySold:
-            raise ValueError(f"Insufficient stock for {item_data['itemName']}. Available: {item_data['quantity']}, Requested: {item_sold.quantitySold}.")
+def _check_stock(sale_data: SaleCreate, item_data_by_id: dict, stock_by_id: dict) -> dict:
+    """
+    Validates a sale against the available stock in `stock_by_id`.
+    Returns the merged quantities to decrement; raises ValueError if the sale can't be made.
+    """
+    _check_items(sale_data, item_data_by_id)
 
-    # --- 3. WRITE PHASE ---
+    quantities_by_id = _merge_quantities(sale_data)
+    for item_id, quantity_requested in quantities_by_id.items():
+        available = stock_by_id[item_id]
+        if available < quantity_requested:
+            item_name = item_data_by_id[item_id]['itemName']
+            raise ValueError(f"Insufficient stock for {item_name}. Available: {available}, Requested: {quantity_requested}.")
+    return quantities_by_id
+
+def _estimated_writes(sale_data: SaleCreate) -> int:
+    """Upper bound on the writes a sale adds to a commit, excluding inventory updates."""
+    writes = 4  # sale, daily stats, customer ledger, credit record
+    if sale_data.old_item_exchange:
+        writes += 2
+    writes += 2 * len(sale_data.borrowed_items or [])
+    return writes
+
+def _write_sale(transaction, sale_data: SaleCreate, item_data_by_id: dict, date: Optional[str] = None, idempotency_id: Optional[str] = None):
+    """
+    Writes a validated sale with its expenses, stats and credit record.
+    Inventory quantities are left to the caller.
+    """
     total_sale_amount = 0.0
     processed_items = []
-    
-    for item_ref, item_data, item_sold in item_refs_and_data:
-        new_quantity = item_data['quantity'] - item_sold.quantitySold
-        transaction.update(item_ref, {'quantity': new_quantity})
 
+    for item_sold in sale_data.items:
+        item_data = item_data_by_id[item_sold.itemId]
         price_per_item = item_sold.sellingPrice if item_sold.sellingPrice is not None else item_data['sellingPrice']
         item_total_amount = price_per_item * item_sold.quantitySold
         total_sale_amount += item_total_amount
@@ -50,7 +79,7 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
             "totalAmount": item_total_amount
         })
 
-    # --- 4. HANDLE OLD ITEM EXCHANGE ---
+    # --- HANDLE OLD ITEM EXCHANGE ---
     old_item_deduction = 0.0
     if sale_data.old_item_exchange:
         old_item_deduction = sale_data.old_item_exchange.deduction_amount
@@ -62,11 +91,12 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
             "description": f"Old Item Received: {sale_data.old_item_exchange.description}",
             "amount": -old_item_deduction,
             "category": "Old Item Exchange",
-            "date": datetime.now().isoformat()
+            "date": date or datetime.now().isoformat()
         }
         transaction.set(expense_ref, expense_data)
+        stats_service.record_expense(transaction, expense_data)
 
-    # --- 5. HANDLE BORROWED ITEMS ---
+    # --- HANDLE BORROWED ITEMS ---
     borrowed_items_profit = 0.0
     if sale_data.borrowed_items:
         for borrowed in sale_data.borrowed_items:
@@ -80,11 +110,12 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
                 "description": f"Borrowed Item Cost: {borrowed.description}",
                 "amount": borrowed.borrowed_cost * borrowed.quantity,
                 "category": "Borrowed Item",
-                "date": datetime.now().isoformat()
+                "date": date or datetime.now().isoformat()
             }
             transaction.set(expense_ref, expense_data)
+            stats_service.record_expense(transaction, expense_data)
 
-    # --- 6. PAYMENT & CREDIT LOGIC ---
+    # --- PAYMENT & CREDIT LOGIC ---
     amount_paid = sale_data.amountPaid if sale_data.amountPaid is not None else total_sale_amount
     balance = total_sale_amount - amount_paid
     
@@ -105,7 +136,8 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
         "amountPaid": amount_paid,
         "balance": balance,
         "creditStatus": credit_status,
-        "date": datetime.now().isoformat()
+        "date": date or datetime.now().isoformat(),
+        "updatedAt": datetime.now().isoformat(),  # For the search index refresh; `date` may be back-dated
     }
     
     if sale_data.installment_info:
@@ -118,10 +150,15 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
     if sale_data.borrowed_items:
         sale_record["borrowed_items"] = [b.model_dump() for b in sale_data.borrowed_items]
         sale_record["borrowed_items_profit"] = borrowed_items_profit
+
+    if idempotency_id:
+        sale_record["idempotencyId"] = idempotency_id
     
     transaction.set(sale_ref, sale_record)
+    stats_service.record_sale(transaction, sale_record)
+    customer_service.record_sale(transaction, sale_record, sale_ref.id)
 
-    # --- 7. CREATE CREDIT RECORD IF THERE'S A BALANCE ---
+    # --- CREATE CREDIT RECORD IF THERE'S A BALANCE ---
     if balance > 0:
         credit_record = CreditRecordCreate(
             saleId=sale_ref.id,
@@ -133,16 +170,242 @@ def process_sale_transaction(transaction, sale_data: SaleCreate):
         )
         credit_ref = credit_collection.document(sale_ref.id)
         credit_data = credit_record.model_dump()
-        credit_data["date"] = datetime.now().isoformat()
+        credit_data["date"] = date or datetime.now().isoformat()
+        credit_data["status"] = "Active"
+        credit_data["nextDueDate"] = credit_service.next_due_date(
+            sale_record.get("installment_info"), total_sale_amount, amount_paid
+        )
         transaction.set(credit_ref, credit_data)
 
     return {"id": sale_ref.id, **sale_record}
 
+@transactional
+def process_sale_transaction(transaction, sale_data: SaleCreate, idempotency_key: Optional[str] = None):
+    """
+    Processes a sale of multiple items within a transaction to ensure atomicity.
+    With an idempotency key, a sale already made under that key is returned instead.
+    """
+    if idempotency_key:
+        previous_sale = idempotency_service.read(transaction, "sales", idempotency_key, sale_data)
+        if previous_sale is not None:
+            return previous_sale
+
+    # --- 1. READ PHASE (one batched read for every referenced item, then any stock shards) ---
+    item_data_by_id = _read_items(transaction, [item_sold.itemId for item_sold in sale_data.items])
+    _check_items(sale_data, item_data_by_id)
+    stock_by_id, stock_reads = inventory_service.read_stock(transaction, item_data_by_id, _merge_quantities(sale_data))
+
+    # --- 2. VALIDATION PHASE ---
+    mark_phase("validate")
+    quantities_by_id = _check_stock(sale_data, item_data_by_id, stock_by_id)
+
+    # --- 3. WRITE PHASE ---
+    mark_phase("write")
+    inventory_service.write_stock_decrements(transaction, quantities_by_id, stock_reads, item_data_by_id)
+
+    idempotency_id = idempotency_service.key_id("sales", idempotency_key) if idempotency_key else None
+    new_sale = _write_sale(transaction, sale_data, item_data_by_id, idempotency_id=idempotency_id)
+    if idempotency_key:
+        idempotency_service.record(transaction, "sales", idempotency_key, sale_data, new_sale)
+    return new_sale
+
+@transactional
+def import_chunk_transaction(transaction, records: list):
+    """
+    Imports a chunk of sales in one transaction.
+
+    Every referenced item is read once, each record is checked against the stock
+    left by the records before it, and each item's quantity is written once with
+    the aggregated decrement. A record that fails validation is skipped without
+    affecting the rest of the chunk. Returns (index, sale or None, error or None)
+    tuples; `records` is a list of (index, SaleImport) pairs.
+    """
+    # --- 1. READ PHASE ---
+    item_ids = list({item_sold.itemId for _, record in records for item_sold in record.items})
+    item_data_by_id = _read_items(transaction, item_ids)
+
+    requested_by_id = {}
+    for _, record in records:
+        for item_id, quantity in _merge_quantities(record).items():
+            requested_by_id[item_id] = requested_by_id.get(item_id, 0) + quantity
+    available_by_id, stock_reads = inventory_service.read_stock(transaction, item_data_by_id, requested_by_id)
+    stock_by_id = dict(available_by_id)
+
+    # --- 2. VALIDATION PHASE (in submission order, against the running stock) ---
+    mark_phase("validate")
+    accepted = []
+    results = {}
+    for index, record in records:
+        try:
+            quantities_by_id = _check_stock(record, item_data_by_id, stock_by_id)
+        except ValueError as e:
+            results[index] = (index, None, str(e))
+            continue
+        for item_id, quantity_requested in quantities_by_id.items():
+            stock_by_id[item_id] -= quantity_requested
+        accepted.append((index, record))
+
+    # --- 3. WRITE PHASE (one inventory write per item) ---
+    mark_phase("write")
+    taken_by_id = {item_id: available_by_id[item_id] - stock_by_id[item_id] for item_id in item_data_by_id}
+    inventory_service.write_stock_decrements(transaction, taken_by_id, stock_reads, item_data_by_id)
+
+    for index, record in accepted:
+        results[index] = (index, _write_sale(transaction, record, item_data_by_id, date=record.date.isoformat() if record.date else None), None)
+
+    return [results[index] for index, _ in records]
+
+def _chunk_records(sales: list, chunk_size: int, shards_by_id: dict) -> list:
+    """
+    Splits (index, sale) pairs into chunks that fit in one commit.
+
+    A chunk closes when it reaches `chunk_size` records or its writes would exceed
+    MAX_WRITES_PER_CHUNK: each sale's own writes, plus each distinct item's stock
+    writes (the item and its low-stock entry, or up to every stock shard of a
+    sharded item; `shards_by_id` comes from inventory_service.shard_counts).
+    Records stay in submission order so earlier sales claim stock first.
+    """
+    def stock_writes(item_ids: set) -> int:
+        return sum(inventory_service.stock_decrement_writes(shards_by_id.get(item_id, 0)) for item_id in item_ids)
+
+    chunks = []
+    chunk, chunk_items, chunk_writes = [], set(), 0
+    for index, sale in enumerate(sales):
+        sale_items = {item_sold.itemId for item_sold in sale.items}
+        writes = _estimated_writes(sale) + stock_writes(sale_items - chunk_items)
+        if chunk and (len(chunk) >= chunk_size or chunk_writes + writes > MAX_WRITES_PER_CHUNK):
+            chunks.append(chunk)
+            chunk, chunk_items, chunk_writes = [], set(), 0
+            writes = _estimated_writes(sale) + stock_writes(sale_items)
+        chunk.append((index, sale))
+        chunk_items |= sale_items
+        chunk_writes += writes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def import_sales(sales: list, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE):
+    """
+    Imports many sales (e.g. re-keyed offline sales), committing them in chunked
+    transactions. Returns a result per record, in submission order.
+    """
+    results = []
+    shards_by_id = inventory_service.shard_counts(list({item_sold.itemId for sale in sales for item_sold in sale.items}))
+    for chunk in _chunk_records(sales, chunk_size, shards_by_id):
+        transaction = db.transaction()
+        try:
+            chunk_results = import_chunk_transaction(transaction, chunk)
+        except Exception as e:
+            # The whole chunk was rolled back (e.g. retries exhausted under contention)
+            chunk_results = [(index, None, f"Chunk failed: {e}") for index, _ in chunk]
+
+        sold_item_ids = set()
+        for index, sale, error in chunk_results:
+            if sale:
+                sold_item_ids.update(item["itemId"] for item in sale["items"])
+                search_service.index_sale(sale)
+                results.append({"index": index, "status": "created", "sale": sale})
+            else:
+                results.append({"index": index, "status": "failed", "error": error})
+        inventory_service.invalidate_cache(list(sold_item_ids))
+
+    return {
+        "imported": sum(1 for result in results if result["status"] == "created"),
+        "failed": sum(1 for result in results if result["status"] == "failed"),
+        "results": results,
+    }
+
+
+def create_sale(sale_data: SaleCreate, idempotency_key: Optional[str] = None):
+    """
+    Public function to initiate the sale transaction.
+    Retries that reuse an idempotency key get the original sale back without selling again.
+    """
+    if idempotency_key:
+        cached_sale = idempotency_service.get_cached("sales", idempotency_key, sale_data)
+        if cached_sale is not None:
+            return cached_sale
 
-def create_sale(sale_data: SaleCreate):
-    """Public function to initiate the sale transaction."""
     transaction = db.transaction()
-    return process_sale_transaction(transaction, sale_data)
+    new_sale = process_sale_transaction(transaction, sale_data, idempotency_key)
+    inventory_service.invalidate_cache([item["itemId"] for item in new_sale["items"]])
+    search_service.index_sale(new_sale)
+    if idempotency_key:
+        idempotency_service.remember("sales", idempotency_key, sale_data, new_sale)
+    return new_sale
+
+def _sale_from_quotation(quotation_record: dict, conversion: QuotationConvert) -> SaleCreate:
+    """Builds the sale for a stored quotation, keeping the quoted prices."""
+    phone_number = conversion.phoneNumber or quotation_record.get("phoneNumber")
+    if not phone_number:
+        raise ValueError("A phone number is required to convert this quotation.")
+    return SaleCreate(
+        customerName=quotation_record["customerName"],
+        phoneNumber=phone_number,
+        paymentMethod=conversion.paymentMethod,
+        items=[
+            SaleItem(itemId=item["itemId"], quantitySold=item["quantityRequested"], sellingPrice=item["pricePerItem"])
+            for item in quotation_record.get("items", [])
+        ],
+        amountPaid=conversion.amountPaid,
+        installment_info=quotation_record.get("installment_info"),
+        old_item_exchange=quotation_record.get("old_item_exchange"),
+        borrowed_items=quotation_record.get("borrowed_items"),
+    )
+
+@transactional
+def convert_quotation_transaction(transaction, quotation_id: str, conversion: QuotationConvert):
+    """
+    Turns a stored quotation into a sale within a transaction, at the quoted prices.
+    The quotation's own stock hold counts towards the stock available to it and is released.
+    """
+    # --- 1. READ PHASE (the quotation, then its items and their holds in batched reads) ---
+    quotation_ref = quotations_collection.document(quotation_id)
+    quotation_snapshot = quotation_ref.get(transaction=transaction)
+    if not quotation_snapshot.exists:
+        raise LookupError("Quotation not found")
+
+    quotation_record = quotation_snapshot.to_dict()
+    if quotation_record.get("status") == "converted":
+        raise ValueError(f"Quotation already converted to sale {quotation_record.get('saleId')}.")
+    sale_data = _sale_from_quotation(quotation_record, conversion)
+
+    quantities_by_id = _merge_quantities(sale_data)
+    item_data_by_id = _read_items(transaction, list(quantities_by_id))
+    _check_items(sale_data, item_data_by_id)
+    holds_by_id = reservation_service.read_holds(list(quantities_by_id), transaction=transaction)
+    stock_by_id, stock_reads = inventory_service.read_stock(
+        transaction, item_data_by_id, quantities_by_id,
+        reservation_service.held_quantities(holds_by_id, exclude_quotation=quotation_id),
+    )
+
+    # --- 2. VALIDATION PHASE ---
+    mark_phase("validate")
+    _check_stock(sale_data, item_data_by_id, stock_by_id)
+
+    # --- 3. WRITE PHASE ---
+    mark_phase("write")
+    inventory_service.write_stock_decrements(transaction, quantities_by_id, stock_reads, item_data_by_id)
+    reservation_service.release_holds(transaction, quotation_id, holds_by_id)
+    new_sale = _write_sale(transaction, sale_data, item_data_by_id)
+    transaction.update(quotation_ref, {
+        "status": "converted",
+        "saleId": new_sale["id"],
+        "convertedAt": new_sale["date"],
+        "holdExpiresAt": None,
+    })
+    return new_sale
+
+def convert_quotation(quotation_id: str, conversion: QuotationConvert):
+    """Public function to convert a quotation into a sale. Returns None if the quotation doesn't exist."""
+    transaction = db.transaction()
+    try:
+        new_sale = convert_quotation_transaction(transaction, quotation_id, conversion)
+    except LookupError:
+        return None
+    inventory_service.invalidate_cache([item["itemId"] for item in new_sale["items"]])
+    search_service.index_sale(new_sale)
+    return new_sale
 
 def get_sale(sale_id: str):
     """Retrieves a single sale by its ID."""
@@ -151,13 +414,13 @@ def get_sale(sale_id: str):
         return {"id": doc.id, **doc.to_dict()}
     return None
 
-def get_all_sales():
-    """Retrieves all sales."""
-    sales = []
-    docs = sales_collection.stream()
-    for doc in docs:
-        sales.append({"id": doc.id, **doc.to_dict()})
-    return sales
+def get_all_sales(limit: Optional[int] = None, start_after: Optional[str] = None, fields: Optional[List[str]] = None):
+    """Retrieves a page of sales, newest first. Returns (sales, next_cursor)."""
+    docs, next_cursor = paginate_query(
+        sales_collection, limit=limit, start_after=start_after, fields=fields
+    )
+    sales = [{"id": doc.id, **doc.to_dict()} for doc in docs]
+    return sales, next_cursor
 
 def get_sales_by_date(date: str):
     """Retrieves all sales for a specific date and calculates the total."""
@@ -180,18 +443,44 @@ def get_sales_by_date(date: str):
         
     return {"sales": sales, "total_sales": total}
 
+@transactional
+def update_sale_transaction(transaction, sale_id: str, update_data: dict):
+    """Updates a sale and keeps the day's payment-method breakdown and the customer ledgers in step."""
+    sale_ref = sales_collection.document(sale_id)
+    sale_snapshot = sale_ref.get(transaction=transaction)
+
+    if not sale_snapshot.exists:
+        raise ValueError("Sale not found.")
+
+    sale_data = sale_snapshot.to_dict()
+    transaction.update(sale_ref, {**update_data, "updatedAt": datetime.now().isoformat()})
+
+    new_method = update_data.get("paymentMethod")
+    if new_method is not None and new_method != sale_data.get("paymentMethod"):
+        stats_service.record_payment_method_change(transaction, sale_data, new_method)
+
+    new_phone = update_data.get("phoneNumber")
+    if new_phone is not None and customer_service.normalize_phone(new_phone) != customer_service.normalize_phone(sale_data.get("phoneNumber")):
+        # The sale moves to another customer's ledger
+        customer_service.record_sale(transaction, sale_data, sale_id, sign=-1)
+        customer_service.record_sale(transaction, {**sale_data, **update_data}, sale_id)
+
 def update_sale(sale_id: str, sale_update: SaleUpdate):
     """Updates a sale's customer-related information."""
-    sale_ref = sales_collection.document(sale_id)
     update_data = sale_update.model_dump(exclude_unset=True)
     
     if not update_data:
         return None
 
-    sale_ref.update(update_data)
+    transaction = db.transaction()
+    try:
+        update_sale_transaction(transaction, sale_id, update_data)
+    except ValueError:
+        return None
+    search_service.update_sale(sale_id, update_data)
     return {"id": sale_id, **update_data}
 
-@firestore.transactional
+@transactional
 def delete_sale_transaction(transaction, sale_id: str):
     """Deletes a sale and restores all sold item quantities to the inventory."""
     sale_ref = sales_collection.document(sale_id)
@@ -203,35 +492,48 @@ def delete_sale_transaction(transaction, sale_id: str):
     sale_data = sale_snapshot.to_dict()
     items_in_sale = sale_data.get("items", [])
     
-    item_refs_and_quantities = []
-
-    # --- 1. READ PHASE ---
+    # Merge duplicate lines so each item is restored with a single write
+    quantities_by_id = {}
     for item_sold in items_in_sale:
         item_id = item_sold.get("itemId")
         if item_id:
-            item_ref = inventory_collection.document(item_id)
-            item_snapshot = item_ref.get(transaction=transaction)
-            if item_snapshot.exists:
-                item_refs_and_quantities.append((item_ref, item_snapshot.to_dict(), item_sold.get("quantitySold", 0)))
+            quantities_by_id[item_id] = quantities_by_id.get(item_id, 0) + item_sold.get("quantitySold", 0)
+
+    # --- 1. READ PHASE (one batched read for every referenced item) ---
+    snapshots = inventory_service.get_item_snapshots(list(quantities_by_id), transaction=transaction)
 
     # --- 2. WRITE PHASE ---
-    for item_ref, item_data, quantity_sold in item_refs_and_quantities:
-        current_quantity = item_data.get('quantity', 0)
-        new_quantity = current_quantity + quantity_sold
-        transaction.update(item_ref, {'quantity': new_quantity})
+    mark_phase("write")
+    for item_id, quantity_sold in quantities_by_id.items():
+        item_snapshot = snapshots.get(item_id)
+        if item_snapshot is None or not item_snapshot.exists:
+            continue
+        inventory_service.restore_stock(transaction, item_id, item_snapshot.to_dict(), quantity_sold)
 
     transaction.delete(sale_ref)
+    stats_service.record_sale(transaction, sale_data, sign=-1)
+    customer_service.record_sale(transaction, sale_data, sale_id, sign=-1)
     
     # --- 3. DELETE CREDIT RECORD ---
     credit_ref = credit_collection.document(sale_id)
     transaction.delete(credit_ref)
 
+    # --- 4. REVOKE THE IDEMPOTENCY KEY, so a retry doesn't replay the deleted sale ---
+    if sale_data.get("idempotencyId"):
+        idempotency_service.revoke(transaction, sale_data["idempotencyId"], "sales")
+
+    return list(quantities_by_id), sale_data.get("idempotencyId")
+
 
 def delete_sale(sale_id: str):
     """Public function to initiate the sale deletion transaction."""
     transaction = db.transaction()
     try:
-        delete_sale_transaction(transaction, sale_id)
+        restored_item_ids, idempotency_id = delete_sale_transaction(transaction, sale_id)
+        inventory_service.invalidate_cache(restored_item_ids)
+        search_service.remove_sale(sale_id)
+        if idempotency_id:
+            idempotency_service.forget(idempotency_id)
         return {"status": "success", "message": f"Sale {sale_id} deleted and inventory restored."}
     except ValueError:
         return None
\ No newline at end of file
@@ -0,0 +1,191 @@
+# app/services/search_service.py
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from firebase_admin import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.core.concurrency import PeriodicTask
+from app.core.search_index import PrefixIndex, tokenize
+from app.db.firebase_config import inventory_collection, sales_collection
+
+logger = logging.getLogger(__name__)
+
+# Per-process indexes over inventory (itemName, modelNumber) and recent sales
+# (customerName, phoneNumber). Service functions update them after each write in this
+# process. Every SEARCH_INDEX_REFRESH_SECONDS a refresh reads only the sales whose
+# `updatedAt` is newer than the last refresh (created, imported or edited by other worker
+# processes) and re-indexes the catalogue from the inventory mirror when it is running.
+# Every SEARCH_INDEX_REBUILD_SECONDS a full rebuild also drops sales deleted elsewhere,
+# items changed elsewhere without the mirror, and sales that aged out of the window.
+# Only sales from the last SEARCH_SALES_DAYS days are indexed, the newest SEARCH_SALES_MAX
+# at most, so the rebuild and the memory it holds stay bounded.
+inventory_index = PrefixIndex()
+sales_index = PrefixIndex()
+
+_ready = threading.Event()
+_state_lock = threading.Lock()
+_latest_sale_date = ""
+_refreshed_at: Optional[datetime] = None  # Sales updated before this are indexed
+_inventory_mirror = None
+
+# A sale stamped just before a refresh may commit just after it; re-reading this much is harmless
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+INVENTORY_FIELDS = ["itemName", "modelNumber", "sellingPrice"]
+SALE_FIELDS = ["customerName", "phoneNumber", "date", "totalAmount"]
+
+def _item_entry(item: dict) -> tuple:
+    summary = {"id": item["id"], **{field: item.get(field) for field in INVENTORY_FIELDS}}
+    return item["id"], tokenize(item.get("itemName"), item.get("modelNumber")), summary
+
+def _sale_entry(sale: dict) -> tuple:
+    summary = {"id": sale["id"], **{field: sale.get(field) for field in SALE_FIELDS}}
+    return sale["id"], tokenize(sale.get("customerName"), sale.get("phoneNumber")), summary
+
+def _sales_since() -> str:
+    return (datetime.now() - timedelta(days=config.SEARCH_SALES_DAYS)).date().isoformat()
+
+def _note_sale_date(date: Optional[str]):
+    global _latest_sale_date
+    with _state_lock:
+        if date and date > _latest_sale_date:
+            _latest_sale_date = date
+
+# --- Updates from service functions ---
+def index_item(item: dict):
+    inventory_index.add(*_item_entry(item))
+
+def remove_item(item_id: str):
+    inventory_index.remove(item_id)
+
+def index_sale(sale: dict):
+    if (sale.get("date") or "") < _sales_since():
+        return  # Back-dated past the indexed window
+    sales_index.add(*_sale_entry(sale))
+    _note_sale_date(sale.get("date"))
+
+def update_sale(sale_id: str, update_data: dict):
+    """Re-indexes a sale after an update that may have changed its customer details."""
+    summary = sales_index.get(sale_id)
+    if summary is not None:
+        index_sale({**summary, **update_data})
+
+def remove_sale(sale_id: str):
+    sales_index.remove(sale_id)
+
+# --- Building ---
+def _mark_refreshed(started: datetime):
+    global _refreshed_at
+    with _state_lock:
+        if _refreshed_at is None or started > _refreshed_at:
+            _refreshed_at = started
+
+def _reindex_inventory() -> bool:
+    """Replaces the inventory index from the mirror, without reads. False if the mirror isn't ready."""
+    if _inventory_mirror is None or not _inventory_mirror.is_ready:
+        return False
+    inventory_index.begin_rebuild()
+    inventory_index.replace_all(_item_entry(item) for item in _inventory_mirror.list_documents())
+    return True
+
+def build():
+    """
+    Reads the searchable fields of every item and of the sales in the indexed
+    window, and replaces the indexes. Changes indexed while it reads are kept.
+    """
+    global _latest_sale_date
+    started = datetime.now()
+    if not _reindex_inventory():
+        inventory_index.begin_rebuild()
+        items = inventory_collection.select(INVENTORY_FIELDS).stream()
+        inventory_index.replace_all(_item_entry({"id": doc.id, **doc.to_dict()}) for doc in items)
+
+    sales_index.begin_rebuild()
+
+    recent_sales = (
+        sales_collection
+        .where(filter=FieldFilter("date", ">=", _sales_since()))
+        .order_by("date", direction=firestore.Query.DESCENDING)
+        .limit(config.SEARCH_SALES_MAX)
+        .select(SALE_FIELDS)
+        .stream()
+    )
+    sales = [{"id": doc.id, **doc.to_dict()} for doc in recent_sales]
+    sales_index.replace_all(_sale_entry(sale) for sale in sales)
+    with _state_lock:
+        _latest_sale_date = max(_latest_sale_date, (sales[0].get("date") or "") if sales else "")
+    _mark_refreshed(started)
+    _ready.set()
+
+def refresh():
+    """Indexes sales updated since the last refresh, and re-indexes the catalogue from the mirror."""
+    with _state_lock:
+        since = _refreshed_at
+    started = datetime.now()
+    _reindex_inventory()
+
+    changed_sales = (
+        sales_collection
+        .where(filter=FieldFilter("updatedAt", ">=", (since - REFRESH_OVERLAP).isoformat()))
+        .select(SALE_FIELDS)
+        .stream()
+    )
+    for doc in changed_sales:
+        index_sale({"id": doc.id, **doc.to_dict()})
+    _mark_refreshed(started)
+
+refresher = PeriodicTask(refresh, config.SEARCH_INDEX_REFRESH_SECONDS, "search-index-refresh")
+rebuilder = PeriodicTask(build, config.SEARCH_INDEX_REBUILD_SECONDS, "search-index-rebuild")
+
+def _build_and_refresh():
+    try:
+        build()
+    except Exception:
+        logger.exception("Building the search index failed")
+        return
+    refresher.start()
+    rebuilder.start()
+
+def start(inventory_mirror=None):
+    """
+    Builds the indexes on a background thread, then refreshes and rebuilds them
+    periodically. With an inventory mirror, the catalogue is indexed from it.
+    """
+    global _inventory_mirror
+    _inventory_mirror = inventory_mirror
+    threading.Thread(target=_build_and_refresh, name="search-index-build", daemon=True).start()
+
+def stop():
+    refresher.stop()
+    rebuilder.stop()
+
+# --- Queries ---
+def search(query: str, scope: str = "all", limit: int = 20) -> dict:
+    """
+    Finds items whose name or model number, and sales whose customer name or
+    phone number, contain a word starting with each term of `query`.
+    Items are ordered by name, sales newest first.
+    """
+    if not _ready.is_set():
+        raise RuntimeError("The search index is still being built; try again shortly.")
+
+    result = {}
+    if scope in ("all", "inventory"):
+        items = inventory_index.search(query)
+        result["inventory"] = sorted(items, key=lambda item: ((item.get("itemName") or "").lower(), item["id"]))[:limit]
+    if scope in ("all", "sales"):
+        sales = sales_index.search(query)
+        result["sales"] = sorted(sales, key=lambda sale: sale.get("date") or "", reverse=True)[:limit]
+    return result
+
+def get_status() -> dict:
+    return {
+        "ready": _ready.is_set(),
+        "inventoryDocuments": len(inventory_index),
+        "salesDocuments": len(sales_index),
+        "salesSince": _sales_since(),
+        "latestSaleDate": _latest_sale_date or None,
+        "refreshedAt": _refreshed_at.isoformat() if _refreshed_at else None,
+    }
@@ -0,0 +1,243 @@
+# app/services/stats_service.py
+import random
+from datetime import date as date_type, timedelta
+from typing import Optional
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.db.firebase_config import db, daily_stats_collection, sales_collection, expenses_collection, meta_collection
+
+# daily_stats/{YYYY-MM-DD} is maintained alongside every sale and expense write:
+#   salesCount, itemsSold (units of inventory items sold), itemsSoldById {itemId: units},
+#   totalSales (sum of sale totalAmount), grossSales (before old item deductions),
+#   amountCollected (paid so far towards the day's sales), salesByPaymentMethod {method: total},
+#   oldItemDeductions, borrowedItemsProfit,
+#   outstandingCredit (current unpaid balance of the day's sales, kept in step by credit payments),
+#   expenseCount, totalExpenses, expensesByCategory {category: total}
+# With DAILY_STATS_SHARDS > 1 each write lands on a random shard, daily_stats/{YYYY-MM-DD}
+# or daily_stats/{YYYY-MM-DD}_{n}, so concurrent checkouts don't all write one document.
+# Every shard carries `date`; a day's totals are the sum of its shards.
+#
+# meta/daily_stats {since: YYYY-MM-DD} is the first day from which every day's rollup is
+# complete. Earlier days may still have partial rollups (a back-dated sale creates one),
+# so reports scan them instead. Startup records tomorrow if no start is recorded yet;
+# rebuilding the day before the start moves it back a day (see migrate_daily_stats.py).
+rollup_meta_ref = meta_collection.document("daily_stats")
+
+def day_key(iso_date: str) -> str:
+    """Returns the YYYY-MM-DD part of an ISO timestamp."""
+    return iso_date[:10]
+
+def _shard_refs(day: str) -> list:
+    return [
+        daily_stats_collection.document(day if shard == 0 else f"{day}_{shard}")
+        for shard in range(config.DAILY_STATS_SHARDS)
+    ]
+
+def _stats_ref(iso_date: str):
+    """A random shard of the day's stats, for a blind merge."""
+    return random.choice(_shard_refs(day_key(iso_date)))
+
+def _add_counters(total: dict, shard: dict):
+    """Adds a shard's counters (and counter maps) into `total`."""
+    for key, value in shard.items():
+        if isinstance(value, dict):
+            _add_counters(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+
+def _items_sold(sale_record: dict) -> int:
+    return sum(item.get("quantitySold", 0) for item in sale_record.get("items", []))
+
+def _items_sold_by_id(sale_record: dict) -> dict:
+    units_by_id = {}
+    for item in sale_record.get("items", []):
+        if item.get("itemId"):
+            units_by_id[item["itemId"]] = units_by_id.get(item["itemId"], 0) + item.get("quantitySold", 0)
+    return units_by_id
+
+def _sale_counters(sale_record: dict, sign: int) -> dict:
+    total = sale_record.get("totalAmount", 0.0)
+    return {
+        "salesCount": firestore.Increment(sign),
+        "itemsSold": firestore.Increment(sign * _items_sold(sale_record)),
+        "itemsSoldById": {
+            item_id: firestore.Increment(sign * units) for item_id, units in _items_sold_by_id(sale_record).items()
+        },
+        "totalSales": firestore.Increment(sign * total),
+        "grossSales": firestore.Increment(sign * (total + (sale_record.get("old_item_deduction") or 0.0))),
+        "amountCollected": firestore.Increment(sign * sale_record.get("amountPaid", 0.0)),
+        "oldItemDeductions": firestore.Increment(sign * (sale_record.get("old_item_deduction") or 0.0)),
+        "borrowedItemsProfit": firestore.Increment(sign * (sale_record.get("borrowed_items_profit") or 0.0)),
+        "outstandingCredit": firestore.Increment(sign * sale_record.get("balance", 0.0)),
+        "salesByPaymentMethod": {
+            sale_record.get("paymentMethod") or "Unknown": firestore.Increment(sign * total)
+        },
+    }
+
+def _expense_counters(expense_data: dict, sign: int) -> dict:
+    amount = expense_data.get("amount", 0.0)
+    return {
+        "expenseCount": firestore.Increment(sign),
+        "totalExpenses": firestore.Increment(sign * amount),
+        "expensesByCategory": {
+            expense_data.get("category") or "Uncategorized": firestore.Increment(sign * amount)
+        },
+    }
+
+def record_sale(writer, sale_record: dict, sign: int = 1):
+    """
+    Adds (sign=1) or removes (sign=-1) a sale from its day's totals.
+    `writer` is the transaction or batch performing the sale write.
+    """
+    stats_ref = _stats_ref(sale_record["date"])
+    writer.set(stats_ref, {"date": day_key(sale_record["date"]), **_sale_counters(sale_record, sign)}, merge=True)
+
+def record_expense(writer, expense_data: dict, sign: int = 1):
+    """
+    Adds (sign=1) or removes (sign=-1) an expense from its day's totals.
+    `writer` is the transaction or batch performing the expense write.
+    """
+    stats_ref = _stats_ref(expense_data["date"])
+    writer.set(stats_ref, {"date": day_key(expense_data["date"]), **_expense_counters(expense_data, sign)}, merge=True)
+
+def record_payment_method_change(writer, sale_record: dict, new_method: str):
+    """Moves a sale's total from its old payment method bucket to the new one."""
+    total = sale_record.get("totalAmount", 0.0)
+    stats_ref = _stats_ref(sale_record["date"])
+    writer.set(stats_ref, {
+        "date": day_key(sale_record["date"]),
+        "salesByPaymentMethod": {
+            sale_record.get("paymentMethod") or "Unknown": firestore.Increment(-total),
+            new_method or "Unknown": firestore.Increment(total),
+        }
+    }, merge=True)
+
+def record_credit_payment(writer, sale_record: dict, amount: float):
+    """
+    Moves a payment amount from outstanding credit to collected on the sale's day.
+    Pass a negative amount when a payment is reversed.
+    """
+    stats_ref = _stats_ref(sale_record["date"])
+    writer.set(stats_ref, {
+        "date": day_key(sale_record["date"]),
+        "outstandingCredit": firestore.Increment(-amount),
+        "amountCollected": firestore.Increment(amount),
+    }, merge=True)
+
+def _empty_stats(date: str) -> dict:
+    return {
+        "date": date,
+        "salesCount": 0,
+        "itemsSold": 0,
+        "itemsSoldById": {},
+        "totalSales": 0.0,
+        "grossSales": 0.0,
+        "amountCollected": 0.0,
+        "salesByPaymentMethod": {},
+        "oldItemDeductions": 0.0,
+        "borrowedItemsProfit": 0.0,
+        "outstandingCredit": 0.0,
+        "expenseCount": 0,
+        "totalExpenses": 0.0,
+        "expensesByCategory": {},
+    }
+
+def _with_net(stats: dict) -> dict:
+    stats["net"] = stats["totalSales"] - stats["totalExpenses"]
+    return stats
+
+# --- Rollup start ---
+def rollups_since() -> Optional[str]:
+    """The first day whose rollup, and every later day's, is complete; None if not recorded."""
+    snapshot = rollup_meta_ref.get()
+    return snapshot.to_dict().get("since") if snapshot.exists else None
+
+def mark_rollups_started():
+    """
+    Records tomorrow as the rollup start unless one is recorded already. Today may
+    include sales written before rollups were maintained, so it is left to a rebuild.
+    """
+    try:
+        rollup_meta_ref.create({"since": (date_type.today() + timedelta(days=1)).isoformat()})
+    except AlreadyExists:
+        pass
+
+def get_daily_stats(date: str) -> dict:
+    """Returns the precomputed totals for a day (YYYY-MM-DD), reading its shards in one batched read."""
+    stats = _empty_stats(date)
+    for snapshot in db.get_all(_shard_refs(date)):
+        if snapshot.exists:
+            _add_counters(stats, snapshot.to_dict())
+    return _with_net(stats)
+
+def units_sold_by_item(days: int) -> dict:
+    """
+    Returns {itemId: units sold} over the last `days` days including today,
+    read from the daily rollups in one batched read.
+    """
+    today = date_type.today()
+    refs = [ref for offset in range(days) for ref in _shard_refs((today - timedelta(days=offset)).isoformat())]
+    units_by_id = {}
+    for snapshot in db.get_all(refs):
+        if snapshot.exists:
+            for item_id, units in (snapshot.to_dict().get("itemsSoldById") or {}).items():
+                units_by_id[item_id] = units_by_id.get(item_id, 0) + units
+    return units_by_id
+
+def rebuild_daily_stats(date: str) -> dict:
+    """
+    Recomputes a day's totals from its sales and expenses, writes them to the day's first shard
+    and deletes the other shards.
+    Used to backfill days recorded before stats were maintained, or to repair drift.
+    Rebuilding the day before the rollup start moves the start back to that day.
+    """
+    since = rollups_since()
+    start_of_day = date + "T00:00:00"
+    end_of_day = date + "T23:59:59.999999"
+    stats = _empty_stats(date)
+
+    sales = sales_collection.where(
+        filter=FieldFilter("date", ">=", start_of_day)
+    ).where(
+        filter=FieldFilter("date", "<=", end_of_day)
+    ).stream()
+    for doc in sales:
+        sale = doc.to_dict()
+        total = sale.get("totalAmount", 0.0)
+        method = sale.get("paymentMethod") or "Unknown"
+        stats["salesCount"] += 1
+        stats["itemsSold"] += _items_sold(sale)
+        for item_id, units in _items_sold_by_id(sale).items():
+            stats["itemsSoldById"][item_id] = stats["itemsSoldById"].get(item_id, 0) + units
+        stats["totalSales"] += total
+        stats["grossSales"] += total + (sale.get("old_item_deduction") or 0.0)
+        stats["amountCollected"] += sale.get("amountPaid", 0.0)
+        stats["oldItemDeductions"] += sale.get("old_item_deduction") or 0.0
+        stats["borrowedItemsProfit"] += sale.get("borrowed_items_profit") or 0.0
+        stats["outstandingCredit"] += sale.get("balance", 0.0)
+        stats["salesByPaymentMethod"][method] = stats["salesByPaymentMethod"].get(method, 0.0) + total
+
+    expenses = expenses_collection.where(
+        filter=FieldFilter("date", ">=", start_of_day)
+    ).where(
+        filter=FieldFilter("date", "<=", end_of_day)
+    ).stream()
+    for doc in expenses:
+        expense = doc.to_dict()
+        amount = expense.get("amount", 0.0)
+        category = expense.get("category") or "Uncategorized"
+        stats["expenseCount"] += 1
+        stats["totalExpenses"] += amount
+        stats["expensesByCategory"][category] = stats["expensesByCategory"].get(category, 0.0) + amount
+
+    batch = db.batch()
+    batch.set(daily_stats_collection.document(date), stats)
+    for shard in daily_stats_collection.where(filter=FieldFilter("date", "==", date)).stream():
+        if shard.id != date:
+            batch.delete(shard.reference)
+    if since and date == (date_type.fromisoformat(since) - timedelta(days=1)).isoformat():
+        batch.set(rollup_meta_ref, {"since": date}, merge=True)
+    batch.commit()
+    return _with_net(stats)
@@ -0,0 +1,76 @@
+# app/services/stock_alert_service.py
+import logging
+from typing import List
+from google.cloud.firestore_v1.base_query import FieldFilter
+from app.core import config
+from app.core.concurrency import PeriodicTask
+from app.db.batching import MAX_WRITES_PER_COMMIT
+from app.db.firebase_config import db, inventory_collection
+from app.services import inventory_service, stats_service
+
+logger = logging.getLogger(__name__)
+
+def refresh_sharded_items() -> int:
+    """
+    Re-evaluates the low-stock entries of sharded items from their shard totals.
+    Their sales only read enough shards to cover the sale, so the entries are
+    refreshed here instead. Returns the number of items checked.
+    """
+    docs = (
+        inventory_collection
+        .where(filter=FieldFilter("stockShards", ">", 1))
+        .select(["itemName", "modelNumber", "reorderLevel", "stockShards"])
+        .stream()
+    )
+    items = [(doc.id, doc.to_dict()) for doc in docs]
+    for start in range(0, len(items), MAX_WRITES_PER_COMMIT):
+        batch = db.batch()
+        for item_id, item_data in items[start:start + MAX_WRITES_PER_COMMIT]:
+            quantity = inventory_service.stock_counter(item_id, item_data).total(db)
+            inventory_service.record_stock_level(batch, item_id, item_data, quantity)
+        batch.commit()
+    return len(items)
+
+def _days_left_key(alert: dict):
+    days_left = alert["daysOfStockLeft"]
+    return (alert["quantity"] > 0, float("inf") if days_left is None else days_left, alert["quantity"])
+
+def get_low_stock(days: int = config.STOCK_VELOCITY_DAYS) -> List[dict]:
+    """
+    Returns the items at or below their reorder level, from the low-stock index,
+    with their sales velocity over the last `days` days (from the daily rollups).
+    Out-of-stock items come first, then those that will run out soonest.
+    """
+    alerts = inventory_service.get_low_stock_entries()
+    units_by_id = stats_service.units_sold_by_item(days) if alerts else {}
+    for alert in alerts:
+        units = units_by_id.get(alert["id"], 0)
+        velocity = units / days
+        alert["unitsSold"] = units
+        alert["dailyVelocity"] = round(velocity, 2)
+        alert["daysOfStockLeft"] = round(alert["quantity"] / velocity, 1) if velocity else None
+        alert["isCritical"] = alert["quantity"] <= config.CRITICAL_STOCK_THRESHOLD
+    return sorted(alerts, key=_days_left_key)
+
+# --- MONITOR ---
+_alerted_ids = set()
+
+def check_stock() -> List[dict]:
+    """
+    Refreshes sharded items' entries and logs a warning for each item that has
+    fallen to its reorder level since the previous check.
+    """
+    global _alerted_ids
+    refresh_sharded_items()
+    alerts = get_low_stock()
+    for alert in alerts:
+        if alert["id"] not in _alerted_ids:
+            logger.warning(
+                "Low stock: %s (%s) has %d left, reorder level %d, selling %.2f a day",
+                alert["itemName"], alert["modelNumber"], alert["quantity"], alert["reorderLevel"], alert["dailyVelocity"],
+            )
+    _alerted_ids = {alert["id"] for alert in alerts}
+    return alerts
+
+# Started at app startup; runs check_stock every STOCK_ALERT_INTERVAL_SECONDS
+monitor = PeriodicTask(check_stock, config.STOCK_ALERT_INTERVAL_SECONDS, "stock-alert-monitor")
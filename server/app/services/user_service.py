@@ -1,21 +1,34 @@
 # app/services/user_service.py
 from datetime import datetime
 from typing import Optional
-from app.db.firebase_config import db
+from app.db.firebase_config import db, users_collection, usernames_collection, transactional
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from starlette.concurrency import run_in_threadpool
+from app.core.security import get_password_hash, verify_and_update_password, mark_user_inactive, password_pool
 
-users_collection = db.collection('users')
+def normalize_username(username: str) -> str:
+    """The key used for usernames/{key}: usernames are unique case-insensitively."""
+    return username.strip().lower()
 
-def create_user(user_data: UserCreate):
-    """Create a new user with hashed password."""
-    # Check if username already exists
-    existing_users = users_collection.where("username", "==", user_data.username).limit(1).get()
-    if len(list(existing_users)) > 0:
+@transactional
+def create_user_transaction(transaction, user_dict: dict):
+    """Creates the user and claims its username index entry in one transaction."""
+    index_ref = usernames_collection.document(normalize_username(user_dict["username"]))
+    if index_ref.get(transaction=transaction).exists:
         raise ValueError("Username already exists")
-    
+
+    # Users created before the index existed are only found by query (until migrate_usernames.py runs)
+    legacy_query = users_collection.where("username", "==", user_dict["username"]).limit(1)
+    if list(transaction.get(legacy_query)):
+        raise ValueError("Username already exists")
+
     doc_ref = users_collection.document()
-    
+    transaction.set(doc_ref, user_dict)
+    transaction.set(index_ref, {"userId": doc_ref.id, "username": user_dict["username"]})
+    return doc_ref.id
+
+def create_user(user_data: UserCreate):
+    """Create a new user with hashed password."""
     user_dict = {
         "username": user_data.username,
         "full_name": user_data.full_name,
@@ -25,11 +38,13 @@ def create_user(user_data: UserCreate):
         "created_at": datetime.now().isoformat()
     }
     
-    doc_ref.set(user_dict)
+    # Check the username is free and create the user atomically
+    transaction = db.transaction()
+    user_id = create_user_transaction(transaction, user_dict)
     
     # Return user data without password
     return {
-        "id": doc_ref.id,
+        "id": user_id,
         "username": user_dict["username"],
         "full_name": user_dict["full_name"],
         "level": user_dict["level"],
@@ -38,11 +53,25 @@ def create_user(user_data: UserCreate):
     }
 
 def get_user_by_username(username: str) -> Optional[dict]:
-    """Retrieve a user by username."""
+    """
+    Retrieve a user by username via the usernames index (two point reads).
+    An exact username match wins over the indexed user, so a legacy user whose
+    name differs only by case from an indexed one can still be found.
+    """
+    indexed_user = None
+    index_doc = usernames_collection.document(normalize_username(username)).get()
+    if index_doc.exists:
+        doc = users_collection.document(index_doc.to_dict()["userId"]).get()
+        if doc.exists:
+            indexed_user = {"id": doc.id, **doc.to_dict()}
+            if indexed_user.get("username") == username:
+                return indexed_user
+
+    # Fall back to a query for users created before the index existed
     users = users_collection.where("username", "==", username).limit(1).stream()
     for doc in users:
         return {"id": doc.id, **doc.to_dict()}
-    return None
+    return indexed_user
 
 def get_user_by_id(user_id: str) -> Optional[dict]:
     """Retrieve a user by ID."""
@@ -92,16 +121,28 @@ def update_user(user_id: str, user_update: UserUpdate):
 def delete_user(user_id: str):
     """Delete a user (soft delete by marking inactive)."""
     user_ref = users_collection.document(user_id)
+    user_snapshot = user_ref.get()
     
-    if not user_ref.get().exists:
+    if not user_snapshot.exists:
         raise ValueError("User not found")
     
     user_ref.update({"is_active": False})
+    # Cut off this user's existing tokens now; other workers pick it up on their next refresh
+    mark_user_inactive(user_snapshot.to_dict().get("username"))
     return {"status": "success", "message": f"User {user_id} deactivated."}
 
-def authenticate_user(username: str, password: str) -> Optional[dict]:
-    """Authenticate a user with username and password."""
-    user = get_user_by_username(username)
+def _store_rehashed_password(user_id: str, new_hash: Optional[str]):
+    """Saves a password hash upgraded to the current CryptContext settings."""
+    if new_hash:
+        users_collection.document(user_id).update({"hashed_password": new_hash})
+
+async def authenticate_user(username: str, password: str) -> Optional[dict]:
+    """
+    Authenticate a user with username and password. The user lookup runs in the
+    request threadpool and bcrypt in the dedicated password pool.
+    Raises PoolSaturatedError if too many logins are already waiting.
+    """
+    user = await run_in_threadpool(get_user_by_username, username)
     
     if not user:
         return None
@@ -109,8 +150,11 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
     if not user.get("is_active", False):
         return None
     
-    if not verify_password(password, user["hashed_password"]):
+    is_valid, new_hash = await password_pool.run(verify_and_update_password, password, user["hashed_password"])
+    if not is_valid:
         return None
+    if new_hash:
+        await run_in_threadpool(_store_rehashed_password, user["id"], new_hash)
     
     # Remove hashed_password before returning
     user.pop("hashed_password", None)
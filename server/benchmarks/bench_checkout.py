@@ -0,0 +1,63 @@
+# benchmarks/bench_checkout.py
+"""
+Micro-benchmarks for the checkout path and the busiest read routes.
+
+Run from the server directory:
+    pip install -r benchmarks/requirements.txt
+    pytest -c benchmarks/pytest.ini benchmarks
+"""
+import itertools
+from datetime import datetime
+
+from benchmarks.fixtures import sale_payload
+from app.services import sale_service
+
+_counter = itertools.count()
+
+def bench_process_sale_service(benchmark, seeded):
+    """The sale transaction alone, without HTTP or auth overhead."""
+    item_ids = seeded["item_ids"]
+    benchmark(lambda: sale_service.create_sale(sale_payload(item_ids, next(_counter))))
+
+def bench_post_sale(benchmark, client, auth_headers, seeded):
+    item_ids = seeded["item_ids"]
+
+    def post_sale():
+        payload = sale_payload(item_ids, next(_counter)).model_dump()
+        response = client.post("/api/v1/sales/", json=payload, headers=auth_headers)
+        assert response.status_code == 201, response.text
+
+    benchmark(post_sale)
+
+def bench_post_credit_payment(benchmark, client, auth_headers, seeded):
+    item_ids = seeded["item_ids"]
+    # One credit sale with a large balance, paid off in small instalments
+    sale = sale_service.create_sale(sale_payload(item_ids, next(_counter), lines=10, amount_paid=0))
+
+    def post_payment():
+        response = client.post(
+            "/api/v1/credit/",
+            json={"saleId": sale["id"], "amount": 1, "paymentMethod": "Cash"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201, response.text
+
+    benchmark(post_payment)
+
+def bench_inventory_manage_read_all(benchmark, client, auth_headers):
+    benchmark(lambda: client.post(
+        "/api/v1/inventory/manage", json={"action": "read", "payload": {}}, headers=auth_headers
+    ).raise_for_status())
+
+def bench_sales_by_date(benchmark, client, auth_headers):
+    today = datetime.now().strftime("%Y-%m-%d")
+    benchmark(lambda: client.get(f"/api/v1/sales/by_date/{today}", headers=auth_headers).raise_for_status())
+
+def bench_list_sales_page(benchmark, client, auth_headers):
+    benchmark(lambda: client.get("/api/v1/sales/?limit=50", headers=auth_headers).raise_for_status())
+
+def bench_list_expenses_page(benchmark, client, auth_headers):
+    benchmark(lambda: client.get("/api/v1/expenses/?limit=50", headers=auth_headers).raise_for_status())
+
+def bench_list_credit_page(benchmark, client, auth_headers):
+    benchmark(lambda: client.get("/api/v1/credit/all?limit=50", headers=auth_headers).raise_for_status())
@@ -0,0 +1,22 @@
+# benchmarks/conftest.py
+import pytest
+
+from benchmarks.fixtures import ADMIN_PASSWORD, ADMIN_USERNAME, seed
+
+@pytest.fixture(scope="session")
+def seeded():
+    return seed()
+
+@pytest.fixture(scope="session")
+def client(seeded):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    response = client.post("/api/v1/users/login", json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
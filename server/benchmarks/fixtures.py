@@ -0,0 +1,61 @@
+# benchmarks/fixtures.py
+"""
+Seed data for benchmarks and load tests.
+
+Importing this module selects the in-memory storage backend unless
+STORAGE_BACKEND is already set (e.g. to run against the Firestore emulator
+with FIRESTORE_EMULATOR_HOST).
+"""
+import os
+import sys
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas.inventory import InventoryCreate  # noqa: E402
+from app.schemas.sale import SaleCreate, SaleItem  # noqa: E402
+from app.schemas.user import UserCreate  # noqa: E402
+from app.services import inventory_service, sale_service, user_service  # noqa: E402
+
+ADMIN_USERNAME = "bench_admin"
+ADMIN_PASSWORD = "bench_password"
+
+def seed(items: int = 50, sales: int = 200, stock: int = 1_000_000) -> dict:
+    """Creates an L2 user, `items` inventory items and `sales` sales. Returns the item IDs."""
+    try:
+        user_service.create_user(UserCreate(
+            username=ADMIN_USERNAME, password=ADMIN_PASSWORD, full_name="Benchmark Admin", level="L2"
+        ))
+    except ValueError:
+        pass  # Already seeded
+
+    item_ids = []
+    for index in range(items):
+        item = inventory_service.create_item(InventoryCreate(
+            itemName=f"Bench Machine {index}",
+            modelNumber=f"BM-{index:04d}",
+            quantity=stock,
+            purchasePrice=20000.0,
+            sellingPrice=28000.0,
+        ))
+        item_ids.append(item["id"])
+
+    sale_ids = []
+    for index in range(sales):
+        sale = sale_service.create_sale(sale_payload(item_ids, index))
+        sale_ids.append(sale["id"])
+
+    return {"item_ids": item_ids, "sale_ids": sale_ids}
+
+def sale_payload(item_ids: list, index: int, lines: int = 3, amount_paid: float = None) -> SaleCreate:
+    """A sale of `lines` distinct items chosen round-robin from `item_ids`."""
+    return SaleCreate(
+        customerName=f"Customer {index}",
+        phoneNumber=f"077{index % 10_000_000:07d}",
+        paymentMethod="Cash",
+        items=[
+            SaleItem(itemId=item_ids[(index + line) % len(item_ids)], quantitySold=1)
+            for line in range(lines)
+        ],
+        amountPaid=amount_paid,
+    )
@@ -0,0 +1,178 @@
+# benchmarks/load_test.py
+"""
+Asyncio load generator for the POS API.
+
+In-process (in-memory backend, no server needed):
+    python -m benchmarks.load_test --concurrency 50 --duration 30
+
+Against a running server (e.g. one using the Firestore emulator):
+    python -m benchmarks.load_test --url http://localhost:8000 --username admin --password ...
+
+Reports p50/p95/p99 latency and throughput per route, error counts and,
+in-process, transaction retry counts.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+from benchmarks.fixtures import ADMIN_PASSWORD, ADMIN_USERNAME, sale_payload, seed
+
+# Scenario name -> relative weight
+SCENARIOS = {
+    "POST /sales": 30,
+    "POST /credit/": 10,
+    "POST /inventory/manage read": 25,
+    "GET /sales/by_date": 15,
+    "GET /sales/?limit=50": 10,
+    "GET /expenses/?limit=50": 5,
+    "GET /credit/all?limit=50": 5,
+}
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, item_ids: list, credit_sale_ids: list):
+        self.client = client
+        self.item_ids = item_ids
+        self.credit_sale_ids = credit_sale_ids
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.counter = 0
+        self.today = datetime.now().strftime("%Y-%m-%d")
+
+    async def request(self, scenario: str) -> httpx.Response:
+        self.counter += 1
+        if scenario == "POST /sales":
+            payload = sale_payload(self.item_ids, self.counter).model_dump()
+            return await self.client.post("/api/v1/sales/", json=payload)
+        if scenario == "POST /credit/":
+            sale_id = random.choice(self.credit_sale_ids)
+            return await self.client.post("/api/v1/credit/", json={"saleId": sale_id, "amount": 1, "paymentMethod": "Cash"})
+        if scenario == "POST /inventory/manage read":
+            return await self.client.post("/api/v1/inventory/manage", json={"action": "read", "payload": {}})
+        if scenario == "GET /sales/by_date":
+            return await self.client.get(f"/api/v1/sales/by_date/{self.today}")
+        if scenario == "GET /sales/?limit=50":
+            return await self.client.get("/api/v1/sales/?limit=50")
+        if scenario == "GET /expenses/?limit=50":
+            return await self.client.get("/api/v1/expenses/?limit=50")
+        return await self.client.get("/api/v1/credit/all?limit=50")
+
+    async def worker(self, deadline: float):
+        names = list(SCENARIOS)
+        weights = list(SCENARIOS.values())
+        while time.perf_counter() < deadline:
+            scenario = random.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await self.request(scenario)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            if ok:
+                self.latencies[scenario].append(elapsed)
+            else:
+                self.errors[scenario] += 1
+
+    async def run(self, concurrency: int, duration: float) -> float:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(self.worker(deadline) for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float, retries: dict = None):
+        print(f"\n{'route':<30}{'count':>8}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        total = 0
+        for scenario in SCENARIOS:
+            values = sorted(self.latencies[scenario])
+            total += len(values)
+            print(
+                f"{scenario:<30}{len(values):>8}{self.errors[scenario]:>8}{len(values) / elapsed:>10.1f}"
+                f"{percentile(values, 0.50) * 1000:>10.1f}{percentile(values, 0.95) * 1000:>10.1f}"
+                f"{percentile(values, 0.99) * 1000:>10.1f}"
+            )
+        print(f"\nTotal: {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+
+        if retries is None:
+            print("Transaction retries: not available for a remote server")
+        else:
+            print("\nTransaction retries (attempts - calls):")
+            for name, counts in sorted(retries.items()):
+                print(f"  {name:<40} calls={counts['calls']:<8} retries={counts['attempts'] - counts['calls']}")
+
+async def _login(client: httpx.AsyncClient, username: str, password: str):
+    response = await client.post("/api/v1/users/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+async def run_in_process(concurrency: int, duration: float, credit_sales: int):
+    from app.db.transactions import metrics as transaction_metrics
+    from app.main import app
+    from app.services import sale_service
+
+    seeded = seed()
+    credit_sale_ids = [
+        sale_service.create_sale(sale_payload(seeded["item_ids"], index, lines=10, amount_paid=0))["id"]
+        for index in range(credit_sales)
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+        await _login(client, ADMIN_USERNAME, ADMIN_PASSWORD)
+        before = transaction_metrics.snapshot()
+        load_test = LoadTest(client, seeded["item_ids"], credit_sale_ids)
+        elapsed = await load_test.run(concurrency, duration)
+
+    retries = {}
+    for name, counts in transaction_metrics.snapshot().items():
+        previous = before.get(name, {"calls": 0, "attempts": 0})
+        retries[name] = {key: counts[key] - previous[key] for key in ("calls", "attempts")}
+    load_test.report(elapsed, retries)
+
+async def run_remote(url: str, username: str, password: str, concurrency: int, duration: float, credit_sales: int):
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        await _login(client, username, password)
+        response = await client.get("/api/v1/inventory/?limit=50")
+        response.raise_for_status()
+        item_ids = [item["id"] for item in response.json() if item.get("quantity", 0) > 0]
+        if not item_ids:
+            raise SystemExit("The target server has no inventory items in stock to sell.")
+
+        credit_sale_ids = []
+        for index in range(credit_sales):
+            payload = sale_payload(item_ids, index, lines=1, amount_paid=0).model_dump()
+            response = await client.post("/api/v1/sales/", json=payload)
+            response.raise_for_status()
+            credit_sale_ids.append(response.json()["id"])
+
+        load_test = LoadTest(client, item_ids, credit_sale_ids)
+        elapsed = await load_test.run(concurrency, duration)
+    load_test.report(elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the LSP POS API.")
+    parser.add_argument("--url", help="Base URL of a running server; omit to run in-process")
+    parser.add_argument("--username", default=ADMIN_USERNAME)
+    parser.add_argument("--password", default=ADMIN_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--credit-sales", type=int, default=20, help="Credit sales to spread payments over")
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(run_remote(args.url, args.username, args.password, args.concurrency, args.duration, args.credit_sales))
+    else:
+        asyncio.run(run_in_process(args.concurrency, args.duration, args.credit_sales))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/locustfile.py
+"""
+Locust scenario for a running server:
+    locust -f benchmarks/locustfile.py --host http://localhost:8000
+
+Credentials come from LOADTEST_USERNAME / LOADTEST_PASSWORD.
+"""
+import os
+import random
+from datetime import datetime
+
+from locust import HttpUser, between, task
+
+class CounterStaff(HttpUser):
+    wait_time = between(0.1, 0.5)
+
+    def on_start(self):
+        response = self.client.post("/api/v1/users/login", json={
+            "username": os.getenv("LOADTEST_USERNAME", "admin"),
+            "password": os.getenv("LOADTEST_PASSWORD", ""),
+        })
+        response.raise_for_status()
+        self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        items = self.client.get("/api/v1/inventory/?limit=50").json()
+        self.item_ids = [item["id"] for item in items if item.get("quantity", 0) > 0]
+        self.credit_sale_ids = []
+
+    def _sale(self, amount_paid=None):
+        return {
+            "customerName": "Load Test",
+            "phoneNumber": "0770000000",
+            "paymentMethod": "Cash",
+            "items": [{"itemId": random.choice(self.item_ids), "quantitySold": 1}],
+            "amountPaid": amount_paid,
+        }
+
+    @task(30)
+    def create_sale(self):
+        response = self.client.post("/api/v1/sales/", json=self._sale(amount_paid=0 if random.random() < 0.2 else None))
+        if response.ok and response.json().get("balance", 0) > 0:
+            self.credit_sale_ids.append(response.json()["id"])
+
+    @task(10)
+    def credit_payment(self):
+        if self.credit_sale_ids:
+            self.client.post("/api/v1/credit/", json={
+                "saleId": random.choice(self.credit_sale_ids), "amount": 1, "paymentMethod": "Cash",
+            })
+
+    @task(25)
+    def read_inventory(self):
+        self.client.post("/api/v1/inventory/manage", json={"action": "read", "payload": {}}, name="/inventory/manage read")
+
+    @task(15)
+    def sales_by_date(self):
+        self.client.get(f"/api/v1/sales/by_date/{datetime.now():%Y-%m-%d}", name="/sales/by_date")
+
+    @task(20)
+    def list_pages(self):
+        route = random.choice(["/api/v1/sales/", "/api/v1/expenses/", "/api/v1/credit/all"])
+        self.client.get(f"{route}?limit=50", name=f"{route} page")
@@ -0,0 +1,42 @@
+# migrate_credit_status.py
+"""
+Run this script once to set `status` and `nextDueDate` on credit records
+created before the active-credit listing was filtered in Firestore. Records
+created by a sale used to have no status and would be missing from the listing.
+Safe to run again.
+
+The listing needs these composite indexes on the credit collection:
+  status ASC, date DESC / status ASC, date ASC / status ASC, balance DESC /
+  status ASC, nextDueDate ASC
+The dashboard's outstanding credit sums the same status == "Active" records;
+that equality filter is served by the automatic single-field index.
+Usage: python migrate_credit_status.py
+"""
+from app.db.firebase_config import credit_collection, sales_collection
+from app.services.credit_service import next_due_date
+
+def migrate_credit_status():
+    updated = 0
+    unchanged = 0
+
+    for doc in credit_collection.stream():
+        credit_data = doc.to_dict()
+        sale_doc = sales_collection.document(credit_data.get("saleId") or doc.id).get()
+        installment_info = sale_doc.to_dict().get("installment_info") if sale_doc.exists else None
+
+        fields = {
+            "status": "Active" if credit_data.get("balance", 0) > 0 else "Completed",
+            "nextDueDate": next_due_date(installment_info, credit_data.get("totalAmount", 0.0), credit_data.get("amountPaid", 0.0)),
+        }
+        if all(credit_data.get(key) == value for key, value in fields.items()):
+            unchanged += 1
+            continue
+
+        doc.reference.update(fields)
+        updated += 1
+
+    print(f"✅ Credit records updated: {updated}")
+    print(f"Already up to date: {unchanged}")
+
+if __name__ == "__main__":
+    migrate_credit_status()
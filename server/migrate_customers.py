@@ -0,0 +1,47 @@
+# migrate_customers.py
+"""
+Run this script once to build the customers/{normalized phone} ledgers from
+sales recorded before they were maintained. Each ledger is recomputed from its sales,
+so it is safe to run again (while no sales are being recorded).
+Usage: python migrate_customers.py
+"""
+from app.db.batching import MAX_WRITES_PER_COMMIT
+from app.db.firebase_config import db, customers_collection, sales_collection
+from app.services.customer_service import normalize_phone
+
+def migrate_customers():
+    ledgers = {}
+    skipped = 0
+
+    for doc in sales_collection.order_by("date").stream():
+        sale = doc.to_dict()
+        phone = normalize_phone(sale.get("phoneNumber"))
+        if not phone:
+            skipped += 1
+            continue
+
+        ledger = ledgers.setdefault(phone, {
+            "phone": phone, "saleCount": 0, "saleIds": [], "lifetimeSpend": 0.0, "openBalance": 0.0,
+        })
+        ledger["saleCount"] += 1
+        ledger["saleIds"].append(doc.id)
+        ledger["lifetimeSpend"] += sale.get("totalAmount", 0.0)
+        ledger["openBalance"] += sale.get("balance", 0.0)
+        # Sales are read oldest first, so the latest sale's details win
+        ledger["phoneNumber"] = sale.get("phoneNumber")
+        ledger["customerName"] = sale.get("customerName", "")
+        ledger["nameLower"] = (sale.get("customerName") or "").strip().lower()
+        ledger["lastVisit"] = sale.get("date")
+
+    phones = list(ledgers)
+    for start in range(0, len(phones), MAX_WRITES_PER_COMMIT):
+        batch = db.batch()
+        for phone in phones[start:start + MAX_WRITES_PER_COMMIT]:
+            batch.set(customers_collection.document(phone), ledgers[phone])
+        batch.commit()
+
+    print(f"✅ Customer ledgers written: {len(ledgers)}")
+    print(f"Sales without a phone number: {skipped}")
+
+if __name__ == "__main__":
+    migrate_customers()
@@ -0,0 +1,45 @@
+# migrate_daily_stats.py
+"""
+Run this script to backfill the daily_stats rollups for days recorded before
+they were maintained. Days are rebuilt newest first from the day before the
+recorded rollup start, and each rebuild moves the start back a day, so reports
+stop scanning them. Safe to stop and run again; it continues from the start.
+Usage: python migrate_daily_stats.py [oldest YYYY-MM-DD]
+       (defaults to the day of the first sale or expense)
+"""
+import sys
+from datetime import date, timedelta
+from app.db.firebase_config import expenses_collection, sales_collection
+from app.services import stats_service
+
+def _first_recorded_day():
+    days = [
+        docs[0].to_dict()["date"][:10]
+        for docs in (
+            sales_collection.order_by("date").limit(1).get(),
+            expenses_collection.order_by("date").limit(1).get(),
+        )
+        if docs
+    ]
+    return min(days) if days else None
+
+def migrate_daily_stats(oldest=None):
+    stats_service.mark_rollups_started()
+    oldest = oldest or _first_recorded_day()
+    since = stats_service.rollups_since()
+    if oldest is None or oldest >= since:
+        print(f"✅ Rollups are already complete from {since}")
+        return
+
+    day = date.fromisoformat(since) - timedelta(days=1)
+    rebuilt = 0
+    while day.isoformat() >= oldest:
+        stats_service.rebuild_daily_stats(day.isoformat())
+        rebuilt += 1
+        day -= timedelta(days=1)
+
+    print(f"✅ Days rebuilt: {rebuilt}")
+    print(f"Rollups are complete from {stats_service.rollups_since()}")
+
+if __name__ == "__main__":
+    migrate_daily_stats(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,30 @@
+# migrate_low_stock.py
+"""
+Run this script once to build the low_stock/{itemId} index from the items
+recorded before it was maintained. Every item's entry is set or cleared from its
+current stock, so it is safe to run again (e.g. after changing LOW_STOCK_THRESHOLD).
+Usage: python migrate_low_stock.py
+"""
+from app.db.batching import MAX_WRITES_PER_COMMIT
+from app.db.firebase_config import db, inventory_collection
+from app.services.inventory_service import record_stock_level, reorder_level, stock_counter
+
+def migrate_low_stock():
+    items = [(doc.id, doc.to_dict()) for doc in inventory_collection.stream()]
+    low = 0
+
+    for start in range(0, len(items), MAX_WRITES_PER_COMMIT):
+        batch = db.batch()
+        for item_id, item_data in items[start:start + MAX_WRITES_PER_COMMIT]:
+            counter = stock_counter(item_id, item_data)
+            quantity = counter.total(db) if counter else item_data.get("quantity", 0)
+            record_stock_level(batch, item_id, item_data, quantity)
+            if quantity <= reorder_level(item_data):
+                low += 1
+        batch.commit()
+
+    print(f"✅ Items checked: {len(items)}")
+    print(f"Items at or below their reorder level: {low}")
+
+if __name__ == "__main__":
+    migrate_low_stock()
@@ -0,0 +1,41 @@
+# migrate_usernames.py
+"""
+Run this script once to build the usernames/{normalized username} index for
+users created before it existed. Safe to run again; existing entries are kept.
+Usage: python migrate_usernames.py
+"""
+from app.db.firebase_config import users_collection, usernames_collection
+from app.services.user_service import normalize_username
+
+def migrate_usernames():
+    created = 0
+    skipped = 0
+    conflicts = []
+
+    for doc in users_collection.stream():
+        username = doc.to_dict().get("username")
+        if not username:
+            continue
+
+        index_ref = usernames_collection.document(normalize_username(username))
+        index_doc = index_ref.get()
+        if index_doc.exists:
+            if index_doc.to_dict().get("userId") != doc.id:
+                conflicts.append((username, doc.id, index_doc.to_dict().get("userId")))
+            else:
+                skipped += 1
+            continue
+
+        index_ref.set({"userId": doc.id, "username": username})
+        created += 1
+
+    print(f"✅ Username index entries created: {created}")
+    print(f"Already indexed: {skipped}")
+    if conflicts:
+        print(f"\n⚠️  {len(conflicts)} username(s) differ only by case from an indexed user and were not indexed:")
+        for username, user_id, indexed_user_id in conflicts:
+            print(f"  {username} (user {user_id}) conflicts with user {indexed_user_id}")
+        print("They can still log in with their exact username; rename or deactivate them to free it up.")
+
+if __name__ == "__main__":
+    migrate_usernames()
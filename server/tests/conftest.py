@@ -0,0 +1,5 @@
+# tests/conftest.py
+import os
+
+# Service tests run against the in-memory backend, never a real Firestore project
+os.environ["STORAGE_BACKEND"] = "memory"
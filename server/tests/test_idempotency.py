@@ -0,0 +1,77 @@
+# tests/test_idempotency.py
+"""
+Checks that an Idempotency-Key replays its original response, and that a
+retry after the sale or payment was deleted is refused instead of replayed.
+"""
+import uuid
+
+import pytest
+
+from app.db.firebase_config import inventory_collection
+from app.schemas.credit import CreditPaymentCreate
+from app.schemas.sale import SaleCreate
+from app.services import credit_service, idempotency_service, sale_service
+
+@pytest.fixture
+def credit_sale():
+    """A sale of 2 x 100 with 50 paid, leaving 150 on credit."""
+    item_id = f"item-{uuid.uuid4().hex}"
+    inventory_collection.document(item_id).set({"itemName": "Fan", "modelNumber": "F-1", "quantity": 10, "sellingPrice": 100.0})
+    request = SaleCreate(
+        customerName="Nimal", phoneNumber="0771234567", paymentMethod="Cash",
+        items=[{"itemId": item_id, "quantitySold": 2}], amountPaid=50.0,
+    )
+    return sale_service.create_sale(request)
+
+def _payment(sale_id: str, amount: float = 40.0) -> CreditPaymentCreate:
+    return CreditPaymentCreate(saleId=sale_id, amount=amount, paymentMethod="Cash")
+
+@pytest.fixture(params=["cached", "stored"])
+def cache_mode(request):
+    """Retries are answered from this process's cache, or (cache cleared) from the stored key."""
+    return request.param
+
+def _retry(mode: str, create, *args):
+    if mode == "stored":
+        idempotency_service._recent.clear()
+    return create(*args)
+
+def test_retried_payment_is_replayed(credit_sale, cache_mode):
+    key = uuid.uuid4().hex
+    payment = credit_service.create_credit_payment(_payment(credit_sale["id"]), key)
+    replayed = _retry(cache_mode, credit_service.create_credit_payment, _payment(credit_sale["id"]), key)
+    assert replayed["id"] == payment["id"]
+    assert len(credit_service.get_credit_payments_for_sale(credit_sale["id"])) == 1
+
+def test_key_reused_for_another_payment_is_refused(credit_sale):
+    key = uuid.uuid4().hex
+    credit_service.create_credit_payment(_payment(credit_sale["id"]), key)
+    with pytest.raises(ValueError, match="different"):
+        credit_service.create_credit_payment(_payment(credit_sale["id"], amount=30.0), key)
+
+def test_retry_after_payment_deleted_is_refused(credit_sale, cache_mode):
+    key = uuid.uuid4().hex
+    payment = credit_service.create_credit_payment(_payment(credit_sale["id"]), key)
+    credit_service.delete_credit_payment(payment["id"])
+
+    with pytest.raises(ValueError, match="undone"):
+        _retry(cache_mode, credit_service.create_credit_payment, _payment(credit_sale["id"]), key)
+    assert credit_service.get_credit_payments_for_sale(credit_sale["id"]) == []
+    assert sale_service.get_sale(credit_sale["id"])["balance"] == 150.0
+
+    # A new key pays again
+    credit_service.create_credit_payment(_payment(credit_sale["id"]), uuid.uuid4().hex)
+    assert sale_service.get_sale(credit_sale["id"])["balance"] == 110.0
+
+def test_retry_after_sale_deleted_is_refused(credit_sale, cache_mode):
+    key = uuid.uuid4().hex
+    request = SaleCreate(
+        customerName="Nimal", phoneNumber="0771234567", paymentMethod="Cash",
+        items=[{"itemId": credit_sale["items"][0]["itemId"], "quantitySold": 1}],
+    )
+    sale = sale_service.create_sale(request, key)
+    sale_service.delete_sale(sale["id"])
+
+    with pytest.raises(ValueError, match="undone"):
+        _retry(cache_mode, sale_service.create_sale, request, key)
+    assert sale_service.get_sale(sale["id"]) is None
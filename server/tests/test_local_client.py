@@ -0,0 +1,143 @@
+# tests/test_local_client.py
+"""
+Checks that the local storage backends behave like Firestore where the
+services rely on it: query filters and ordering, field transforms, and
+all-or-nothing transactions and batches.
+
+Run from the server directory:
+    python -m pytest tests
+"""
+import pytest
+from google.api_core.exceptions import AlreadyExists, NotFound
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.db.local_client import DESCENDING, LocalClient, MemoryStore, SQLiteStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def client(request, tmp_path):
+    if request.param == "memory":
+        return LocalClient(MemoryStore())
+    return LocalClient(SQLiteStore(str(tmp_path / "local.db")))
+
+@pytest.fixture
+def sales(client):
+    collection = client.collection("sales")
+    collection.document("a").set({"date": "2026-01-01", "total": 300, "tags": ["cash"]})
+    collection.document("b").set({"date": "2026-01-02", "total": 100, "tags": ["card", "credit"]})
+    collection.document("c").set({"date": "2026-01-03", "total": 200, "tags": ["cash"]})
+    collection.document("d").set({"total": 50})  # No date
+    return collection
+
+def _ids(query) -> list:
+    return [snapshot.id for snapshot in query.stream()]
+
+# --- Queries ---
+def test_equality_and_range_filters(sales):
+    assert _ids(sales.where(filter=FieldFilter("total", "==", 100))) == ["b"]
+    assert _ids(sales.where(filter=FieldFilter("total", ">=", 200))) == ["c", "a"]  # Ordered by the range field
+    assert _ids(sales.where(filter=FieldFilter("date", ">", "2026-01-01")).where(filter=FieldFilter("total", "<", 250))) == ["b", "c"]
+
+def test_membership_filters(sales):
+    assert _ids(sales.where(filter=FieldFilter("total", "in", [50, 300]))) == ["a", "d"]
+    assert _ids(sales.where(filter=FieldFilter("tags", "array_contains", "cash"))) == ["a", "c"]
+    assert _ids(sales.where(filter=FieldFilter("tags", "array_contains_any", ["credit", "none"]))) == ["b"]
+
+def test_range_filter_skips_other_types(sales):
+    assert _ids(sales.where(filter=FieldFilter("total", ">", "0"))) == []
+
+def test_order_by_leaves_out_documents_without_the_field(sales):
+    assert _ids(sales.order_by("date", direction=DESCENDING)) == ["c", "b", "a"]
+
+def test_limit_and_cursor(sales):
+    first_page = sales.order_by("total").limit(2).get()
+    assert [snapshot.id for snapshot in first_page] == ["d", "b"]
+    assert _ids(sales.order_by("total").start_after(first_page[-1]).limit(2)) == ["c", "a"]
+
+def test_select_returns_only_the_projected_fields(sales):
+    snapshot = sales.where(filter=FieldFilter("total", "==", 300)).select(["date"]).get()[0]
+    assert snapshot.to_dict() == {"date": "2026-01-01"}
+
+# --- Transforms ---
+def test_increment(client):
+    ref = client.collection("stats").document("day")
+    ref.set({"count": transforms.Increment(2), "byMethod": {"Cash": transforms.Increment(10.5)}}, merge=True)
+    ref.set({"count": transforms.Increment(3), "byMethod": {"Card": transforms.Increment(4)}}, merge=True)
+    ref.update({"byMethod.Cash": transforms.Increment(-0.5)})
+    assert ref.get().to_dict() == {"count": 5, "byMethod": {"Cash": 10.0, "Card": 4}}
+
+def test_array_union_and_remove(client):
+    ref = client.collection("customers").document("0771234567")
+    ref.set({"saleIds": transforms.ArrayUnion(["s1", "s2"])}, merge=True)
+    ref.set({"saleIds": transforms.ArrayUnion(["s2", "s3"])}, merge=True)
+    assert ref.get().to_dict()["saleIds"] == ["s1", "s2", "s3"]
+    ref.update({"saleIds": transforms.ArrayRemove(["s1"])})
+    assert ref.get().to_dict()["saleIds"] == ["s2", "s3"]
+
+def test_delete_field(client):
+    ref = client.collection("inventory").document("item")
+    ref.set({"quantity": 5, "stockShards": 4})
+    ref.update({"stockShards": transforms.DELETE_FIELD})
+    assert ref.get().to_dict() == {"quantity": 5}
+
+# --- Transactions and batches ---
+def test_transaction_commits_its_writes(client):
+    ref = client.collection("inventory").document("item")
+    ref.set({"quantity": 5})
+
+    def sell(transaction):
+        quantity = ref.get(transaction=transaction).to_dict()["quantity"]
+        transaction.update(ref, {"quantity": quantity - 2})
+        return quantity
+
+    assert client.transaction().run(sell) == 5
+    assert ref.get().to_dict() == {"quantity": 3}
+
+def test_transaction_rolls_back_when_the_function_raises(client):
+    item = client.collection("inventory").document("item")
+    item.set({"quantity": 5})
+    sale = client.collection("sales").document("sale")
+
+    def failing_sale(transaction):
+        transaction.update(item, {"quantity": 3})
+        transaction.set(sale, {"total": 100})
+        raise ValueError("Insufficient stock")
+
+    with pytest.raises(ValueError):
+        client.transaction().run(failing_sale)
+    assert item.get().to_dict() == {"quantity": 5}
+    assert not sale.get().exists
+
+def test_transaction_rolls_back_when_a_write_fails(client):
+    existing = client.collection("usernames").document("admin")
+    existing.set({"userId": "u1"})
+    user = client.collection("users").document("u2")
+
+    def register(transaction):
+        transaction.set(user, {"username": "admin"})
+        transaction.create(existing, {"userId": "u2"})
+
+    with pytest.raises(AlreadyExists):
+        client.transaction().run(register)
+    assert not user.get().exists
+    assert existing.get().to_dict() == {"userId": "u1"}
+
+def test_transaction_rejects_reads_after_writes(client):
+    ref = client.collection("inventory").document("item")
+
+    def read_after_write(transaction):
+        transaction.set(ref, {"quantity": 1})
+        ref.get(transaction=transaction)
+
+    with pytest.raises(ValueError):
+        client.transaction().run(read_after_write)
+    assert not ref.get().exists
+
+def test_batch_is_all_or_nothing(client):
+    created = client.collection("expenses").document("e1")
+    batch = client.batch()
+    batch.set(created, {"amount": 10})
+    batch.update(client.collection("inventory").document("missing"), {"quantity": 1})
+    with pytest.raises(NotFound):
+        batch.commit()
+    assert not created.get().exists